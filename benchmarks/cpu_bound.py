@@ -0,0 +1,51 @@
+from testipy import TestContext
+
+
+def fibonacci(n: int) -> int:
+    return n if n < 2 else fibonacci(n - 1) + fibonacci(n - 2)
+
+
+def test_fibonacci_1(t: TestContext):
+    t.assert_equal(832040, fibonacci(30))
+
+
+def test_fibonacci_2(t: TestContext):
+    t.assert_equal(832040, fibonacci(30))
+
+
+def test_fibonacci_3(t: TestContext):
+    t.assert_equal(832040, fibonacci(30))
+
+
+def test_fibonacci_4(t: TestContext):
+    t.assert_equal(832040, fibonacci(30))
+
+
+def test_fibonacci_5(t: TestContext):
+    t.assert_equal(832040, fibonacci(30))
+
+
+def test_fibonacci_6(t: TestContext):
+    t.assert_equal(832040, fibonacci(30))
+
+
+def test_fibonacci_7(t: TestContext):
+    t.assert_equal(832040, fibonacci(30))
+
+
+def test_fibonacci_8(t: TestContext):
+    t.assert_equal(832040, fibonacci(30))
+
+
+class TestPrimes:
+    def test_count_primes_below_one_hundred_thousand(self, t: TestContext):
+        t.assert_equal(9592, sum(_is_prime(n) for n in range(100_000)))
+
+    def test_count_primes_below_two_hundred_thousand(self, t: TestContext):
+        t.assert_equal(17984, sum(_is_prime(n) for n in range(200_000)))
+
+
+def _is_prime(n: int) -> bool:
+    if n < 2:
+        return False
+    return all(n % d for d in range(2, int(n**0.5) + 1))
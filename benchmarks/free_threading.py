@@ -0,0 +1,47 @@
+"""
+Compare how long the CPU-bound tests in cpu_bound.py take to run serially, in a pool of worker
+processes and in a pool of threads. Run from the root of the repository with:
+
+    python -m benchmarks.free_threading [--repeat N]
+
+Threads only run the tests in parallel on a free-threaded build of Python, e.g. python3.13t; with
+the GIL they're expected to be no faster than running serially.
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+from typing import Callable
+
+from testipy.discovery import discover_tests
+from testipy.running import run_tests
+from testipy.running.threads import _is_free_threaded
+
+TESTS_PATH = os.path.join(os.path.dirname(__file__), "cpu_bound.py")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--repeat", type=int, default=3, help="times to run each mode (default: 3)")
+    args = parser.parse_args()
+
+    tests = discover_tests(os.path.relpath(TESTS_PATH))
+    cpus = os.cpu_count() or 1
+    print(f"python {sys.version.split()[0]}, free-threaded: {_is_free_threaded()}, {cpus} CPUs")
+    modes: dict[str, Callable[[], object]] = {
+        "serial": lambda: run_tests(tests),
+        f"{cpus} worker processes": lambda: run_tests(tests, workers=cpus),
+        f"{cpus} threads": lambda: run_tests(tests, threads=cpus),
+    }
+    for name, run in modes.items():
+        timings = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            run()
+            timings.append(time.perf_counter() - start)
+        print(f"{name:>24}: {statistics.median(timings):.2f}s (median of {args.repeat})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,11 @@
+from testipy import TestContext
+
+
+def _make_test():
+    def test_generated(t: TestContext):
+        pass
+
+    return test_generated
+
+
+test_generated = _make_test()
@@ -0,0 +1,10 @@
+from testipy import TestContext
+
+
+async def test_one(t: TestContext):
+    t.fail("oh no!")
+
+
+class TestOne:
+    async def test_a(self, t: TestContext):
+        t.fail("oh no!")
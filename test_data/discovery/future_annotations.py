@@ -0,0 +1,12 @@
+from __future__ import annotations
+
+from testipy import TestContext
+
+
+def test_one(t: TestContext):
+    pass
+
+
+class TestFuture:
+    def test_method(self, t: TestContext):
+        t.fail("oh no!")
@@ -0,0 +1,10 @@
+import signal
+
+from testipy import TestContext
+
+# signal handlers can only be installed on the main thread
+signal.signal(signal.SIGINT, signal.getsignal(signal.SIGINT))
+
+
+def test_one(t: TestContext):
+    pass
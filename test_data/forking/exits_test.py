@@ -0,0 +1,7 @@
+import os
+
+from testipy import TestContext
+
+
+def test_exits(t: TestContext):
+    os._exit(3)
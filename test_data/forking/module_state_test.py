@@ -0,0 +1,15 @@
+import gc
+
+from testipy import TestContext
+
+counter = 0
+
+
+def test_increments_counter(t: TestContext):
+    global counter
+    counter += 1
+    t.assert_equal(1, counter, "module state was shared with another test run")
+
+
+def test_objects_are_frozen(t: TestContext):
+    t.assert_true(gc.get_freeze_count() > 0, "objects weren't frozen before forking")
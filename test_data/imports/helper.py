@@ -0,0 +1,5 @@
+import os
+
+
+def separator() -> str:
+    return os.sep
@@ -0,0 +1,8 @@
+import os
+from test_data.imports import helper
+from testipy import TestContext
+from .package import module  # noqa: F401
+
+
+def test_uses_helper(t: TestContext):
+    t.assert_equal(os.sep, helper.separator())
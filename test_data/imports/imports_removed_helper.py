@@ -0,0 +1 @@
+from test_data.imports import removed_helper  # noqa: F401
@@ -0,0 +1 @@
+from . import submodule  # noqa: F401
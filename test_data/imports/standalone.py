@@ -0,0 +1 @@
+import json  # noqa: F401
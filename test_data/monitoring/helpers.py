@@ -0,0 +1,10 @@
+def add(a, b):
+    return a + b
+
+
+def subtract(a, b):
+    return a - b
+
+
+def reset():
+    return 0
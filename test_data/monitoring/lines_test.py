@@ -0,0 +1,19 @@
+from testipy import TestContext
+
+from test_data.monitoring import helpers
+
+
+def test_add(t: TestContext):
+    t.assert_equal(3, helpers.add(1, 2))
+
+
+class TestHelpers:
+    @classmethod
+    def setup_class(cls):
+        helpers.reset()
+
+    def test_add(self, t: TestContext):
+        t.assert_equal(3, helpers.add(1, 2))
+
+    def test_subtract(self, t: TestContext):
+        t.assert_equal(1, helpers.subtract(3, 2))
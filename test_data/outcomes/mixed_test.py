@@ -0,0 +1,13 @@
+from testipy import TestContext
+
+
+def test_passes(t: TestContext):
+    pass
+
+
+class TestMixed:
+    def test_passes(self, t: TestContext):
+        pass
+
+    def test_fails(self, t: TestContext):
+        t.fail("oh no!")
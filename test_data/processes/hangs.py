@@ -0,0 +1,7 @@
+import time
+
+from testipy import TestContext
+
+
+def test_hangs(t: TestContext):
+    time.sleep(60)
@@ -0,0 +1,25 @@
+import multiprocessing
+import os
+
+from testipy import TestContext
+
+
+class TestRunInOneProcess:
+    @classmethod
+    def setup_class(cls):
+        cls.setup_class_pid = os.getpid()
+
+    def setup(self):
+        self.setup_pid = os.getpid()
+
+    def test_first(self, t: TestContext):
+        t.assert_equal(self.setup_class_pid, os.getpid(), "setup_class ran in another process")
+        t.assert_equal(self.setup_pid, os.getpid(), "setup ran in another process")
+
+    def test_second(self, t: TestContext):
+        t.assert_equal(self.setup_class_pid, os.getpid(), "setup_class ran in another process")
+        t.assert_equal(self.setup_pid, os.getpid(), "setup ran in another process")
+
+
+def test_runs_in_worker_process(t: TestContext):
+    t.assert_true(multiprocessing.parent_process() is not None, "ran in the parent process")
@@ -1 +1,16 @@
-from .running import TestContext  # noqa: F401
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .running import TestContext, serial, timeout  # noqa: F401
+
+_RUNNING_NAMES = {"TestContext", "serial", "timeout"}
+
+
+def __getattr__(name: str) -> Any:
+    # the test runner is only imported once one of its names is used, so that the daemon client,
+    # which doesn't need it, starts quickly
+    if name in _RUNNING_NAMES:
+        from . import running
+
+        return getattr(running, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,6 +1,21 @@
 import sys
 
-from testipy.cli import main
+# the client is imported on its own so that connecting to the daemon doesn't pay for importing the
+# rest of testipy
+if sys.argv[1:2] == ["--connect"]:
+    from testipy.client import main
+elif sys.argv[1:2] == ["--daemon"]:
+    from testipy.daemon import main  # type: ignore[assignment]
+elif sys.argv[1:2] == ["merge-results"]:
+    from testipy.sharding import main  # type: ignore[assignment]
+elif sys.argv[1:2] == ["--worker"]:
+    from testipy.worker import main  # type: ignore[assignment]
+else:
+    from testipy.cli import main  # type: ignore[assignment]
 
 
-main(sys.argv[1:])
+main(
+    sys.argv[2:]
+    if sys.argv[1:2] in (["--connect"], ["--daemon"], ["merge-results"], ["--worker"])
+    else sys.argv[1:]
+)
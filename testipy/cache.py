@@ -0,0 +1,47 @@
+import json
+import os
+import tempfile
+from typing import Any
+
+
+DEFAULT_CACHE_DIR = ".testipy_cache"
+
+
+def read_cache(cache_dir: str, name: str) -> Any:
+    """Return the value stored under the given name in the cache, or None if there isn't one."""
+    try:
+        with open(os.path.join(cache_dir, name), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        # a missing or corrupt cache is the same as an empty one
+        return None
+
+
+def write_cache(cache_dir: str, name: str, value: Any):
+    """
+    Store a JSON serialisable value under the given name in the cache, creating the cache directory
+    if it doesn't exist yet.
+
+    The value is written to a temporary file which then replaces the old one, so concurrent readers
+    never see a partially written value.
+    """
+    _make_cache_dir(cache_dir)
+    path = os.path.join(cache_dir, name)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(value, f, separators=(",", ":"))
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+
+def _make_cache_dir(cache_dir: str):
+    if os.path.isdir(cache_dir):
+        return
+    os.makedirs(cache_dir, exist_ok=True)
+    # keep the cache out of version control without having to configure each project
+    with open(os.path.join(cache_dir, ".gitignore"), "w", encoding="utf-8") as f:
+        f.write("*\n")
@@ -0,0 +1,53 @@
+import os
+import tempfile
+import unittest
+
+from .cache import read_cache, write_cache
+
+
+class TestCache(unittest.TestCase):
+    longMessage = False
+
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.cache_dir = os.path.join(temp_dir.name, ".testipy_cache")
+
+    def test_returns_written_value(self):
+        value = {"a": [1, 2, 3]}
+
+        write_cache(self.cache_dir, "foo/bar.json", value)
+        actual = read_cache(self.cache_dir, "foo/bar.json")
+
+        self.assertEqual(
+            value,
+            actual,
+            f"expected to read back written value {value}, got {actual}",
+        )
+
+    def test_returns_none_when_nothing_written(self):
+        actual = read_cache(self.cache_dir, "foo.json")
+
+        self.assertIsNone(actual, f"expected to read None from empty cache, got {actual}")
+
+    def test_returns_none_when_value_is_corrupt(self):
+        write_cache(self.cache_dir, "foo.json", {})
+        with open(os.path.join(self.cache_dir, "foo.json"), "w") as f:
+            f.write("{")
+
+        actual = read_cache(self.cache_dir, "foo.json")
+
+        self.assertIsNone(actual, f"expected to read None from corrupt cache, got {actual}")
+
+    def test_cache_directory_is_ignored_by_git(self):
+        write_cache(self.cache_dir, "foo.json", {})
+
+        with open(os.path.join(self.cache_dir, ".gitignore")) as f:
+            actual = f.read()
+
+        expected = "*\n"
+        self.assertEqual(
+            expected,
+            actual,
+            f"expected cache .gitignore to contain {expected!r}, got {actual!r}",
+        )
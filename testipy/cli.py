@@ -1,20 +1,655 @@
+import argparse
+import collections
+import dataclasses
+import re
 import sys
-from typing import Iterable, TextIO
+from typing import Iterable, Iterator, Optional, Sequence, TextIO, TypeVar, Union
 
-from .discovery import discover_tests
-from .running import run_tests
-from .printing import FriendlyPrinter
+from .cache import DEFAULT_CACHE_DIR
+from .discovery import (
+    collect_tests_in_paths,
+    discover_tests_in_paths,
+    DiscoveryCache,
+    find_test_files,
+    InvalidPathError,
+)
+from .discovery.imports import affected_test_files, ImportGraphCache
+from .running import (
+    Coordinator,
+    ForkingNotSupportedError,
+    LineRecorder,
+    MonitoringNotSupportedError,
+    stream_tests,
+    TestMethods,
+    TestReference,
+    TestUnit,
+)
+from .running.results import TestResult
+from .outcomes import failed_first as put_failed_first, last_failed as select_last_failed
+from .outcomes import OutcomeCache
+from .history import DurationHistory
+from .impact import changes_since, GitError, ImpactIndex, parse_changes
+from .reuse import ResultCache, reuse_results as reuse_stored_results
+from .running.units import _test_unit_id, _test_unit_module
+from .sharding import InvalidDurationsFileError, read_durations_file, ResultsFile, shard_tests
+from .printing import CollectedPrinter, DurationsPrinter, FriendlyPrinter
+from .watching import watch
+from .worker import _address
 
 
-def testipy(paths: Iterable[str], out: TextIO):
-    """Run the tests at the given path, outputting the results"""
-    tests = []
-    for path in paths:
-        tests.extend(discover_tests(path))
-    results = run_tests(tests)
-    printer = FriendlyPrinter(results)
+T = TypeVar("T")
+
+
+def testipy(
+    paths: Iterable[str],
+    out: TextIO,
+    *,
+    workers: int = 1,
+    threads: int = 1,
+    forks: int = 0,
+    preload: Sequence[str] = (),
+    parallel: bool = False,
+    timeout: Optional[float] = None,
+    maxfail: Optional[int] = None,
+    async_concurrency: int = 1,
+    collect_only: bool = False,
+    last_failed: bool = False,
+    failed_first: bool = False,
+    reuse_results: bool = False,
+    record_impact: bool = False,
+    impacted_since: Optional[str] = None,
+    impacted_by: Sequence[str] = (),
+    changed_since: Optional[str] = None,
+    changed: Sequence[str] = (),
+    shard: Optional[tuple[int, int]] = None,
+    durations_file: Optional[str] = None,
+    results_file: Optional[str] = None,
+    serve: Optional[tuple[str, int]] = None,
+    cache_dir: Optional[str] = None,
+    show_durations: bool = False,
+    durations: Optional[int] = None,
+):
+    """
+    Run the tests at the given paths, outputting the results. If a cache directory is given, the
+    tests found in each test file are cached there. If durations is given, a report of where the
+    time went which lists that many of the slowest tests (or all of them if it's 0) is output after
+    the results. If maxfail is given, the run stops once that many tests have failed or errored.
+
+    The outcome of each test is also cached, so that later runs can run only the tests which failed
+    or errored last time (if there were any) with last_failed, or run them first with failed_first.
+    The outcomes of tests which have been removed from the test modules that are run are forgotten.
+    If reuse_results is true, tests which passed before and whose code and imported project modules
+    haven't changed since aren't run again, reusing their stored result instead.
+
+    If record_impact is true, the lines of the project that each test runs are recorded in an index
+    in the cache. Runs given impacted_since (a git ref) or impacted_by (changes parsed by
+    parse_changes) then only run the tests which ran lines that have changed, along with any tests
+    which haven't been recorded yet.
+
+    If changed_since (a git ref) or changed (some files) is given, only the test files which have
+    changed or which import a changed project module, directly or through other project modules,
+    are run. The modules' imports are found by parsing them and are cached.
+
+    How long each test takes is cached too, so that runs spread over workers or threads start the
+    test modules which took longest last time first.
+
+    If shard is given as (K, N), only the Kth of N shards of the tests is run, with the tests split
+    so that each shard is expected to take about as long as the others going by the durations in
+    durations_file, as written by merge-results, or so that each has about as many tests as the
+    others if it isn't given or doesn't exist yet (see shard_tests). If results_file is given, the
+    results are written to it so that the results of each shard can be merged with merge-results.
+
+    If serve is given as (host, port), the tests of each test module are handed out to the workers
+    which connect on that address with testipy --worker, and the address is output before the
+    results. Port 0 serves on any free port.
+
+    If collect_only is true, the tests which would be run, after all of the above have selected
+    them, are output without being run.
+
+    The rest of the keyword arguments are passed on to stream_tests.
+    """
+    if changed_since or changed:
+        paths = _affected_test_files(paths, changed_since, changed, cache_dir)
+    tests: Iterable[TestUnit]
+    if collect_only or workers > 1 or forks > 0 or parallel or shard or serve:
+        # the workers and forked processes (which --parallel may use) import the test modules as
+        # they run their tests so there's no need to import them here as well, a shard only needs
+        # to import the test modules of its own tests, and collected tests aren't run at all
+        tests = _collect_tests(paths, cache_dir)
+    else:
+        tests = _discover_tests(paths, cache_dir)
+    outcomes = OutcomeCache(cache_dir) if cache_dir else None
+    if outcomes:
+        tests = _forget_removed_tests(tests, outcomes)
+    history = DurationHistory(cache_dir) if cache_dir else None
+    # the position of each test among all of the tests, for merging the results of shards
+    positions: dict[str, int] = {}
+    if shard:
+        all_tests = list(tests)
+        positions = {_test_unit_id(test): i for i, test in enumerate(all_tests)}
+        # every shard must split the tests in the same way, so they're split by the durations
+        # file that they share rather than by each one's own history
+        shard_durations = read_durations_file(durations_file) if durations_file else None
+        tests = shard_tests(all_tests, *shard, durations=shard_durations)
+    if cache_dir and (impacted_since or impacted_by):
+        changes = parse_changes(impacted_by)
+        if impacted_since:
+            changes = {**changes_since(impacted_since), **changes}
+        tests = ImpactIndex(cache_dir).impacted(tests, changes)
+    if outcomes and outcomes.failed():
+        if last_failed:
+            tests = select_last_failed(tests, outcomes.failed())
+        elif failed_first:
+            tests = put_failed_first(tests, outcomes.failed())
+    if collect_only:
+        CollectedPrinter(_selected_references(tests)).print(out=out)
+        return
+    # the tests which have been taken to be run but whose outcomes haven't been recorded yet
+    unrecorded_tests: collections.deque[TestUnit] = collections.deque()
+    # the tests are run as they're discovered and their results are printed as they're run
+    results: list[TestResult] = []
+    line_recorder = LineRecorder() if record_impact else None
+    coordinator = None
+    if serve:
+        coordinator = Coordinator(*serve)
+        host, port = coordinator.address
+        out.write(
+            f"Serving tests on {host}:{port}, run workers with testipy --worker {host}:{port}\n"
+        )
+        out.flush()
+
+    def run(tests_to_run: Iterator[TestUnit]) -> Iterator[TestResult]:
+        return stream_tests(
+            tests_to_run,
+            workers=workers,
+            threads=threads,
+            forks=forks,
+            preload=preload,
+            parallel=parallel,
+            timeout=timeout,
+            maxfail=maxfail,
+            async_concurrency=async_concurrency,
+            line_recorder=line_recorder,
+            durations=dict(history.durations) if history else None,
+            coordinator=coordinator,
+        )
+
+    tests = _remember(tests, unrecorded_tests)
+    if reuse_results and cache_dir:
+        streamed_results = reuse_stored_results(tests, ResultCache(cache_dir), run)
+    else:
+        streamed_results = run(tests)
+    streamed_results = _record(streamed_results, results)
+    recorders: list[Union[OutcomeCache, DurationHistory, ResultsFile]] = []
+    if outcomes:
+        recorders.append(outcomes)
+    if history:
+        recorders.append(history)
+    if results_file:
+        recorders.append(ResultsFile(results_file, positions))
+    if recorders:
+        streamed_results = _record_by_test(streamed_results, unrecorded_tests, recorders)
+    printer = FriendlyPrinter(streamed_results, show_durations=show_durations)
     printer.print(out=out)
+    if line_recorder and cache_dir:
+        index = ImpactIndex(cache_dir)
+        index.update(line_recorder.lines)
+        index.save()
+    if durations is not None:
+        DurationsPrinter(results, slowest=durations or None).print(out=out)
+
+
+def _affected_test_files(
+    paths: Iterable[str],
+    changed_since: Optional[str],
+    changed: Sequence[str],
+    cache_dir: Optional[str],
+) -> list[str]:
+    changed_files = list(changed)
+    if changed_since:
+        changed_files.extend(changes_since(changed_since))
+    cache = ImportGraphCache(cache_dir) if cache_dir else None
+    test_files = affected_test_files(find_test_files(paths), changed_files, cache=cache)
+    if cache:
+        cache.save()
+    return test_files
+
+
+def _collect_tests(paths: Iterable[str], cache_dir: Optional[str]) -> Iterator[TestReference]:
+    cache = DiscoveryCache(cache_dir, "collected") if cache_dir else None
+    tests = collect_tests_in_paths(paths, cache=cache)
+    return _save_cache_when_exhausted(tests, cache)
+
+
+def _selected_references(tests: Iterable[TestUnit]) -> Iterator[TestReference]:
+    """
+    Pass collected tests through, narrowing the test classes which only had some of their test
+    methods selected down to those methods.
+    """
+    for test in tests:
+        if isinstance(test, TestMethods) and isinstance(test.test_class, TestReference):
+            methods = tuple(
+                (name, line) for name, line in test.test_class.methods if name in test.method_names
+            )
+            yield dataclasses.replace(test.test_class, methods=methods)
+        elif isinstance(test, TestReference):
+            yield test
+
+
+def _discover_tests(paths: Iterable[str], cache_dir: Optional[str]) -> Iterator[TestUnit]:
+    cache = DiscoveryCache(cache_dir, "discovered") if cache_dir else None
+    tests = discover_tests_in_paths(paths, cache=cache)
+    return _save_cache_when_exhausted(tests, cache)
+
+
+def _record(results: Iterator[TestResult], recorded: list[TestResult]) -> Iterator[TestResult]:
+    for result in results:
+        recorded.append(result)
+        yield result
+
+
+def _remember(
+    tests: Iterable[TestUnit], remembered: collections.deque[TestUnit]
+) -> Iterator[TestUnit]:
+    for test in tests:
+        remembered.append(test)
+        yield test
+
+
+def _record_by_test(
+    results: Iterator[TestResult],
+    tests: collections.deque[TestUnit],
+    recorders: Sequence[Union[OutcomeCache, DurationHistory, ResultsFile]],
+) -> Iterator[TestResult]:
+    # a result is yielded for each test in the order that they were given
+    for result in results:
+        test = tests.popleft()
+        for recorder in recorders:
+            recorder.record(test, result)
+        yield result
+    for recorder in recorders:
+        recorder.save()
+
+
+def _forget_removed_tests(tests: Iterable[TestUnit], outcomes: OutcomeCache) -> Iterator[TestUnit]:
+    """
+    Pass the tests through, forgetting the outcomes of the tests which have been removed from each
+    test module once all of the module's tests have been found.
+    """
+    module_tests: list[TestUnit] = []
+    for test in tests:
+        if module_tests and _test_unit_module(test) != _test_unit_module(module_tests[0]):
+            outcomes.forget_removed(module_tests)
+            module_tests = []
+        module_tests.append(test)
+        yield test
+    outcomes.forget_removed(module_tests)
+
+
+def _save_cache_when_exhausted(tests: Iterator[T], cache: Optional[DiscoveryCache]) -> Iterator[T]:
+    yield from tests
+    if cache:
+        cache.save()
+
+
+# the arguments which apply to the runs made by --watch
+_WATCH_ARGUMENTS = {"paths", "watch", "timeout", "cache_dir", "no_cache", "help"}
+
+# the arguments which need the cache, so can't be used with --no-cache
+_CACHE_ARGUMENTS = {
+    "last_failed",
+    "failed_first",
+    "reuse_results",
+    "record_impact",
+    "impacted_since",
+    "impacted_by",
+}
+
+
+def main(args: Sequence[str]):
+    parser = _argument_parser()
+    parsed_args = parser.parse_args(args)
+    if parsed_args.record_impact and parsed_args.async_concurrency > 1:
+        parser.error("argument --record-impact: not allowed with argument --async-concurrency")
+    if parsed_args.durations_file and not parsed_args.shard:
+        parser.error("argument --durations-file: only allowed with argument --shard")
+    if parsed_args.no_cache:
+        for action in parser._actions:
+            given = _given_option(action, args)
+            if action.dest in _CACHE_ARGUMENTS and given:
+                parser.error(f"argument --no-cache: not allowed with argument {given}")
+    if parsed_args.watch:
+        for action in parser._actions:
+            given = _given_option(action, args)
+            if action.dest not in _WATCH_ARGUMENTS and given:
+                parser.error(f"argument --watch: not allowed with argument {given}")
+    try:
+        if parsed_args.watch:
+            watch(parsed_args.paths, sys.stdout, timeout=parsed_args.timeout)
+            return
+        testipy(
+            parsed_args.paths,
+            sys.stdout,
+            workers=parsed_args.workers,
+            threads=parsed_args.threads,
+            forks=parsed_args.forks,
+            preload=parsed_args.preload,
+            parallel=parsed_args.parallel,
+            timeout=parsed_args.timeout,
+            maxfail=parsed_args.maxfail,
+            async_concurrency=parsed_args.async_concurrency,
+            collect_only=parsed_args.collect_only,
+            last_failed=parsed_args.last_failed,
+            failed_first=parsed_args.failed_first,
+            reuse_results=parsed_args.reuse_results,
+            record_impact=parsed_args.record_impact,
+            impacted_since=parsed_args.impacted_since,
+            impacted_by=parsed_args.impacted_by,
+            changed_since=parsed_args.changed_since,
+            changed=parsed_args.changed,
+            shard=parsed_args.shard,
+            durations_file=parsed_args.durations_file,
+            results_file=parsed_args.results_file,
+            serve=parsed_args.serve,
+            cache_dir=None if parsed_args.no_cache else parsed_args.cache_dir,
+            show_durations=parsed_args.show_durations,
+            durations=parsed_args.durations,
+        )
+    except (
+        InvalidPathError,
+        ForkingNotSupportedError,
+        MonitoringNotSupportedError,
+        GitError,
+        InvalidDurationsFileError,
+    ) as e:
+        parser.error(str(e))
+
+
+def _argument_parser() -> argparse.ArgumentParser:
+    # abbreviated options aren't allowed so that _given_option can tell which options were given
+    parser = argparse.ArgumentParser(
+        prog="testipy", description="Run some tests.", allow_abbrev=False
+    )
+    parser.add_argument(
+        "paths",
+        nargs="+",
+        metavar="PATH",
+        help="test file, directory or glob pattern to find tests in",
+    )
+    executors = parser.add_mutually_exclusive_group()
+    executors.add_argument(
+        "-n",
+        "--workers",
+        type=_positive_int,
+        default=1,
+        metavar="N",
+        help="spread the tests over N worker processes",
+    )
+    executors.add_argument(
+        "--threads",
+        type=_positive_int,
+        default=1,
+        metavar="N",
+        help=(
+            "spread the tests over N threads, for tests which mostly wait on I/O; tests decorated "
+            "with testipy.serial are run on their own"
+        ),
+    )
+    executors.add_argument(
+        "--forks",
+        type=_positive_int,
+        default=0,
+        metavar="N",
+        help=(
+            "run the tests of each test module in a process of its own forked from testipy, up to "
+            "N at once"
+        ),
+    )
+    executors.add_argument(
+        "-p",
+        "--parallel",
+        action="store_true",
+        help=(
+            "spread the tests over one thread per CPU on a free-threaded Python build, or one "
+            "worker process per CPU otherwise"
+        ),
+    )
+    executors.add_argument(
+        "--record-impact",
+        action="store_true",
+        help=(
+            "run the tests one at a time, recording which lines of the project each test runs so "
+            "that later runs can use --impacted-since and --impacted-by (needs Python 3.12 or "
+            "later)"
+        ),
+    )
+    executors.add_argument(
+        "--serve",
+        type=_address,
+        metavar="HOST:PORT",
+        help=(
+            "hand out the tests of each test module to the workers which connect on HOST:PORT with "
+            "testipy --worker HOST:PORT, which can be on other machines; port 0 picks a free port"
+        ),
+    )
+    parser.add_argument(
+        "--preload",
+        action="append",
+        default=[],
+        metavar="MODULE",
+        help=(
+            "import MODULE once before forking with --forks, so that the forked processes share it "
+            "instead of importing it again; can be given more than once"
+        ),
+    )
+    parser.add_argument(
+        "--timeout",
+        type=_positive_float,
+        metavar="SECONDS",
+        help=(
+            "error each test which runs for longer than SECONDS, unless it's decorated with its "
+            "own testipy.timeout"
+        ),
+    )
+    parser.add_argument(
+        "-x",
+        "--exitfirst",
+        action="store_const",
+        const=1,
+        dest="maxfail",
+        help="stop the run after the first test fails or errors, equivalent to --maxfail 1",
+    )
+    parser.add_argument(
+        "--maxfail",
+        type=_positive_int,
+        metavar="N",
+        help="stop the run after N tests fail or error, reporting the rest of the tests as not run",
+    )
+    parser.add_argument(
+        "--async-concurrency",
+        type=_positive_int,
+        default=1,
+        metavar="N",
+        help="run up to N async test functions concurrently (default: 1)",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help=(
+            "run the tests, then run them again whenever the test modules or the project modules "
+            "that they import change, only running the affected test modules and only showing "
+            "the results which changed; only --timeout can be given with it"
+        ),
+    )
+    rerun_order = parser.add_mutually_exclusive_group()
+    rerun_order.add_argument(
+        "--lf",
+        "--last-failed",
+        action="store_true",
+        dest="last_failed",
+        help=(
+            "only run the tests and test methods which failed or errored the last time that they "
+            "were run, or all of the tests if none did"
+        ),
+    )
+    rerun_order.add_argument(
+        "--ff",
+        "--failed-first",
+        action="store_true",
+        dest="failed_first",
+        help=(
+            "run the tests which failed or errored the last time that they were run before the "
+            "rest of the tests"
+        ),
+    )
+    parser.add_argument(
+        "--reuse-results",
+        action="store_true",
+        help=(
+            "don't run the tests which passed before if neither their code nor the source of any "
+            "project module that they import has changed since, reusing their results instead; "
+            "only for suites whose tests are deterministic"
+        ),
+    )
+    parser.add_argument(
+        "--impacted-since",
+        metavar="REF",
+        help=(
+            "only run the tests which ran lines that have changed since the git ref REF when they "
+            "were last run with --record-impact, and the tests which haven't been recorded"
+        ),
+    )
+    parser.add_argument(
+        "--impacted-by",
+        action="append",
+        default=[],
+        type=_change,
+        metavar="PATH[:LINES]",
+        help=(
+            "like --impacted-since, but with the changed lines given as a path and optionally a "
+            "comma separated list of lines and ranges of lines like 3,10-20; can be given more "
+            "than once"
+        ),
+    )
+    parser.add_argument(
+        "--changed-since",
+        metavar="REF",
+        help=(
+            "only run the test files which have changed since the git ref REF or which import a "
+            "project module that has, directly or through other project modules"
+        ),
+    )
+    parser.add_argument(
+        "--changed",
+        action="append",
+        default=[],
+        metavar="FILE",
+        help=(
+            "like --changed-since, but with the changed file given directly; can be given more "
+            "than once"
+        ),
+    )
+    parser.add_argument(
+        "--shard",
+        type=_shard,
+        metavar="K/N",
+        help=(
+            "only run the Kth of N shards of the tests, split so that the shards have about as "
+            "many tests as each other, or take about as long going by --durations-file"
+        ),
+    )
+    parser.add_argument(
+        "--durations-file",
+        metavar="FILE",
+        help=(
+            "split the shards by how long the tests took going by FILE, as written by testipy "
+            "merge-results --durations-file; every shard must be given the same FILE for the "
+            "shards to cover each test once"
+        ),
+    )
+    parser.add_argument(
+        "--results-file",
+        metavar="FILE",
+        help=(
+            "write the results to FILE so that they can be merged with the results of the other "
+            "shards with testipy merge-results"
+        ),
+    )
+    parser.add_argument(
+        "--collect-only",
+        action="store_true",
+        help="list the tests which would be run without importing or running them",
+    )
+    parser.add_argument(
+        "--show-durations",
+        action="store_true",
+        help="show the wall time and CPU time that each test took",
+    )
+    parser.add_argument(
+        "--durations",
+        type=_non_negative_int,
+        metavar="N",
+        help=(
+            "report the N slowest tests (all of them if N is 0), a histogram of test durations "
+            "and how long each phase of running each test class took"
+        ),
+    )
+    parser.add_argument(
+        "--cache-dir",
+        default=DEFAULT_CACHE_DIR,
+        metavar="DIR",
+        help=f"directory to cache state between runs in (default: {DEFAULT_CACHE_DIR})",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="don't read or write the cache, so none of the options which use it can be given",
+    )
+    return parser
+
+
+def _given_option(action: argparse.Action, args: Sequence[str]) -> Optional[str]:
+    """Return which of the option strings of an argument was given in args, if any was."""
+    for option in action.option_strings:
+        # short options can have their value attached, like -n2
+        attached = f"{option}=" if option.startswith("--") else option
+        if any(arg == option or arg.startswith(attached) for arg in args):
+            return option
+    return None
+
+
+def _change(s: str) -> str:
+    _, _, lines = s.partition(":")
+    if lines and not re.fullmatch(r"\d+(-\d+)?(,\d+(-\d+)?)*", lines):
+        raise argparse.ArgumentTypeError(
+            f"expected PATH or PATH:LINES like foo.py:3,10-20, got {s}"
+        )
+    return s
+
+
+def _shard(s: str) -> tuple[int, int]:
+    match = re.fullmatch(r"(\d+)/(\d+)", s)
+    if not match or not 1 <= int(match.group(1)) <= int(match.group(2)):
+        raise argparse.ArgumentTypeError(f"expected K/N with 1 <= K <= N, got {s}")
+    return int(match.group(1)), int(match.group(2))
+
+
+def _positive_float(s: str) -> float:
+    value = float(s)
+    if value <= 0:
+        raise argparse.ArgumentTypeError(f"expected a positive number, got {s}")
+    return value
+
+
+def _non_negative_int(s: str) -> int:
+    value = int(s)
+    if value < 0:
+        raise argparse.ArgumentTypeError(f"expected a non-negative integer, got {s}")
+    return value
 
 
-def main(paths: Iterable[str]):
-    testipy(paths, sys.stdout)
+def _positive_int(s: str) -> int:
+    value = int(s)
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"expected a positive integer, got {s}")
+    return value
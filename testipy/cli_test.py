@@ -1,7 +1,12 @@
+import contextlib
 import io
+import json
+import os
+import tempfile
 import unittest
 
-from .cli import testipy
+from .cache import write_cache
+from .cli import main, testipy
 from .common_test import dedent, get_project_root, def_line
 from test_data.e2e.exceptions_test import test_exceptions_error_the_test, raises_exception
 
@@ -131,8 +136,312 @@ class TestCLI(unittest.TestCase):
             f"expected cli to output:\n\n{expected}\ngot:\n\n{actual}",
         )
 
-    def run_test_files(self, *paths: str) -> str:
+    def test_directory(self):
+        actual = self.run_test_files("test_data/processes")
+
+        expected = dedent(
+            """
+            TestRunInOneProcess PASS
+            TestRunInOneProcess/test_first PASS
+            TestRunInOneProcess/test_second PASS
+            test_runs_in_worker_process FAIL
+                - Expected False to be True; ran in the parent process
+            4 tests run; 3 passed, 1 failed
+            """
+        )
+        self.assertEqual(
+            expected,
+            actual,
+            f"expected cli to output:\n\n{expected}\ngot:\n\n{actual}",
+        )
+
+    def test_collect_only(self):
+        actual = self.run_test_files("test_data/e2e/classes_test.py", collect_only=True)
+
+        expected = dedent(
+            """
+            test_data/e2e/classes_test.py:6 TestAdd
+            test_data/e2e/classes_test.py:7 TestAdd/test_adding_two_and_three_returns_five
+            test_data/e2e/classes_test.py:12 TestAdd/test_adding_three_and_three_returns_seven
+            test_data/e2e/classes_test.py:21 TestSetupAndTeardown
+            test_data/e2e/classes_test.py:39 TestSetupAndTeardown/test_first
+            test_data/e2e/classes_test.py:45 TestSetupAndTeardown/test_second
+            test_data/e2e/classes_test.py:56 test_class_is_torn_down
+            7 tests collected
+            """
+        )
+        self.assertEqual(
+            expected,
+            actual,
+            f"expected cli to output:\n\n{expected}\ngot:\n\n{actual}",
+        )
+
+    def test_collect_only_lists_the_tests_of_the_shard(self):
+        actual = self.run_test_files(
+            "test_data/e2e/classes_test.py", collect_only=True, shard=(2, 2)
+        )
+
+        expected = dedent(
+            """
+            test_data/e2e/classes_test.py:21 TestSetupAndTeardown
+            test_data/e2e/classes_test.py:39 TestSetupAndTeardown/test_first
+            test_data/e2e/classes_test.py:45 TestSetupAndTeardown/test_second
+            3 tests collected
+            """
+        )
+        self.assertEqual(
+            expected,
+            actual,
+            f"expected cli to output:\n\n{expected}\ngot:\n\n{actual}",
+        )
+
+    def test_collect_only_lists_the_tests_which_failed_last_time(self):
+        cache_dir = self.temp_cache_dir()
+        self.run_test_files("test_data/outcomes/mixed_test.py", cache_dir=cache_dir)
+
+        actual = self.run_test_files(
+            "test_data/outcomes/mixed_test.py",
+            cache_dir=cache_dir,
+            collect_only=True,
+            last_failed=True,
+        )
+
+        expected = dedent(
+            """
+            test_data/outcomes/mixed_test.py:8 TestMixed
+            test_data/outcomes/mixed_test.py:12 TestMixed/test_fails
+            2 tests collected
+            """
+        )
+        self.assertEqual(
+            expected,
+            actual,
+            f"expected cli to output:\n\n{expected}\ngot:\n\n{actual}",
+        )
+
+    def test_workers(self):
+        paths = (
+            "test_data/e2e/exceptions_test.py",
+            "test_data/e2e/failures_test.py",
+            "test_data/e2e/passing_test.py",
+        )
+
+        actual = self.run_test_files(*paths, workers=2)
+
+        expected = self.run_test_files(*paths)
+        self.assertEqual(
+            expected,
+            actual,
+            f"expected cli with 2 workers to output:\n\n{expected}\ngot:\n\n{actual}",
+        )
+
+    def test_threads(self):
+        paths = (
+            "test_data/e2e/exceptions_test.py",
+            "test_data/e2e/failures_test.py",
+            "test_data/e2e/passing_test.py",
+        )
+
+        actual = self.run_test_files(*paths, threads=2)
+
+        expected = self.run_test_files(*paths)
+        self.assertEqual(
+            expected,
+            actual,
+            f"expected cli with 2 threads to output:\n\n{expected}\ngot:\n\n{actual}",
+        )
+
+    def test_exitfirst(self):
+        actual = self.run_test_files(
+            "test_data/e2e/failures_test.py", "test_data/e2e/passing_test.py", maxfail=1
+        )
+
+        expected = dedent(
+            """
+            test_multiple_failures FAIL
+                - failure message
+                - multiple failures are allowed in the same test
+            test_require_failure NOT RUN
+            test_passes NOT RUN
+            1 test run; 1 failed, 2 not run
+            """
+        )
+        self.assertEqual(
+            expected,
+            actual,
+            f"expected cli to output:\n\n{expected}\ngot:\n\n{actual}",
+        )
+
+    def test_workers_run_the_same_tests_as_a_serial_run(self):
+        paths = [
+            "test_data/discovery/future_annotations.py",
+            "test_data/discovery/assigned_tests.py",
+        ]
+
+        actual = self.run_test_files(*paths, workers=2)
+
+        expected = self.run_test_files(*paths)
+        self.assertEqual(
+            expected,
+            actual,
+            f"expected cli to output:\n\n{expected}\ngot:\n\n{actual}",
+        )
+        self.assertIn("4 tests run", actual, f"expected 4 tests to be run, got:\n\n{actual}")
+
+    def test_last_failed(self):
+        cache_dir = self.temp_cache_dir()
+        self.run_test_files("test_data/outcomes/mixed_test.py", cache_dir=cache_dir)
+
+        actual = self.run_test_files(
+            "test_data/outcomes/mixed_test.py", cache_dir=cache_dir, last_failed=True
+        )
+
+        expected = dedent(
+            """
+            TestMixed FAIL
+            TestMixed/test_fails FAIL
+                - oh no!
+            2 tests run; 2 failed
+            """
+        )
+        self.assertEqual(
+            expected,
+            actual,
+            f"expected cli to output:\n\n{expected}\ngot:\n\n{actual}",
+        )
+
+    def test_last_failed_runs_all_of_the_tests_when_none_of_them_failed(self):
+        cache_dir = self.temp_cache_dir()
+        self.run_test_files("test_data/outcomes/mixed_test.py", cache_dir=cache_dir)
+
+        actual = self.run_test_files(
+            "test_data/e2e/passing_test.py", cache_dir=cache_dir, last_failed=True
+        )
+
+        expected = dedent(
+            """
+            test_passes PASS
+            1 test run; 1 passed
+            """
+        )
+        self.assertEqual(
+            expected,
+            actual,
+            f"expected cli to output:\n\n{expected}\ngot:\n\n{actual}",
+        )
+
+    def test_failed_first(self):
+        cache_dir = self.temp_cache_dir()
+        self.run_test_files(
+            "test_data/e2e/passing_test.py", "test_data/e2e/failures_test.py", cache_dir=cache_dir
+        )
+
+        actual = self.run_test_files(
+            "test_data/e2e/passing_test.py",
+            "test_data/e2e/failures_test.py",
+            cache_dir=cache_dir,
+            failed_first=True,
+        )
+
+        expected = dedent(
+            """
+            test_multiple_failures FAIL
+                - failure message
+                - multiple failures are allowed in the same test
+            test_require_failure FAIL
+                - requiring a failure stops the test
+            test_passes PASS
+            3 tests run; 1 passed, 2 failed
+            """
+        )
+        self.assertEqual(
+            expected,
+            actual,
+            f"expected cli to output:\n\n{expected}\ngot:\n\n{actual}",
+        )
+
+    def test_shards_cover_each_test_once_whatever_their_own_histories(self):
+        paths = ["test_data/e2e/passing_test.py", "test_data/e2e/failures_test.py"]
+        durations_file = os.path.join(self.temp_cache_dir(), "durations.json")
+        os.makedirs(os.path.dirname(durations_file))
+        with open(durations_file, "w") as f:
+            json.dump({"durations": {"test_data.e2e.passing_test::test_passes": 1.0}}, f)
+        # going by their own histories, the shards would both run test_passes and neither would
+        # run test_require_failure
+        histories = [
+            {
+                "test_data.e2e.passing_test::test_passes": 100.0,
+                "test_data.e2e.failures_test::test_multiple_failures": 1.0,
+            },
+            {
+                "test_data.e2e.failures_test::test_require_failure": 100.0,
+                "test_data.e2e.passing_test::test_passes": 1.0,
+            },
+        ]
+        for shared_durations_file in [None, durations_file]:
+            with self.subTest(durations_file=shared_durations_file):
+                test_ids = []
+                for shard, history in zip([1, 2], histories):
+                    cache_dir = self.temp_cache_dir()
+                    write_cache(cache_dir, "durations.json", history)
+                    results_file = os.path.join(cache_dir, "results.json")
+                    self.run_test_files(
+                        *paths,
+                        cache_dir=cache_dir,
+                        shard=(shard, 2),
+                        durations_file=shared_durations_file,
+                        results_file=results_file,
+                    )
+                    with open(results_file) as f:
+                        test_ids.extend(entry["id"] for entry in json.load(f)["results"])
+
+                actual = sorted(test_ids)
+                expected = [
+                    "test_data.e2e.failures_test::test_multiple_failures",
+                    "test_data.e2e.failures_test::test_require_failure",
+                    "test_data.e2e.passing_test::test_passes",
+                ]
+                self.assertEqual(
+                    expected, actual, f"expected shards to run {expected} once, got {actual}"
+                )
+
+    def temp_cache_dir(self) -> str:
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        return os.path.join(temp_dir.name, ".testipy_cache")
+
+    def run_test_files(self, *paths: str, **kwargs) -> str:
         """Run a test file and return the output."""
         out = io.StringIO()
-        testipy(paths, out)
+        testipy(paths, out, **kwargs)
         return out.getvalue()
+
+
+class TestArguments(unittest.TestCase):
+    longMessage = False
+
+    def test_watch_is_not_allowed_with_arguments_it_ignores(self):
+        actual = self.error_for("test_data/e2e/passing_test.py", "--watch", "-n2")
+
+        expected = "argument --watch: not allowed with argument -n"
+        self.assertIn(expected, actual, f"expected error '{expected}', got:\n\n{actual}")
+
+    def test_no_cache_is_not_allowed_with_arguments_which_use_the_cache(self):
+        for option in ["--lf", "--ff", "--reuse-results", "--record-impact", "--impacted-by=a.py"]:
+            with self.subTest(option=option):
+                actual = self.error_for("test_data/e2e/passing_test.py", "--no-cache", option)
+
+                expected = f"argument --no-cache: not allowed with argument {option.split('=')[0]}"
+                self.assertIn(expected, actual, f"expected error '{expected}', got:\n\n{actual}")
+
+    def test_options_can_not_be_abbreviated(self):
+        actual = self.error_for("test_data/e2e/passing_test.py", "--no-cache", "--reuse")
+
+        expected = "unrecognized arguments: --reuse"
+        self.assertIn(expected, actual, f"expected error '{expected}', got:\n\n{actual}")
+
+    def error_for(self, *args: str) -> str:
+        err = io.StringIO()
+        with self.assertRaises(SystemExit), contextlib.redirect_stderr(err):
+            main(args)
+        return err.getvalue()
@@ -0,0 +1,51 @@
+"""
+Client for the testipy daemon, which only imports the standard library so that it starts quickly.
+"""
+import argparse
+import json
+import os
+import shutil
+import socket
+import sys
+from typing import BinaryIO, Sequence
+
+from .cache import DEFAULT_CACHE_DIR
+
+DEFAULT_SOCKET_PATH = os.path.join(DEFAULT_CACHE_DIR, "daemon.sock")
+
+
+def run_in_daemon(args: Sequence[str], out: BinaryIO, *, socket_path: str = DEFAULT_SOCKET_PATH):
+    """
+    Ask the daemon listening on the given socket to run testipy with the given arguments from the
+    current directory, writing its output to out as it arrives.
+    """
+    request = {
+        "args": list(args),
+        "cwd": os.getcwd(),
+        # the output is formatted by the daemon, so it needs to know what it's being written to
+        "env": {
+            "COLUMNS": str(shutil.get_terminal_size().columns),
+            **({"FORCE_COLOR": "1"} if out.isatty() else {}),
+        },
+    }
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+        connection.connect(socket_path)
+        connection.sendall(json.dumps(request).encode() + b"\n")
+        connection.shutdown(socket.SHUT_WR)
+        while chunk := connection.recv(1 << 16):
+            out.write(chunk)
+            out.flush()
+
+
+def main(args: Sequence[str]):
+    # the rest of the arguments are for the run, so its help is shown rather than the client's
+    parser = argparse.ArgumentParser(prog="testipy --connect", add_help=False, allow_abbrev=False)
+    parser.add_argument("--socket", default=DEFAULT_SOCKET_PATH)
+    parsed_args, run_args = parser.parse_known_args(args)
+    try:
+        run_in_daemon(run_args, sys.stdout.buffer, socket_path=parsed_args.socket)
+    except (FileNotFoundError, ConnectionRefusedError):
+        parser.error(
+            f"no testipy daemon is listening on {parsed_args.socket}, start one with "
+            f"python -m testipy --daemon"
+        )
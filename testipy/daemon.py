@@ -0,0 +1,239 @@
+import argparse
+import contextlib
+import importlib
+import itertools
+import json
+import os
+import signal
+import socket
+import sys
+import traceback
+from typing import Any, Iterator, Optional, Sequence
+
+from .client import DEFAULT_SOCKET_PATH
+
+
+class DaemonAlreadyRunningError(Exception):
+    """Raised when a daemon is started on a socket which another daemon is listening on."""
+
+    pass
+
+
+class Daemon:
+    """
+    Server which keeps an interpreter with testipy and the modules imported by previous runs warm,
+    so that runs don't have to import them all again.
+
+    Each run is requested by a client over a Unix socket and is carried out in a process forked from
+    the daemon, which writes the output of the run back to the client. Once the run is done, the
+    modules that it imported are imported into the daemon so that later runs start with them.
+    Before each run, modules whose source file has changed are imported again, along with the
+    project's modules which were imported after them since they may depend on the changed ones.
+
+    The daemon only serves runs from the directory that it was started in, since the modules that
+    it has imported were found relative to that directory and its sys.path.
+    """
+
+    def __init__(self, socket_path: str = DEFAULT_SOCKET_PATH, *, preload: Sequence[str] = ()):
+        self._socket_path = socket_path
+        self._preload = preload
+        self._cwd = os.getcwd()
+        # (mtime, size) of the source file of each module imported into the daemon, in the order
+        # that they were imported
+        self._module_stats: dict[str, Optional[tuple[int, int]]] = {}
+
+    def serve(self):
+        """Import testipy and the preload modules and serve runs until interrupted."""
+        # the command line interface and everything that it imports, like rich, are needed by
+        # every run
+        self._warm(["testipy.cli", *self._preload])
+        # stopping with SIGTERM should clean up the socket the same as with ctrl-c
+        signal.signal(signal.SIGTERM, signal.default_int_handler)
+        server = None
+        try:
+            # a signal which arrives while the socket is being created is only handled once the
+            # server has been assigned, so that the socket is always removed
+            with _signals_blocked(signal.SIGINT, signal.SIGTERM):
+                server = self._listen()
+            while True:
+                connection, _ = server.accept()
+                with connection:
+                    try:
+                        self._serve_run(connection)
+                    except Exception:
+                        # one bad run shouldn't take the daemon down with it
+                        traceback.print_exc()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            if server is not None:
+                server.close()
+                os.unlink(self._socket_path)
+
+    def _listen(self) -> socket.socket:
+        if os.path.exists(self._socket_path):
+            if _is_listening(self._socket_path):
+                raise DaemonAlreadyRunningError(
+                    f"a testipy daemon is already listening on {self._socket_path}"
+                )
+            os.unlink(self._socket_path)
+        os.makedirs(os.path.dirname(self._socket_path) or ".", exist_ok=True)
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        server.bind(self._socket_path)
+        server.listen()
+        return server
+
+    def _serve_run(self, connection: socket.socket):
+        with connection.makefile("rb") as f:
+            request = json.loads(f.readline())
+        if os.path.realpath(request["cwd"]) != os.path.realpath(self._cwd):
+            connection.sendall(
+                f"testipy --connect: error: the testipy daemon listening on {self._socket_path} "
+                f"serves runs from {self._cwd}, start another one with --socket to run from "
+                f"{request['cwd']}\n".encode()
+            )
+            return
+        self._reimport_changed_modules()
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.close(read_fd)
+            _run_in_child(connection, request, write_fd)
+        os.close(write_fd)
+        with os.fdopen(read_fd, "rb") as f:
+            imported_modules = f.read()
+        os.waitpid(pid, 0)
+        if imported_modules:
+            self._warm(json.loads(imported_modules))
+
+    def _warm(self, module_names: Sequence[str]):
+        for name in module_names:
+            if name in self._module_stats:
+                continue
+            try:
+                importlib.import_module(name)
+            except BaseException:
+                # the module will be imported by the runs which need it instead
+                continue
+        self._record_imported_modules()
+
+    def _record_imported_modules(self):
+        for name, module in list(sys.modules.items()):
+            if name not in self._module_stats:
+                self._module_stats[name] = _source_stat(module)
+
+    def _reimport_changed_modules(self):
+        names = list(self._module_stats)
+        changed = [
+            i
+            for i, name in enumerate(names)
+            if name in sys.modules and _source_stat(sys.modules[name]) != self._module_stats[name]
+        ]
+        if not changed:
+            return
+        # the changed modules come first so that they're imported again before the modules which
+        # might depend on them
+        changed_names = [names[i] for i in changed]
+        to_reimport = changed_names + [
+            name
+            for name in itertools.islice(names, changed[0], None)
+            if name in sys.modules
+            and name not in changed_names
+            and _is_project_module(sys.modules[name])
+        ]
+        for name in to_reimport:
+            sys.modules.pop(name, None)
+            del self._module_stats[name]
+        self._warm(to_reimport)
+
+
+def _run_in_child(connection: socket.socket, request: dict[str, Any], modules_fd: int):
+    """
+    Carry out a run in a process forked from the daemon, writing its output to the client and the
+    names of the modules that it imported to modules_fd, then exit.
+    """
+    from .cli import main
+
+    modules_before = set(sys.modules)
+    out = connection.makefile("w", encoding="utf-8", buffering=1)
+    sys.stdout = sys.stderr = out
+    try:
+        os.environ.update(request.get("env", {}))
+        main(request["args"])
+    except SystemExit:
+        pass
+    except BaseException:
+        traceback.print_exc()
+    finally:
+        out.flush()
+        imported_modules = sorted(set(sys.modules) - modules_before)
+        with os.fdopen(modules_fd, "w") as f:
+            json.dump(imported_modules, f)
+        os._exit(0)
+
+
+@contextlib.contextmanager
+def _signals_blocked(*signals: signal.Signals) -> Iterator[None]:
+    """Hold off handling the given signals until the end of the block."""
+    signal.pthread_sigmask(signal.SIG_BLOCK, signals)
+    try:
+        yield
+    finally:
+        signal.pthread_sigmask(signal.SIG_UNBLOCK, signals)
+
+
+def _source_stat(module: Any) -> Optional[tuple[int, int]]:
+    path = getattr(module, "__file__", None)
+    if not path:
+        return None
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _is_project_module(module: Any) -> bool:
+    path = getattr(module, "__file__", None)
+    if not path:
+        return False
+    return not os.path.relpath(os.path.abspath(path)).startswith(os.pardir) and (
+        "site-packages" not in path
+    )
+
+
+def _is_listening(socket_path: str) -> bool:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        try:
+            client.connect(socket_path)
+        except OSError:
+            return False
+    return True
+
+
+def main(args: Sequence[str]):
+    parser = argparse.ArgumentParser(
+        prog="testipy --daemon",
+        description=(
+            "Serve test runs from a warm interpreter for the current directory. Runs are requested "
+            "from the same directory with testipy --connect [--socket PATH] ARGS..."
+        ),
+    )
+    parser.add_argument(
+        "--socket",
+        default=DEFAULT_SOCKET_PATH,
+        metavar="PATH",
+        help=f"Unix socket to listen on (default: {DEFAULT_SOCKET_PATH})",
+    )
+    parser.add_argument(
+        "--preload",
+        action="append",
+        default=[],
+        metavar="MODULE",
+        help="import MODULE when the daemon starts; can be given more than once",
+    )
+    parsed_args = parser.parse_args(args)
+    try:
+        Daemon(parsed_args.socket, preload=parsed_args.preload).serve()
+    except DaemonAlreadyRunningError as e:
+        parser.error(str(e))
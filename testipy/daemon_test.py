@@ -0,0 +1,139 @@
+import io
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+from typing import Optional
+
+from .cli import testipy
+from .client import run_in_daemon
+from .common_test import dedent, get_project_root
+
+
+class TestDaemon(unittest.TestCase):
+    longMessage = False
+
+    def setUp(self):
+        self.socket_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.socket_dir.cleanup)
+        self.socket_path = os.path.join(self.socket_dir.name, "daemon.sock")
+        self.daemon = subprocess.Popen(
+            [sys.executable, "-m", "testipy", "--daemon", "--socket", self.socket_path],
+            cwd=get_project_root(),
+        )
+        self.addCleanup(self.stop_daemon)
+        deadline = time.monotonic() + 10
+        while not os.path.exists(self.socket_path):
+            if time.monotonic() > deadline:
+                self.fail("daemon didn't start listening within 10s")
+            time.sleep(0.01)
+
+    def stop_daemon(self):
+        self.daemon.terminate()
+        self.daemon.wait()
+
+    def test_output_is_same_as_running_directly(self):
+        paths = ["test_data/e2e/passing_test.py", "test_data/e2e/failures_test.py"]
+
+        actual = self.run_in_daemon(*paths, "--no-cache")
+
+        out = io.StringIO()
+        testipy(paths, out)
+        expected = out.getvalue()
+        self.assertEqual(
+            expected,
+            actual,
+            f"expected daemon to output:\n\n{expected}\ngot:\n\n{actual}",
+        )
+
+    def test_changed_test_module_is_imported_again(self):
+        with tempfile.TemporaryDirectory(dir=get_project_root()) as test_dir:
+            path = os.path.relpath(os.path.join(test_dir, "changes_test.py"), get_project_root())
+            self.write_test(path, "t.assert_true(True)")
+            self.run_in_daemon(path, "--no-cache")
+            self.write_test(path, "t.assert_true(False)")
+
+            actual = self.run_in_daemon(path, "--no-cache")
+
+        expected = dedent(
+            """
+            test_changes FAIL
+                - Expected False to be True
+            1 test run; 1 failed
+            """
+        )
+        self.assertEqual(
+            expected,
+            actual,
+            f"expected daemon to run the changed test and output:\n\n{expected}\ngot:\n\n{actual}",
+        )
+
+    def test_stops_with_sigterm_and_removes_socket(self):
+        self.daemon.terminate()
+        self.daemon.wait()
+
+        self.assertFalse(
+            os.path.exists(self.socket_path),
+            f"expected daemon to remove {self.socket_path} when stopped",
+        )
+
+    def test_refuses_runs_from_another_directory(self):
+        with tempfile.TemporaryDirectory() as other_dir:
+            actual = self.run_in_daemon("test_data/e2e/passing_test.py", cwd=other_dir)
+
+        self.assertIn(
+            f"serves runs from {get_project_root()}",
+            actual,
+            f"expected daemon to refuse a run from another directory, got:\n\n{actual}",
+        )
+
+    def test_client_takes_socket_after_run_arguments(self):
+        process = subprocess.run(
+            [
+                sys.executable,
+                "-m",
+                "testipy",
+                "--connect",
+                "test_data/e2e/passing_test.py",
+                "--no-cache",
+                "--socket",
+                self.socket_path,
+            ],
+            cwd=get_project_root(),
+            capture_output=True,
+            text=True,
+        )
+
+        expected = dedent(
+            """
+            test_passes PASS
+            1 test run; 1 passed
+            """
+        )
+        self.assertEqual(
+            expected,
+            process.stdout,
+            f"expected client to output:\n\n{expected}\ngot:\n\n{process.stdout}{process.stderr}",
+        )
+
+    def write_test(self, path: str, assertion: str):
+        with open(os.path.join(get_project_root(), path), "w") as f:
+            f.write(
+                "from testipy import TestContext\n"
+                "\n"
+                "\n"
+                "def test_changes(t: TestContext):\n"
+                f"    {assertion}\n"
+            )
+
+    def run_in_daemon(self, *args: str, cwd: Optional[str] = None) -> str:
+        out = io.BytesIO()
+        original_cwd = os.getcwd()
+        os.chdir(cwd or get_project_root())
+        try:
+            run_in_daemon(args, out, socket_path=self.socket_path)
+        finally:
+            os.chdir(original_cwd)
+        return out.getvalue().decode()
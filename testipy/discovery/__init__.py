@@ -0,0 +1,4 @@
+from .cache import DiscoveryCache  # noqa: F401
+from .discovery import discover_tests, discover_tests_in_paths  # noqa: F401
+from .paths import find_test_files, InvalidPathError  # noqa: F401
+from .static import collect_tests, collect_tests_in_paths  # noqa: F401
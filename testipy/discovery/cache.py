@@ -0,0 +1,81 @@
+import hashlib
+import os
+import threading
+from typing import Any, Optional
+
+from ..cache import read_cache, write_cache
+from ..running import TestReference
+from .paths import _module_name
+
+
+class DiscoveryCache:
+    """
+    On-disk index of the tests found in each test file, so that test files which haven't changed
+    since they were last looked at don't need to be parsed or inspected again.
+
+    Entries are keyed by the test file's path and validated against its modification time and size.
+    If those have changed then the file's content hash is compared as well, so that touching a file
+    without changing it doesn't invalidate its entry.
+
+    Separate indexes are kept under different names for each way of discovering tests, since they
+    don't necessarily agree on what a test is.
+    """
+
+    def __init__(self, cache_dir: str, name: str):
+        self._cache_dir = cache_dir
+        self._name = f"discovery/{name}.json"
+        self._entries: dict[str, Any] = read_cache(cache_dir, self._name) or {}
+        self._lock = threading.Lock()
+        self._dirty = False
+
+    def get(self, path: str) -> Optional[list[TestReference]]:
+        """Return the tests indexed for the file at the given path if it hasn't changed since."""
+        with self._lock:
+            entry = self._entries.get(path)
+        if entry is None:
+            return None
+        stat = os.stat(path)
+        if entry["mtime_ns"] != stat.st_mtime_ns or entry["size"] != stat.st_size:
+            if entry["size"] != stat.st_size or entry["sha256"] != _hash_file(path):
+                return None
+            with self._lock:
+                entry["mtime_ns"] = stat.st_mtime_ns
+                self._dirty = True
+        module_name = _module_name(path)
+        return [
+            TestReference(
+                path,
+                module_name,
+                name,
+                line,
+                methods=tuple((method_name, method_line) for method_name, method_line in methods),
+            )
+            for name, line, methods in entry["tests"]
+        ]
+
+    def set(self, path: str, tests: list[TestReference]):
+        """Index the tests found in the file at the given path."""
+        stat = os.stat(path)
+        entry = {
+            "mtime_ns": stat.st_mtime_ns,
+            "size": stat.st_size,
+            "sha256": _hash_file(path),
+            "tests": [[test.name, test.line, test.methods] for test in tests],
+        }
+        with self._lock:
+            self._entries[path] = entry
+            self._dirty = True
+
+    def save(self):
+        """Write the index to disk if it's changed, dropping entries for files which are gone."""
+        with self._lock:
+            if not self._dirty:
+                return
+            entries = {path: entry for path, entry in self._entries.items() if os.path.exists(path)}
+            write_cache(self._cache_dir, self._name, entries)
+            self._dirty = False
+
+
+def _hash_file(path: str) -> str:
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
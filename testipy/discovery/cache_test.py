@@ -0,0 +1,132 @@
+import os
+import tempfile
+import unittest
+
+from ..running import TestReference
+from ..running.introspection import _definition_line
+from .cache import DiscoveryCache
+from .discovery import discover_tests
+from .static import collect_tests
+
+
+class TestDiscoveryCache(unittest.TestCase):
+    longMessage = False
+
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.cache_dir = os.path.join(temp_dir.name, ".testipy_cache")
+        self.path = os.path.join(temp_dir.name, "foo_test.py")
+        self.write_test_file("def test_foo(t: TestContext):\n    pass\n")
+
+    def test_returns_none_for_files_not_in_index(self):
+        cache = DiscoveryCache(self.cache_dir, "collected")
+
+        actual = cache.get(self.path)
+
+        self.assertIsNone(actual, f"expected file not in index to not be found, got {actual}")
+
+    def test_returns_indexed_tests_for_unchanged_file(self):
+        cache = DiscoveryCache(self.cache_dir, "collected")
+        tests = collect_tests(self.path, cache=cache)
+        cache.save()
+
+        actual = DiscoveryCache(self.cache_dir, "collected").get(self.path)
+
+        self.assertEqual(
+            tests,
+            actual,
+            f"expected unchanged file to be indexed with {tests}, got {actual}",
+        )
+
+    def test_returns_indexed_tests_for_touched_file_with_same_content(self):
+        cache = DiscoveryCache(self.cache_dir, "collected")
+        tests = collect_tests(self.path, cache=cache)
+        stat = os.stat(self.path)
+        os.utime(self.path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        actual = cache.get(self.path)
+
+        self.assertEqual(
+            tests,
+            actual,
+            f"expected touched file to be indexed with {tests}, got {actual}",
+        )
+
+    def test_returns_none_for_changed_file(self):
+        cache = DiscoveryCache(self.cache_dir, "collected")
+        collect_tests(self.path, cache=cache)
+        self.write_test_file("def test_bar(t: TestContext):\n    pass\n")
+
+        actual = cache.get(self.path)
+
+        self.assertIsNone(actual, f"expected changed file to not be found, got {actual}")
+
+    def test_collect_tests_returns_indexed_tests(self):
+        cache = DiscoveryCache(self.cache_dir, "collected")
+        cache.set(self.path, [TestReference(self.path, "foo_test", "test_indexed", 1)])
+
+        actual = [test.name for test in collect_tests(self.path, cache=cache)]
+
+        expected = ["test_indexed"]
+        self.assertEqual(
+            expected,
+            actual,
+            f"expected collect_tests to return indexed tests {expected}, got {actual}",
+        )
+
+    def test_discover_tests_indexes_test_functions_and_test_classes(self):
+        from test_data.discovery.functions_and_classes import test_one, test_two, TestOne, TestTwo
+
+        path = "test_data/discovery/functions_and_classes.py"
+        cache = DiscoveryCache(self.cache_dir, "discovered")
+        discover_tests(path, cache=cache)
+
+        actual = cache.get(path)
+
+        module = "test_data.discovery.functions_and_classes"
+        expected = [
+            TestReference(path, module, "test_one", test_one.__code__.co_firstlineno),
+            TestReference(path, module, "test_two", test_two.__code__.co_firstlineno),
+            TestReference(
+                path,
+                module,
+                "TestOne",
+                _definition_line(TestOne),
+                methods=(("test_a", TestOne.test_a.__code__.co_firstlineno),),
+            ),
+            TestReference(
+                path,
+                module,
+                "TestTwo",
+                _definition_line(TestTwo),
+                methods=(("test_b", TestTwo.test_b.__code__.co_firstlineno),),
+            ),
+        ]
+        self.assertEqual(
+            expected,
+            actual,
+            f"expected discover_tests to index {expected}, got {actual}",
+        )
+
+    def test_discover_tests_returns_indexed_tests(self):
+        from test_data.discovery.two_valid_tests import test_one, test_two
+
+        path = "test_data/discovery/two_valid_tests.py"
+        cache = DiscoveryCache(self.cache_dir, "discovered")
+        discover_tests(path, cache=cache)
+        cache.set(path, [TestReference(path, "test_data.discovery.two_valid_tests", "test_two", 1)])
+
+        actual = discover_tests(path, cache=cache)
+
+        expected = [test_two]
+        self.assertEqual(
+            expected,
+            actual,
+            f"expected discover_tests to return indexed tests {expected}, got {actual}",
+        )
+        self.assertNotIn(test_one, actual)
+
+    def write_test_file(self, source: str):
+        with open(self.path, "w") as f:
+            f.write(source)
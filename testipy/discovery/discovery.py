@@ -0,0 +1,127 @@
+import concurrent.futures
+import importlib
+import inspect
+from typing import Any, Callable, Iterable, Iterator, Optional, Union
+
+from ..running import TestFunction, TestReference
+from ..running.classes import _get_sorted_test_method_names
+from ..running.introspection import _definition_line, _is_test_function, _is_test_method
+from .cache import DiscoveryCache
+from .paths import find_test_files, _module_name
+
+
+def discover_tests(
+    path: str, *, cache: Optional[DiscoveryCache] = None
+) -> list[Union[TestFunction, type]]:
+    """
+    Return the test functions and test classes found at the given path, sorted by order of
+    definition.
+
+    Definitions:
+        Test Function
+            Function which starts with 'test_' accepts a single TestContext argument.
+        Test Class
+            Class which starts with 'Test' and has at least one test method.
+        Test Method
+            Method which starts with 'test_' and accepts a single TestContext argument.
+
+    Test functions / classes which are defined in modules other than the one at the given path are
+    ignored.
+
+    If a cache is given and the file at the given path hasn't changed since its tests were stored in
+    it, the module is imported and the stored tests are looked up on it by name without inspecting
+    it. Otherwise the tests are found by inspecting the module and then stored in the cache.
+    """
+    return _discover_tests(path, cache, cache.get(path) if cache else None)
+
+
+def _discover_tests(
+    path: str, cache: Optional[DiscoveryCache], cached_tests: Optional[list[TestReference]]
+) -> list[Union[TestFunction, type]]:
+    """Discover the tests at the given path as discover_tests does, given its cached tests."""
+    module_name = _module_name(path)
+    module = importlib.import_module(module_name)
+    # the module could still define its cached tests differently at runtime, e.g. depending on the
+    # modules it imports, in which case it's inspected again
+    if cached_tests is not None and all(hasattr(module, test.name) for test in cached_tests):
+        return [getattr(module, test.name) for test in cached_tests]
+    tests = [
+        member
+        for _, member in inspect.getmembers(module, predicate=_is_test_function_or_test_class)
+    ]
+    test_defined_in_module = filter(_defined_in_module(module_name), tests)
+    sorted_tests = sorted(test_defined_in_module, key=_definition_line)
+    if cache:
+        cache.set(path, [_reference(path, module_name, test) for test in sorted_tests])
+    return sorted_tests
+
+
+def discover_tests_in_paths(
+    paths: Iterable[str],
+    *,
+    max_workers: Optional[int] = None,
+    cache: Optional[DiscoveryCache] = None,
+) -> Iterator[Union[TestFunction, type]]:
+    """
+    Yield the test functions and test classes found in the test files at the given paths, which
+    can be files, directories or glob patterns (see find_test_files).
+
+    The test modules are imported one at a time on the current thread, since importing them runs
+    their code, which might only work on the main thread, like installing signal handlers. If a
+    cache is given, it's used as discover_tests uses it, with the test files being read and hashed
+    to check their entries by a pool of max_workers threads ahead of the imports. The tests are
+    yielded in the order of their test files and then by order of definition, just like
+    discover_tests, with each test file's tests being yielded as soon as it's been imported so that
+    they can be run while later test files are still being imported.
+
+    The paths are expanded straight away so that InvalidPathError is raised before any tests are
+    yielded.
+    """
+    test_files = find_test_files(paths)
+    return _discover_tests_in_files(test_files, max_workers, cache)
+
+
+def _discover_tests_in_files(
+    test_files: list[str], max_workers: Optional[int], cache: Optional[DiscoveryCache]
+) -> Iterator[Union[TestFunction, type]]:
+    if cache is None:
+        for test_file in test_files:
+            yield from _discover_tests(test_file, None, None)
+        return
+    with concurrent.futures.ThreadPoolExecutor(max_workers) as executor:
+        for test_file, cached_tests in zip(test_files, executor.map(cache.get, test_files)):
+            yield from _discover_tests(test_file, cache, cached_tests)
+
+
+def _is_test_function_or_test_class(obj: Any) -> bool:
+    return _is_test_function(obj) or _is_test_class(obj)
+
+
+def _is_test_class(obj: Any) -> bool:
+    return inspect.isclass(obj) and obj.__name__.startswith("Test") and _has_test_method(obj)
+
+
+def _has_test_method(obj: type) -> bool:
+    # Use isfunction instead of ismethod because the functions defined on the class only become
+    # "methods" when you access them on an instance of the class and they get bound to that
+    # instance.
+    for _, method in inspect.getmembers(obj, predicate=inspect.isfunction):
+        if _is_test_method(method):
+            return True
+    return False
+
+
+def _reference(path: str, module_name: str, test: Union[TestFunction, type]) -> TestReference:
+    line = _definition_line(test)
+    if not inspect.isclass(test):
+        return TestReference(path, module_name, test.__name__, line)
+    methods = tuple(
+        (name, _definition_line(getattr(test, name)))
+        for name in _get_sorted_test_method_names(test)
+    )
+    return TestReference(path, module_name, test.__name__, line, methods=methods)
+
+
+# TODO: the usage of this is not obvious, should name it better
+def _defined_in_module(name: str) -> Callable[[Callable], bool]:
+    return lambda f: f.__module__ == name
@@ -0,0 +1,188 @@
+import os
+import sys
+import tempfile
+import unittest
+
+from .cache import DiscoveryCache
+from .discovery import discover_tests, discover_tests_in_paths
+from .paths import InvalidPathError
+
+
+class TestDiscoverTests(unittest.TestCase):
+    longMessage = False
+
+    def test_returns_one_valid_test_function_from_file(self):
+        from test_data.discovery.one_valid_test import test_one
+
+        path = "test_data/discovery/one_valid_test.py"
+        actual = discover_tests(path)
+
+        expected = [test_one]
+        self.assertEqual(
+            expected,
+            actual,
+            f"expected {expected} to be discovered from {path}, got {actual}",
+        )
+
+    def test_returns_multiple_valid_tests_from_file(self):
+        from test_data.discovery.two_valid_tests import test_one, test_two
+
+        path = "test_data/discovery/two_valid_tests.py"
+        actual = discover_tests(path)
+
+        expected = [test_one, test_two]
+        self.assertEqual(
+            expected,
+            actual,
+            f"expected {expected} to be discovered from {path}, got {actual}",
+        )
+
+    def test_returns_one_valid_test_class_from_file(self):
+        from test_data.discovery.one_valid_class import TestOne
+
+        path = "test_data/discovery/one_valid_class.py"
+        actual = discover_tests(path)
+
+        expected = [TestOne]
+        self.assertEqual(
+            expected,
+            actual,
+            f"expected {expected} to be discovered from {path}, got {actual}",
+        )
+
+    def test_returns_multiple_valid_test_classes_from_file(self):
+        from test_data.discovery.two_valid_classes import TestOne, TestTwo
+
+        path = "test_data/discovery/two_valid_classes.py"
+        actual = discover_tests(path)
+
+        expected = [TestOne, TestTwo]
+        self.assertEqual(
+            expected,
+            actual,
+            f"expected {expected} to be discovered from {path}, got {actual}",
+        )
+
+    def test_returns_test_functions_and_test_classes_from_file(self):
+        from test_data.discovery.functions_and_classes import test_one, test_two, TestOne, TestTwo
+
+        path = "test_data/discovery/functions_and_classes.py"
+        actual = discover_tests(path)
+
+        expected = [test_one, test_two, TestOne, TestTwo]
+        self.assertEqual(
+            expected,
+            actual,
+            f"expected {expected} to be discovered from {path}, got {actual}",
+        )
+
+    def test_returns_async_test_functions_and_test_classes_with_async_methods_from_file(self):
+        from test_data.discovery.async_tests import test_one, TestOne
+
+        path = "test_data/discovery/async_tests.py"
+        actual = discover_tests(path)
+
+        expected = [test_one, TestOne]
+        self.assertEqual(
+            expected,
+            actual,
+            f"expected {expected} to be discovered from {path}, got {actual}",
+        )
+
+    def test_returns_tests_in_definition_order(self):
+        from test_data.discovery.unsorted_tests import test_a, test_b, TestA, TestB
+
+        path = "test_data/discovery/unsorted_tests.py"
+        actual = discover_tests(path)
+
+        expected = [test_b, TestB, test_a, TestA]
+        self.assertEqual(
+            expected,
+            actual,
+            f"expected {expected} to be discovered from {path}, got {actual}",
+        )
+
+    def test_tests_defined_imported_from_other_modules_are_ignored(self):
+        from test_data.discovery.imports_test_function import (
+            test_defined_in_this_module,
+            TestDefinedInThisModule,
+        )
+
+        path = "test_data/discovery/imports_test_function.py"
+        actual = discover_tests(path)
+
+        expected = [test_defined_in_this_module, TestDefinedInThisModule]
+        self.assertEqual(
+            expected,
+            actual,
+            f"expected {expected} to be discovered from {path}, got {actual}",
+        )
+
+
+class TestDiscoverTestsInPaths(unittest.TestCase):
+    longMessage = False
+
+    def test_returns_tests_from_each_path_in_order(self):
+        from test_data.discovery.two_valid_tests import test_one, test_two
+        from test_data.discovery.one_valid_class import TestOne
+
+        paths = ["test_data/discovery/two_valid_tests.py", "test_data/discovery/one_valid_class.py"]
+        actual = list(discover_tests_in_paths(paths))
+
+        expected = [test_one, test_two, TestOne]
+        self.assertEqual(
+            expected,
+            actual,
+            f"expected {expected} to be discovered from {paths}, got {actual}",
+        )
+
+    def test_returns_tests_from_test_files_matching_glob_pattern(self):
+        from test_data.e2e.exceptions_test import test_exceptions_error_the_test
+        from test_data.e2e.failures_test import test_multiple_failures, test_require_failure
+
+        paths = ["test_data/e2e/[ef]*"]
+        actual = list(discover_tests_in_paths(paths))
+
+        expected = [test_exceptions_error_the_test, test_multiple_failures, test_require_failure]
+        self.assertEqual(
+            expected,
+            actual,
+            f"expected {expected} to be discovered from {paths}, got {actual}",
+        )
+
+    def test_raises_error_for_invalid_path_before_tests_are_taken(self):
+        paths = ["test_data/discovery/one_valid_test.py", "test_data/does_not_exist.py"]
+
+        with self.assertRaises(InvalidPathError):
+            discover_tests_in_paths(paths)
+
+    def test_absolute_paths_are_imported_relative_to_current_directory(self):
+        from test_data.discovery.one_valid_test import test_one
+
+        paths = [os.path.abspath("test_data/discovery/one_valid_test.py")]
+        actual = list(discover_tests_in_paths(paths))
+
+        expected = [test_one]
+        self.assertEqual(
+            expected,
+            actual,
+            f"expected {expected} to be discovered from {paths}, got {actual}",
+        )
+
+    def test_test_modules_are_imported_on_the_main_thread(self):
+        module_name = "test_data.discovery.installs_signal_handler"
+        paths = ["test_data/discovery/installs_signal_handler.py"]
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        for cache in [None, DiscoveryCache(temp_dir.name, "discovered")]:
+            with self.subTest(cache=cache):
+                sys.modules.pop(module_name, None)
+
+                actual = [test.__name__ for test in discover_tests_in_paths(paths, cache=cache)]
+
+                expected = ["test_one"]
+                self.assertEqual(
+                    expected,
+                    actual,
+                    f"expected {expected} to be discovered from {paths}, got {actual}",
+                )
@@ -0,0 +1,227 @@
+import ast
+import os
+from typing import Any, Iterable, Iterator, Optional
+
+from ..cache import read_cache, write_cache
+from .cache import _hash_file
+from .paths import _module_name
+
+# testipy itself is imported by every test module but it's the runner rather than part of the
+# project under test, so changes to it shouldn't count as changes to every test
+_RUNNER_PACKAGE = __name__.split(".")[0]
+
+
+class ImportGraphCache:
+    """
+    On-disk index of the names that each module of the project imports, so that modules which
+    haven't changed since they were last looked at don't need to be parsed again to build the
+    project's import graph.
+
+    Entries are keyed by the module's path relative to the current directory and validated like
+    DiscoveryCache's, against the file's modification time and size and then its content hash.
+    Only the imported names are cached: which project files they resolve to is worked out afresh
+    each time, since modules can be added or removed without the importing module changing.
+    """
+
+    _NAME = "imports.json"
+
+    def __init__(self, cache_dir: str):
+        self._cache_dir = cache_dir
+        self._entries: dict[str, Any] = read_cache(cache_dir, self._NAME) or {}
+        self._dirty = False
+
+    def get(self, path: str) -> Optional[list[str]]:
+        """Return the names imported by the module at the given path if it hasn't changed since."""
+        entry = self._entries.get(os.path.relpath(path))
+        if entry is None:
+            return None
+        stat = os.stat(path)
+        if entry["mtime_ns"] != stat.st_mtime_ns or entry["size"] != stat.st_size:
+            if entry["size"] != stat.st_size or entry["sha256"] != _hash_file(path):
+                return None
+            entry["mtime_ns"] = stat.st_mtime_ns
+            self._dirty = True
+        return entry["imports"]
+
+    def set(self, path: str, imported_names: list[str]):
+        """Index the names imported by the module at the given path."""
+        stat = os.stat(path)
+        self._entries[os.path.relpath(path)] = {
+            "mtime_ns": stat.st_mtime_ns,
+            "size": stat.st_size,
+            "sha256": _hash_file(path),
+            "imports": imported_names,
+        }
+        self._dirty = True
+
+    def save(self):
+        """Write the index to disk if it's changed, dropping entries for files which are gone."""
+        if not self._dirty:
+            return
+        entries = {path: entry for path, entry in self._entries.items() if os.path.exists(path)}
+        write_cache(self._cache_dir, self._NAME, entries)
+        self._dirty = False
+
+
+def project_dependencies(path: str, *, cache: Optional[ImportGraphCache] = None) -> set[str]:
+    """
+    Return the absolute paths of the modules of the project which the module at the given path
+    imports, directly or through other project modules, including the module itself.
+
+    The imports are found by parsing the modules rather than importing them. Modules of the project
+    are those which can be imported relative to the current directory, as test modules are. If a
+    cache is given, the modules' imports are looked up in it before parsing them.
+    """
+    return set(_import_graph([path], cache))
+
+
+def affected_test_files(
+    test_files: Iterable[str],
+    changed_files: Iterable[str],
+    *,
+    cache: Optional[ImportGraphCache] = None,
+) -> list[str]:
+    """
+    Return the test files which have changed or which import a project module that has changed,
+    directly or through other project modules, keeping their order.
+
+    The import graph of the test files is built once, then walked backwards from the changed files
+    to the modules which import them. Imports of modules which can't be found are kept in the graph
+    so that deleting or renaming a module affects the test files which imported it.
+    """
+    test_files = list(test_files)
+    importers: dict[str, list[str]] = {}
+    graph = _import_graph(test_files, cache, include_missing=True)
+    for module_path, imported_files in graph.items():
+        for imported_file in imported_files:
+            importers.setdefault(imported_file, []).append(module_path)
+    affected: set[str] = set()
+    unvisited = [os.path.abspath(path) for path in changed_files]
+    while unvisited:
+        module_path = unvisited.pop()
+        if module_path in affected:
+            continue
+        affected.add(module_path)
+        unvisited.extend(importers.get(module_path, []))
+    return [test_file for test_file in test_files if os.path.abspath(test_file) in affected]
+
+
+def _import_graph(
+    paths: Iterable[str],
+    cache: Optional[ImportGraphCache] = None,
+    *,
+    include_missing: bool = False,
+) -> dict[str, list[str]]:
+    """
+    Return the project files imported by each project module which the modules at the given paths
+    import, directly or through other project modules, including the modules themselves, by their
+    absolute paths.
+
+    If include_missing is set, imports of modules which can't be found are included as the files
+    that the module could have been, since it might have been a project module which was removed.
+    """
+    graph: dict[str, list[str]] = {}
+    # module name -> its project file, if it's a project module, whichever module imports it
+    resolved: dict[str, Optional[str]] = {}
+    unvisited = [os.path.abspath(path) for path in paths]
+    while unvisited:
+        module_path = unvisited.pop()
+        if module_path in graph:
+            continue
+        graph[module_path] = _imported_project_files(module_path, cache, resolved, include_missing)
+        unvisited.extend(graph[module_path])
+    return graph
+
+
+def _imported_project_files(
+    path: str,
+    cache: Optional[ImportGraphCache],
+    resolved: dict[str, Optional[str]],
+    include_missing: bool,
+) -> list[str]:
+    imported_names = cache.get(path) if cache and os.path.isfile(path) else None
+    if imported_names is None:
+        imported_names = _parse_imported_names(path)
+        if cache and imported_names is not None:
+            cache.set(path, imported_names)
+    imported_files = []
+    for imported_name in imported_names or []:
+        if imported_name.split(".")[0] == _RUNNER_PACKAGE:
+            continue
+        imported_files.extend(_project_files(imported_name, resolved, include_missing))
+    return imported_files
+
+
+def _parse_imported_names(path: str) -> Optional[list[str]]:
+    try:
+        with open(path, "rb") as f:
+            tree = ast.parse(f.read(), filename=path)
+    except (OSError, SyntaxError, ValueError):
+        # if the module can't be read or parsed then it can't import anything either
+        return None
+    module_name = _module_name(path)
+    is_package = module_name.endswith(".__init__")
+    module_name = module_name.removesuffix(".__init__")
+    return list(dict.fromkeys(_imported_names(tree, module_name, is_package)))
+
+
+def _imported_names(tree: ast.Module, module_name: str, is_package: bool) -> Iterator[str]:
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            yield from (alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            base = _resolve_import_from(node, module_name, is_package)
+            if base is None:
+                continue
+            yield base
+            # the imported names might be submodules
+            yield from (f"{base}.{alias.name}" for alias in node.names if alias.name != "*")
+
+
+def _resolve_import_from(node: ast.ImportFrom, module_name: str, is_package: bool) -> Optional[str]:
+    if not node.level:
+        return node.module
+    package_parts = module_name.split(".") if is_package else module_name.split(".")[:-1]
+    if node.level - 1 > len(package_parts):
+        return None
+    package_parts = package_parts[: len(package_parts) - (node.level - 1)]
+    if node.module:
+        package_parts.append(node.module)
+    return ".".join(package_parts) or None
+
+
+def _project_files(
+    module_name: str, resolved: dict[str, Optional[str]], include_missing: bool
+) -> Iterator[str]:
+    """
+    Yield the file of a project module and of each of the packages that it's in, since importing
+    the module runs those too. The file of each module is looked up in resolved first, and added to
+    it once it's been found. If include_missing is set, the files that a module which can't be
+    found could have been are yielded in its place.
+    """
+    parts = module_name.split(".")
+    for i in range(1, len(parts) + 1):
+        name = ".".join(parts[:i])
+        if name not in resolved:
+            resolved[name] = _project_file(name)
+        path = resolved[name]
+        if path is not None:
+            yield path
+        elif include_missing:
+            yield from _module_files(name)
+
+
+def _project_file(module_name: str) -> Optional[str]:
+    for candidate in _module_files(module_name):
+        if os.path.isfile(candidate):
+            return candidate
+    return None
+
+
+def _module_files(module_name: str) -> tuple[str, str]:
+    """Return the absolute paths that a module of the project with the given name could be at."""
+    relative_path = os.path.join(*module_name.split("."))
+    return (
+        os.path.abspath(relative_path + ".py"),
+        os.path.abspath(os.path.join(relative_path, "__init__.py")),
+    )
@@ -0,0 +1,134 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from . import imports
+from .imports import affected_test_files, ImportGraphCache, project_dependencies
+
+
+class TestProjectDependencies(unittest.TestCase):
+    longMessage = False
+
+    def test_returns_project_modules_imported_directly_and_indirectly(self):
+        path = "test_data/imports/imports_helpers_test.py"
+
+        actual = project_dependencies(path)
+
+        expected = {
+            os.path.abspath(p)
+            for p in [
+                "test_data/imports/imports_helpers_test.py",
+                "test_data/imports/helper.py",
+                "test_data/imports/package/__init__.py",
+                "test_data/imports/package/module.py",
+                "test_data/imports/package/submodule.py",
+            ]
+        }
+        self.assertEqual(
+            expected,
+            actual,
+            f"expected dependencies of {path} to be {expected}, got {actual}",
+        )
+
+    def test_modules_outside_of_project_are_ignored(self):
+        path = "test_data/imports/standalone.py"
+
+        actual = project_dependencies(path)
+
+        expected = {os.path.abspath(path)}
+        self.assertEqual(
+            expected,
+            actual,
+            f"expected dependencies of {path} to be just itself, got {actual}",
+        )
+
+
+class TestAffectedTestFiles(unittest.TestCase):
+    longMessage = False
+
+    def test_test_files_which_import_changed_module_indirectly_are_affected(self):
+        test_files = [
+            "test_data/imports/imports_helpers_test.py",
+            "test_data/imports/standalone.py",
+        ]
+
+        actual = affected_test_files(test_files, ["test_data/imports/package/submodule.py"])
+
+        expected = ["test_data/imports/imports_helpers_test.py"]
+        self.assertEqual(expected, actual, f"expected affected test files {expected}, got {actual}")
+
+    def test_changed_test_files_are_affected(self):
+        test_files = [
+            "test_data/imports/imports_helpers_test.py",
+            "test_data/imports/standalone.py",
+        ]
+
+        actual = affected_test_files(test_files, ["test_data/imports/standalone.py"])
+
+        expected = ["test_data/imports/standalone.py"]
+        self.assertEqual(expected, actual, f"expected affected test files {expected}, got {actual}")
+
+    def test_test_files_which_imported_removed_module_are_affected(self):
+        test_files = [
+            "test_data/imports/imports_removed_helper.py",
+            "test_data/imports/standalone.py",
+        ]
+
+        actual = affected_test_files(test_files, ["test_data/imports/removed_helper.py"])
+
+        expected = ["test_data/imports/imports_removed_helper.py"]
+        self.assertEqual(expected, actual, f"expected affected test files {expected}, got {actual}")
+
+    def test_each_module_is_parsed_once(self):
+        test_files = [
+            "test_data/imports/imports_helpers_test.py",
+            "test_data/imports/standalone.py",
+            "test_data/imports/package/module.py",
+        ]
+
+        with mock.patch.object(
+            imports, "_parse_imported_names", wraps=imports._parse_imported_names
+        ) as parse:
+            affected_test_files(test_files, ["test_data/imports/package/submodule.py"])
+
+        parsed = [os.path.relpath(call.args[0]) for call in parse.call_args_list]
+        actual = sorted(path for path in set(parsed) if parsed.count(path) > 1)
+        self.assertEqual([], actual, f"expected each module to be parsed once, got {actual} again")
+
+
+class TestImportGraphCache(unittest.TestCase):
+    longMessage = False
+
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.cache_dir = os.path.join(temp_dir.name, ".testipy_cache")
+        # the cached module has to be under the current directory to be part of the project
+        self.module_dir = tempfile.mkdtemp(dir="test_data/imports")
+        self.addCleanup(shutil.rmtree, self.module_dir)
+        self.path = os.path.join(self.module_dir, "cached.py")
+        with open(self.path, "w") as f:
+            f.write("import test_data.imports.helper\n")
+
+    def test_imports_are_read_back_after_saving(self):
+        cache = ImportGraphCache(self.cache_dir)
+        project_dependencies(self.path, cache=cache)
+        cache.save()
+
+        actual = ImportGraphCache(self.cache_dir).get(self.path)
+
+        expected = ["test_data.imports.helper"]
+        self.assertEqual(expected, actual, f"expected cached imports {expected}, got {actual}")
+
+    def test_imports_are_not_returned_once_module_changes(self):
+        cache = ImportGraphCache(self.cache_dir)
+        project_dependencies(self.path, cache=cache)
+        cache.save()
+        with open(self.path, "w") as f:
+            f.write("import test_data.imports.standalone\n")
+
+        actual = ImportGraphCache(self.cache_dir).get(self.path)
+
+        self.assertIsNone(actual, f"expected no cached imports after change, got {actual}")
@@ -0,0 +1,71 @@
+import glob
+import os
+from typing import Iterable, Iterator
+
+
+class InvalidPathError(Exception):
+    """Raised when a path to find tests in doesn't exist."""
+
+    pass
+
+
+def find_test_files(paths: Iterable[str]) -> list[str]:
+    """
+    Return the test files found at the given paths, in the order that the paths were given.
+
+    Each path can be:
+        File
+            Returned as is.
+        Directory
+            Walked recursively to find files ending in '_test.py', in sorted order. Hidden
+            directories and __pycache__ directories are skipped.
+        Glob Pattern
+            Expanded in sorted order, with '**' matching any number of directories. Matching files
+            are returned as is and matching directories are walked.
+
+    Files which are found through more than one path are only returned once. InvalidPathError is
+    raised if a path which isn't a glob pattern doesn't exist.
+    """
+    test_files: dict[str, None] = {}
+    for path in paths:
+        for test_file in _find_test_files(path):
+            test_files.setdefault(os.path.normpath(test_file), None)
+    return list(test_files)
+
+
+def _find_test_files(path: str) -> Iterator[str]:
+    if glob.has_magic(path):
+        for match in sorted(glob.glob(path, recursive=True)):
+            yield from _find_test_files_in_match(match)
+    elif os.path.exists(path):
+        yield from _find_test_files_in_match(path)
+    else:
+        raise InvalidPathError(f"no such file or directory: '{path}'")
+
+
+def _find_test_files_in_match(path: str) -> Iterator[str]:
+    if os.path.isdir(path):
+        yield from _walk_test_files(path)
+    elif path.endswith(".py"):
+        yield path
+
+
+def _walk_test_files(directory: str) -> Iterator[str]:
+    for root, dir_names, file_names in os.walk(directory):
+        # os.walk visits the directories left in dir_names, so prune and sort them in place
+        dir_names[:] = sorted(name for name in dir_names if not _is_ignored_directory(name))
+        for file_name in sorted(file_names):
+            if file_name.endswith("_test.py"):
+                yield os.path.join(root, file_name)
+
+
+def _is_ignored_directory(name: str) -> bool:
+    return name.startswith(".") or name == "__pycache__"
+
+
+def _module_name(path: str) -> str:
+    # test modules are imported relative to the current directory, so absolute paths need making
+    # relative first
+    if os.path.isabs(path):
+        path = os.path.relpath(path)
+    return os.path.normpath(path).removesuffix(".py").replace(os.sep, ".")
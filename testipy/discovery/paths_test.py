@@ -0,0 +1,89 @@
+import unittest
+
+from .paths import find_test_files, InvalidPathError
+
+
+class TestFindTestFiles(unittest.TestCase):
+    longMessage = False
+
+    def test_returns_file_paths_as_is(self):
+        paths = ["test_data/discovery/one_valid_test.py"]
+
+        actual = find_test_files(paths)
+
+        expected = ["test_data/discovery/one_valid_test.py"]
+        self.assertEqual(
+            expected,
+            actual,
+            f"expected {expected} to be found from {paths}, got {actual}",
+        )
+
+    def test_returns_test_files_in_directory_in_sorted_order(self):
+        paths = ["test_data/e2e"]
+
+        actual = find_test_files(paths)
+
+        expected = [
+            "test_data/e2e/assertions_test.py",
+            "test_data/e2e/classes_test.py",
+            "test_data/e2e/exceptions_test.py",
+            "test_data/e2e/failures_test.py",
+            "test_data/e2e/passing_test.py",
+        ]
+        self.assertEqual(
+            expected,
+            actual,
+            f"expected {expected} to be found from {paths}, got {actual}",
+        )
+
+    def test_walks_directories_recursively(self):
+        paths = ["test_data"]
+
+        actual = find_test_files(paths)
+
+        self.assertIn(
+            "test_data/e2e/passing_test.py",
+            actual,
+            f"expected test_data/e2e/passing_test.py to be found from {paths}, got {actual}",
+        )
+        self.assertNotIn(
+            "test_data/e2e/numbers.py",
+            actual,
+            f"expected test_data/e2e/numbers.py to not be found from {paths}, got {actual}",
+        )
+
+    def test_expands_glob_patterns(self):
+        paths = ["test_data/e2e/[ef]*.py"]
+
+        actual = find_test_files(paths)
+
+        expected = ["test_data/e2e/exceptions_test.py", "test_data/e2e/failures_test.py"]
+        self.assertEqual(
+            expected,
+            actual,
+            f"expected {expected} to be found from {paths}, got {actual}",
+        )
+
+    def test_returns_files_found_through_multiple_paths_once(self):
+        paths = ["test_data/e2e/passing_test.py", "test_data/e2e/pass*", "./test_data/e2e"]
+
+        actual = find_test_files(paths)
+
+        expected = [
+            "test_data/e2e/passing_test.py",
+            "test_data/e2e/assertions_test.py",
+            "test_data/e2e/classes_test.py",
+            "test_data/e2e/exceptions_test.py",
+            "test_data/e2e/failures_test.py",
+        ]
+        self.assertEqual(
+            expected,
+            actual,
+            f"expected {expected} to be found from {paths}, got {actual}",
+        )
+
+    def test_raises_error_when_path_does_not_exist(self):
+        paths = ["test_data/does_not_exist.py"]
+
+        with self.assertRaises(InvalidPathError):
+            find_test_files(paths)
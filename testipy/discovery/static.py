@@ -0,0 +1,188 @@
+import ast
+import concurrent.futures
+import functools
+from typing import Iterable, Iterator, Optional, Union
+
+from ..running import TestReference
+from .cache import DiscoveryCache
+from .discovery import discover_tests, _reference
+from .paths import find_test_files, _module_name
+
+
+FunctionDef = Union[ast.FunctionDef, ast.AsyncFunctionDef]
+
+
+def collect_tests(path: str, *, cache: Optional[DiscoveryCache] = None) -> list[TestReference]:
+    """
+    Return references to the test functions and test classes defined in the module at the given
+    path, sorted by order of definition, without importing it if it can be helped.
+
+    The module's source is parsed instead, so only tests which are defined at the top level of the
+    module are found and a TestContext parameter is recognised by its annotation being named
+    TestContext (e.g. t: TestContext or t: testipy.TestContext). Test methods inherited from
+    classes defined elsewhere aren't found either. See discover_tests for the definitions of test
+    functions, test classes and test methods.
+
+    Modules which assign to names that tests could have, like test_foo = make_test(), or which
+    define tests inside other statements can't be parsed for their tests, so they're imported and
+    their tests are found as discover_tests finds them.
+
+    If a cache is given, the tests are looked up in it first and stored in it if they weren't there.
+    """
+    tests = _cached_or_parsed_tests(path, cache)
+    if tests is None:
+        tests = _imported_tests(path, cache)
+    return tests
+
+
+def collect_tests_in_paths(
+    paths: Iterable[str],
+    *,
+    max_workers: Optional[int] = None,
+    cache: Optional[DiscoveryCache] = None,
+) -> Iterator[TestReference]:
+    """
+    Yield references to the test functions and test classes found in the test files at the given
+    paths (see find_test_files), as collect_tests finds them. The files are read and parsed in
+    parallel by a pool of max_workers threads, using the given cache as collect_tests does, and any
+    which need importing are imported on the current thread as discover_tests_in_paths does.
+
+    Like discover_tests_in_paths, each test file's tests are yielded as soon as it's been parsed
+    and the paths are expanded straight away.
+    """
+    test_files = find_test_files(paths)
+    return _collect_tests_in_files(test_files, max_workers, cache)
+
+
+def _collect_tests_in_files(
+    test_files: list[str], max_workers: Optional[int], cache: Optional[DiscoveryCache]
+) -> Iterator[TestReference]:
+    with concurrent.futures.ThreadPoolExecutor(max_workers) as executor:
+        parsed_tests = executor.map(
+            functools.partial(_cached_or_parsed_tests, cache=cache), test_files
+        )
+        for test_file, tests in zip(test_files, parsed_tests):
+            if tests is None:
+                tests = _imported_tests(test_file, cache)
+            yield from tests
+
+
+def _cached_or_parsed_tests(
+    path: str, cache: Optional[DiscoveryCache]
+) -> Optional[list[TestReference]]:
+    """
+    Return the tests in the module at the given path from the cache or by parsing it, or None if
+    it needs to be imported to find them.
+    """
+    if cache:
+        cached_tests = cache.get(path)
+        if cached_tests is not None:
+            return cached_tests
+    with open(path, "rb") as f:
+        source = f.read()
+    module = ast.parse(source, filename=path)
+    if _binds_tests_dynamically(module):
+        return None
+    module_name = _module_name(path)
+    tests = []
+    for node in module.body:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)) and _is_test_function(node):
+            tests.append(TestReference(path, module_name, node.name, _definition_line(node)))
+        elif isinstance(node, ast.ClassDef) and node.name.startswith("Test"):
+            methods = _test_methods(node)
+            if methods:
+                tests.append(
+                    TestReference(
+                        path, module_name, node.name, _definition_line(node), methods=methods
+                    )
+                )
+    if cache:
+        cache.set(path, tests)
+    return tests
+
+
+def _imported_tests(path: str, cache: Optional[DiscoveryCache]) -> list[TestReference]:
+    module_name = _module_name(path)
+    tests = [_reference(path, module_name, test) for test in discover_tests(path)]
+    if cache:
+        cache.set(path, tests)
+    return tests
+
+
+def _binds_tests_dynamically(module: ast.Module) -> bool:
+    """
+    Return whether a module binds names that tests or test methods could have other than with
+    function and class definitions at the top level of the module and of its test classes.
+    """
+    for node in module.body:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            continue
+        if isinstance(node, ast.ClassDef):
+            if node.name.startswith("Test") and any(
+                _binds_test_name(child, "test_")
+                for child in node.body
+                if not isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef))
+            ):
+                return True
+            continue
+        if _binds_test_name(node, "test_", "Test"):
+            return True
+    return False
+
+
+def _binds_test_name(statement: ast.stmt, *prefixes: str) -> bool:
+    for node in ast.walk(statement):
+        if isinstance(node, ast.Name) and isinstance(node.ctx, ast.Store):
+            name = node.id
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            name = node.name
+        else:
+            continue
+        if name.startswith(prefixes):
+            return True
+    return False
+
+
+def _is_test_function(node: FunctionDef) -> bool:
+    return node.name.startswith("test_") and _has_test_context_parameters(node, count=1)
+
+
+def _test_methods(node: ast.ClassDef) -> tuple[tuple[str, int], ...]:
+    return tuple(
+        (child.name, _definition_line(child))
+        for child in node.body
+        if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef)) and _is_test_method(child)
+    )
+
+
+def _is_test_method(node: FunctionDef) -> bool:
+    # should have self and TestContext parameters
+    return node.name.startswith("test_") and _has_test_context_parameters(node, count=2)
+
+
+def _has_test_context_parameters(node: FunctionDef, count: int) -> bool:
+    args = node.args
+    parameters = [*args.posonlyargs, *args.args]
+    if args.vararg:
+        parameters.append(args.vararg)
+    parameters.extend(args.kwonlyargs)
+    if args.kwarg:
+        parameters.append(args.kwarg)
+    if len(parameters) != count:
+        return False
+    return _is_test_context_annotation(parameters[-1].annotation)
+
+
+def _is_test_context_annotation(annotation: Optional[ast.expr]) -> bool:
+    if isinstance(annotation, ast.Name):
+        return annotation.id == "TestContext"
+    if isinstance(annotation, ast.Attribute):
+        return annotation.attr == "TestContext"
+    if isinstance(annotation, ast.Constant):
+        return annotation.value == "TestContext"
+    return False
+
+
+def _definition_line(node: Union[FunctionDef, ast.ClassDef]) -> int:
+    # the code object of a decorated function starts at its first decorator
+    return min([node.lineno, *(decorator.lineno for decorator in node.decorator_list)])
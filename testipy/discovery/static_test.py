@@ -0,0 +1,147 @@
+import sys
+import unittest
+
+from ..running import TestReference
+from .static import collect_tests, collect_tests_in_paths
+
+
+class TestCollectTests(unittest.TestCase):
+    longMessage = False
+
+    def test_returns_one_valid_test_function_from_file(self):
+        path = "test_data/discovery/one_valid_test.py"
+        actual = collect_tests(path)
+
+        expected = [TestReference(path, "test_data.discovery.one_valid_test", "test_one", 8)]
+        self.assertEqual(
+            expected,
+            actual,
+            f"expected {expected} to be collected from {path}, got {actual}",
+        )
+
+    def test_returns_one_valid_test_class_from_file(self):
+        path = "test_data/discovery/one_valid_class.py"
+        actual = collect_tests(path)
+
+        expected = [
+            TestReference(
+                path,
+                "test_data.discovery.one_valid_class",
+                "TestOne",
+                14,
+                methods=(("test_one", 15),),
+            )
+        ]
+        self.assertEqual(
+            expected,
+            actual,
+            f"expected {expected} to be collected from {path}, got {actual}",
+        )
+
+    def test_returns_test_functions_and_test_classes_in_definition_order(self):
+        path = "test_data/discovery/unsorted_tests.py"
+        actual = collect_tests(path)
+
+        expected = [
+            ("test_b", ()),
+            ("TestB", (("test_b", 9),)),
+            ("test_a", ()),
+            ("TestA", (("test_a", 18),)),
+        ]
+        actual_names = [(test.name, test.methods) for test in actual]
+        self.assertEqual(
+            expected,
+            actual_names,
+            f"expected {expected} to be collected from {path}, got {actual_names}",
+        )
+
+    def test_tests_imported_from_other_modules_are_ignored(self):
+        path = "test_data/discovery/imports_test_function.py"
+        actual = collect_tests(path)
+
+        expected = ["test_defined_in_this_module", "TestDefinedInThisModule"]
+        actual_names = [test.name for test in actual]
+        self.assertEqual(
+            expected,
+            actual_names,
+            f"expected {expected} to be collected from {path}, got {actual_names}",
+        )
+
+    def test_collects_same_tests_as_discover_tests(self):
+        from .discovery import discover_tests
+
+        path = "test_data/discovery/functions_and_classes.py"
+        actual = collect_tests(path)
+
+        expected = discover_tests(path)
+        loaded = [test.load() for test in actual]
+        self.assertEqual(
+            expected,
+            loaded,
+            f"expected collected tests to load as {expected}, got {loaded}",
+        )
+
+    def test_collects_async_tests_like_discover_tests(self):
+        from .discovery import discover_tests
+
+        path = "test_data/discovery/async_tests.py"
+        actual = collect_tests(path)
+
+        expected = discover_tests(path)
+        loaded = [test.load() for test in actual]
+        self.assertEqual(
+            expected,
+            loaded,
+            f"expected collected async tests to load as {expected}, got {loaded}",
+        )
+
+    def test_test_context_annotations_postponed_by_future_import_are_recognised(self):
+        path = "test_data/discovery/future_annotations.py"
+        actual = collect_tests(path)
+
+        expected = [("test_one", ()), ("TestFuture", (("test_method", 11),))]
+        actual_names = [(test.name, test.methods) for test in actual]
+        self.assertEqual(
+            expected,
+            actual_names,
+            f"expected {expected} to be collected from {path}, got {actual_names}",
+        )
+
+    def test_tests_made_by_assignment_are_found_by_importing_module(self):
+        path = "test_data/discovery/assigned_tests.py"
+        actual = collect_tests(path)
+
+        expected = [TestReference(path, "test_data.discovery.assigned_tests", "test_generated", 5)]
+        self.assertEqual(
+            expected,
+            actual,
+            f"expected {expected} to be collected from {path}, got {actual}",
+        )
+
+    def test_does_not_import_module(self):
+        module_name = "test_data.discovery.two_valid_classes"
+        sys.modules.pop(module_name, None)
+
+        collect_tests("test_data/discovery/two_valid_classes.py")
+
+        self.assertNotIn(
+            module_name,
+            sys.modules,
+            f"expected {module_name} to not be imported by collecting its tests",
+        )
+
+
+class TestCollectTestsInPaths(unittest.TestCase):
+    longMessage = False
+
+    def test_returns_tests_from_each_path_in_order(self):
+        paths = ["test_data/discovery/two_valid_tests.py", "test_data/discovery/one_valid_class.py"]
+        actual = list(collect_tests_in_paths(paths))
+
+        expected = ["test_one", "test_two", "TestOne"]
+        actual_names = [test.name for test in actual]
+        self.assertEqual(
+            expected,
+            actual_names,
+            f"expected {expected} to be collected from {paths}, got {actual_names}",
+        )
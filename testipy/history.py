@@ -0,0 +1,49 @@
+from typing import Mapping, Optional
+
+from .cache import read_cache, write_cache
+from .running import NotRunResult, TestMethods, TestUnit
+from .running.results import TestResult
+from .running.units import _test_unit_id
+
+
+class DurationHistory:
+    """
+    On-disk record of how long each test function and test class has taken to run, in seconds, so
+    that runs spread over workers can start the longest tests first.
+
+    Each test's duration is a moving average which gives its latest run as much weight as all of
+    its earlier runs together, so that it follows tests which get faster or slower while smoothing
+    over one-off slow runs.
+    """
+
+    _NAME = "durations.json"
+
+    def __init__(self, cache_dir: str):
+        self._cache_dir = cache_dir
+        self._durations: dict[str, float] = read_cache(cache_dir, self._NAME) or {}
+
+    @property
+    def durations(self) -> Mapping[str, float]:
+        """The duration of each test by test unit ID, as stream_tests takes them."""
+        return self._durations
+
+    def record(self, test: TestUnit, result: TestResult):
+        """Record how long running a test unit took."""
+        # running some of a class's test methods doesn't take as long as running the class
+        if isinstance(result, NotRunResult) or isinstance(test, TestMethods):
+            return
+        if result.duration is None:
+            return
+        test_id = _test_unit_id(test)
+        seconds = result.duration.wall_ns / 1e9
+        self._durations[test_id] = _moving_average(self._durations.get(test_id), seconds)
+
+    def save(self):
+        write_cache(self._cache_dir, self._NAME, self._durations)
+
+
+def _moving_average(previous_seconds: Optional[float], seconds: float) -> float:
+    """Return a test's new duration, giving its latest run as much weight as its earlier ones."""
+    if previous_seconds is None:
+        return seconds
+    return (seconds + previous_seconds) / 2
@@ -0,0 +1,56 @@
+import os
+import tempfile
+import unittest
+
+from .history import DurationHistory
+from .running import Duration, NotRunResult, PassResult, TestContext, TestMethods
+
+
+def test_passes(t: TestContext):
+    pass
+
+
+class TestClass:
+    def test_passes(self, t: TestContext):
+        pass
+
+
+class TestDurationHistory(unittest.TestCase):
+    longMessage = False
+
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.cache_dir = os.path.join(temp_dir.name, ".testipy_cache")
+
+    def test_durations_are_read_back_after_saving(self):
+        history = DurationHistory(self.cache_dir)
+        history.record(test_passes, PassResult("test_passes", duration=Duration(2_000_000_000, 0)))
+        history.save()
+
+        actual = dict(DurationHistory(self.cache_dir).durations)
+
+        expected = {f"{__name__}::test_passes": 2.0}
+        self.assertEqual(expected, actual, f"expected durations {expected}, got {actual}")
+
+    def test_duration_is_averaged_with_earlier_runs(self):
+        history = DurationHistory(self.cache_dir)
+        history.record(test_passes, PassResult("test_passes", duration=Duration(2_000_000_000, 0)))
+        history.record(test_passes, PassResult("test_passes", duration=Duration(4_000_000_000, 0)))
+
+        actual = dict(history.durations)
+
+        expected = {f"{__name__}::test_passes": 3.0}
+        self.assertEqual(expected, actual, f"expected durations {expected}, got {actual}")
+
+    def test_tests_which_were_not_run_or_only_partly_run_are_not_recorded(self):
+        history = DurationHistory(self.cache_dir)
+        history.record(test_passes, NotRunResult("test_passes", duration=Duration(1, 1)))
+        history.record(
+            TestMethods(TestClass, ("test_passes",)),
+            PassResult("TestClass", duration=Duration(1, 1)),
+        )
+
+        actual = dict(history.durations)
+
+        self.assertEqual({}, actual, f"expected no durations, got {actual}")
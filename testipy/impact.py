@@ -0,0 +1,150 @@
+import os
+import re
+import subprocess
+from typing import Iterable, Iterator, Optional
+
+from .cache import read_cache, write_cache
+from .running import TestMethods, TestUnit
+from .running.units import _is_test_class, _test_unit_id, _test_unit_path
+
+# path relative to the current directory -> lines which changed, or None if the whole file should be
+# treated as changed
+Changes = dict[str, Optional[set[int]]]
+
+_HUNK_HEADER = re.compile(r"^@@ -(\d+)(?:,(\d+))? \+\d+(?:,\d+)? @@")
+
+
+class GitError(Exception):
+    """Raised when the changes since a git ref can't be found."""
+
+    pass
+
+
+class ImpactIndex:
+    """
+    On-disk index of which lines of the project's source files each test function, test method and
+    test class ran the last time that its lines were recorded, so that a later run can run only the
+    tests which ran lines that have since changed.
+    """
+
+    _NAME = "impact.json"
+
+    def __init__(self, cache_dir: str):
+        self._cache_dir = cache_dir
+        # test ID -> path -> sorted lines
+        self._lines: dict[str, dict[str, list[int]]] = read_cache(cache_dir, self._NAME) or {}
+
+    def update(self, recorded_lines: dict[str, dict[str, set[int]]]):
+        """
+        Replace the lines indexed for each of the recorded tests, as recorded by a LineRecorder.
+        """
+        for test_id, lines in recorded_lines.items():
+            self._lines[test_id] = {path: sorted(path_lines) for path, path_lines in lines.items()}
+
+    def save(self):
+        write_cache(self._cache_dir, self._NAME, self._lines)
+
+    def impacted(self, tests: Iterable[TestUnit], changes: Changes) -> Iterator[TestUnit]:
+        """
+        Yield the tests which ran any of the changed lines when they were recorded. Tests which
+        haven't been recorded and tests whose own module has changed are yielded whole, since
+        there's no telling what they run now. Test classes which only had some of their test methods
+        run changed lines are yielded as TestMethods of just those methods.
+        """
+        for test in tests:
+            test_id = _test_unit_id(test)
+            path = _test_unit_path(test)
+            if (
+                test_id not in self._lines
+                or (path and os.path.relpath(path) in changes)
+                or self._touches(test_id, changes)
+            ):
+                yield test
+                continue
+            if not _is_test_class(test):
+                continue
+            method_names = tuple(
+                indexed_id.removeprefix(f"{test_id}::")
+                for indexed_id in self._lines
+                if indexed_id.startswith(f"{test_id}::") and self._touches(indexed_id, changes)
+            )
+            if method_names:
+                yield TestMethods(test, method_names)  # type: ignore[arg-type]
+
+    def _touches(self, test_id: str, changes: Changes) -> bool:
+        for path, lines in self._lines[test_id].items():
+            if path not in changes:
+                continue
+            changed_lines = changes[path]
+            if changed_lines is None or changed_lines.intersection(lines):
+                return True
+        return False
+
+
+def changes_since(ref: str) -> Changes:
+    """
+    Return the lines of the files in the current directory which have changed since a git ref, as
+    numbered before the change. Insertions count as changes to the lines either side of them.
+    Untracked files which git doesn't ignore count as new files.
+    """
+    root = _git("rev-parse", "--show-toplevel").strip()
+    diff = _git("diff", "--unified=0", "--no-color", "--no-renames", ref, "--")
+    untracked = _git("ls-files", "--others", "--exclude-standard", "--full-name", "-z", ":/")
+    changes: Changes = {}
+    for untracked_path in filter(None, untracked.split("\0")):
+        # untracked files can't have been run before either
+        changes[_relative_to_cwd(root, untracked_path)] = None
+    path = None
+    for line in diff.splitlines():
+        if line.startswith("--- "):
+            old_path = line[4:]
+            path = None if old_path == "/dev/null" else old_path.removeprefix("a/")
+        elif line.startswith("+++ "):
+            new_path = line[4:]
+            if path is None and new_path != "/dev/null":
+                # new files can't have been run before, but record them for tests of their own
+                changes[_relative_to_cwd(root, new_path.removeprefix("b/"))] = None
+        elif path is not None and (match := _HUNK_HEADER.match(line)):
+            start = int(match.group(1))
+            count = int(match.group(2)) if match.group(2) is not None else 1
+            lines = range(start, start + count) if count else range(start, start + 2)
+            changed_lines = changes.setdefault(_relative_to_cwd(root, path), set())
+            if changed_lines is not None:
+                changed_lines.update(lines)
+    return changes
+
+
+def parse_changes(specs: Iterable[str]) -> Changes:
+    """
+    Parse changes given as PATH or PATH:LINES, where LINES is a comma separated list of line
+    numbers and ranges like 10-20. A path without any lines counts as changed throughout.
+    """
+    changes: Changes = {}
+    for spec in specs:
+        path, _, line_specs = spec.partition(":")
+        path = os.path.relpath(path)
+        if not line_specs:
+            changes[path] = None
+            continue
+        lines: set[int] = set()
+        for line_spec in line_specs.split(","):
+            first, _, last = line_spec.partition("-")
+            lines.update(range(int(first), int(last or first) + 1))
+        path_lines = changes.setdefault(path, set())
+        if path_lines is not None:
+            path_lines.update(lines)
+    return changes
+
+
+def _git(*args: str) -> str:
+    try:
+        process = subprocess.run(["git", *args], capture_output=True, text=True, check=True)
+    except FileNotFoundError:
+        raise GitError("finding the changes since a git ref needs git to be installed")
+    except subprocess.CalledProcessError as e:
+        raise GitError(f"git {args[0]} failed: {e.stderr.strip()}")
+    return process.stdout
+
+
+def _relative_to_cwd(root: str, path: str) -> str:
+    return os.path.relpath(os.path.join(root, path))
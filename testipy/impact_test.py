@@ -0,0 +1,118 @@
+import os
+import subprocess
+import tempfile
+import unittest
+
+from .impact import changes_since, ImpactIndex, parse_changes
+from .running import TestMethods
+from test_data.monitoring import lines_test
+
+MODULE = "test_data.monitoring.lines_test"
+HELPERS = "test_data/monitoring/helpers.py"
+TESTS = "test_data/monitoring/lines_test.py"
+RECORDED_LINES = {
+    f"{MODULE}::test_add": {TESTS: {7}, HELPERS: {2}},
+    f"{MODULE}::TestHelpers": {TESTS: {13}, HELPERS: {10}},
+    f"{MODULE}::TestHelpers::test_add": {TESTS: {16}, HELPERS: {2}},
+    f"{MODULE}::TestHelpers::test_subtract": {TESTS: {19}, HELPERS: {6}},
+}
+
+
+class TestImpactIndex(unittest.TestCase):
+    longMessage = False
+
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.cache_dir = os.path.join(temp_dir.name, ".testipy_cache")
+
+    def test_tests_which_ran_changed_lines_are_impacted(self):
+        index = self.saved_index()
+        tests = [lines_test.test_add, lines_test.TestHelpers]
+
+        actual = list(index.impacted(tests, {HELPERS: {2}}))
+
+        expected = [lines_test.test_add, TestMethods(lines_test.TestHelpers, ("test_add",))]
+        self.assertEqual(expected, actual, f"expected impacted tests {expected}, got {actual}")
+
+    def test_whole_class_is_impacted_when_its_setup_ran_changed_lines(self):
+        index = self.saved_index()
+        tests = [lines_test.test_add, lines_test.TestHelpers]
+
+        actual = list(index.impacted(tests, {HELPERS: {9, 10}}))
+
+        expected = [lines_test.TestHelpers]
+        self.assertEqual(expected, actual, f"expected impacted tests {expected}, got {actual}")
+
+    def test_tests_are_impacted_when_their_own_module_changes(self):
+        index = self.saved_index()
+        tests = [lines_test.test_add, lines_test.TestHelpers]
+
+        actual = list(index.impacted(tests, {TESTS: None}))
+
+        self.assertEqual(tests, actual, f"expected impacted tests {tests}, got {actual}")
+
+    def test_tests_which_have_not_been_recorded_are_impacted(self):
+        index = ImpactIndex(self.cache_dir)
+        tests = [lines_test.test_add, lines_test.TestHelpers]
+
+        actual = list(index.impacted(tests, {}))
+
+        self.assertEqual(tests, actual, f"expected impacted tests {tests}, got {actual}")
+
+    def test_tests_which_ran_no_changed_lines_are_not_impacted(self):
+        index = self.saved_index()
+        tests = [lines_test.test_add, lines_test.TestHelpers]
+
+        actual = list(index.impacted(tests, {HELPERS: {1, 3}, "other.py": None}))
+
+        self.assertEqual([], actual, f"expected no impacted tests, got {actual}")
+
+    def saved_index(self) -> ImpactIndex:
+        index = ImpactIndex(self.cache_dir)
+        index.update(RECORDED_LINES)
+        index.save()
+        return ImpactIndex(self.cache_dir)
+
+
+class TestParseChanges(unittest.TestCase):
+    longMessage = False
+
+    def test_lines_and_ranges_are_parsed(self):
+        actual = parse_changes(["foo.py:3,10-12", "bar.py", "foo.py:20"])
+
+        expected = {"foo.py": {3, 10, 11, 12, 20}, "bar.py": None}
+        self.assertEqual(expected, actual, f"expected changes {expected}, got {actual}")
+
+
+class TestChangesSince(unittest.TestCase):
+    longMessage = False
+
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.addCleanup(os.chdir, os.getcwd())
+        os.chdir(temp_dir.name)
+        self.git("init", "-q")
+        with open("old_test.py", "w") as f:
+            f.write("def test_old(t):\n    pass\n")
+        self.git("add", "old_test.py")
+        self.git(
+            "-c", "user.name=test", "-c", "user.email=test@example.com", "commit", "-qm", "Old"
+        )
+
+    def test_untracked_files_are_new_files(self):
+        with open("new_test.py", "w") as f:
+            f.write("def test_new(t):\n    pass\n")
+        with open(".gitignore", "w") as f:
+            f.write("ignored.py\n")
+        with open("ignored.py", "w") as f:
+            f.write("")
+
+        actual = changes_since("HEAD")
+
+        expected = {".gitignore": None, "new_test.py": None}
+        self.assertEqual(expected, actual, f"expected changes {expected}, got {actual}")
+
+    def git(self, *args: str):
+        subprocess.run(["git", *args], check=True)
@@ -0,0 +1,139 @@
+from typing import Iterable, Iterator, Optional, Sequence
+
+from .cache import read_cache, write_cache
+from .running import ErrorResult, FailResult, NotRunResult, TestMethods, TestReference, TestUnit
+from .running.classes import _get_sorted_test_method_names
+from .running.results import TestResult
+from .running.units import _is_test_class, _test_unit_id, _test_unit_module
+
+
+class OutcomeCache:
+    """
+    On-disk record of whether each test passed, failed or errored the last time that it was run, so
+    that a later run can run only the tests which failed or run them first.
+
+    Tests are identified by their module and name, and test methods by their module, class and
+    name, e.g. "tests.foo_test::TestFoo::test_foo". Outcomes are recorded for each test method of a
+    test class, and for the class itself so that errors in its class setup or teardown aren't lost.
+    Tests which weren't run keep the outcome that they had before.
+    """
+
+    _NAME = "outcomes.json"
+
+    def __init__(self, cache_dir: str):
+        self._cache_dir = cache_dir
+        self._outcomes: dict[str, str] = read_cache(cache_dir, self._NAME) or {}
+
+    def failed(self) -> set[str]:
+        """Return the IDs of the tests which failed or errored the last time that they were run."""
+        return {test_id for test_id, outcome in self._outcomes.items() if outcome != "pass"}
+
+    def record(self, test: TestUnit, result: TestResult):
+        """Record the outcomes in the result of running a test unit."""
+        if isinstance(result, NotRunResult):
+            return
+        test_id = _test_unit_id(test)
+        if not _is_test_class(test):
+            self._outcomes[test_id] = _outcome(result)
+            return
+        # a class only fails because its test methods did, which are recorded separately, so the
+        # class itself has only failed if it errored outside of them
+        class_errored = isinstance(result, ErrorResult) and result.error is not None
+        self._outcomes[test_id] = "error" if class_errored else "pass"
+        for sub_result in result.sub_results:
+            if not isinstance(sub_result, NotRunResult):
+                self._outcomes[f"{test_id}::{sub_result.test_name}"] = _outcome(sub_result)
+
+    def forget_removed(self, module_tests: Sequence[TestUnit]):
+        """
+        Forget the outcomes of the tests of a test module which aren't among all of its tests that
+        were found this time, since they've been removed or renamed.
+        """
+        if not module_tests:
+            return
+        module = _test_unit_module(module_tests[0])
+        test_ids = {test_id for test in module_tests for test_id in _test_ids(test)}
+        for test_id in list(self._outcomes):
+            if test_id.split("::")[0] == module and test_id not in test_ids:
+                del self._outcomes[test_id]
+
+    def save(self):
+        write_cache(self._cache_dir, self._NAME, self._outcomes)
+
+
+def last_failed(tests: Iterable[TestUnit], failed: set[str]) -> Iterator[TestUnit]:
+    """
+    Yield the tests which failed or errored the last time that they were run. Test classes which
+    only had some of their test methods fail are yielded as TestMethods of just those methods.
+
+    If none of the tests failed, like when the ones which did have been removed or aren't among the
+    tests given, all of the tests are yielded. The tests are held back until one which failed is
+    found, so they're only all held back when none of them did.
+    """
+    failed_methods = _failed_methods_by_class(failed)
+    held_back: list[TestUnit] = []
+    any_failed = False
+    for test in tests:
+        test_id = _test_unit_id(test)
+        if test_id in failed:
+            selected: Optional[TestUnit] = test
+        elif _is_test_class(test) and test_id in failed_methods:
+            selected = TestMethods(test, tuple(failed_methods[test_id]))  # type: ignore[arg-type]
+        else:
+            selected = None
+        if selected is not None:
+            any_failed = True
+            held_back.clear()
+            yield selected
+        elif not any_failed:
+            held_back.append(test)
+    yield from held_back
+
+
+def failed_first(tests: Iterable[TestUnit], failed: set[str]) -> list[TestUnit]:
+    """
+    Return the tests with the ones which failed or errored the last time that they were run first,
+    keeping the order of the tests otherwise.
+    """
+    failed_methods = _failed_methods_by_class(failed)
+    failed_tests = []
+    other_tests = []
+    for test in tests:
+        test_id = _test_unit_id(test)
+        if test_id in failed or test_id in failed_methods:
+            failed_tests.append(test)
+        else:
+            other_tests.append(test)
+    return failed_tests + other_tests
+
+
+def _failed_methods_by_class(failed: set[str]) -> dict[str, list[str]]:
+    failed_methods: dict[str, list[str]] = {}
+    for test_id in sorted(failed):
+        module, *names = test_id.split("::")
+        if len(names) == 2:
+            class_name, method_name = names
+            failed_methods.setdefault(f"{module}::{class_name}", []).append(method_name)
+    return failed_methods
+
+
+def _test_ids(test: TestUnit) -> list[str]:
+    """Return the ID of a test unit, and of each of its test methods if it's a test class."""
+    test_id = _test_unit_id(test)
+    if isinstance(test, TestReference):
+        method_names = test.method_names
+    elif isinstance(test, TestMethods):
+        method_names = list(test.method_names)
+    elif _is_test_class(test):
+        method_names = _get_sorted_test_method_names(test)  # type: ignore[arg-type]
+    else:
+        method_names = []
+    return [test_id, *(f"{test_id}::{name}" for name in method_names)]
+
+
+def _outcome(result: TestResult) -> str:
+    if isinstance(result, ErrorResult):
+        return "error"
+    if isinstance(result, FailResult):
+        return "fail"
+    return "pass"
@@ -0,0 +1,130 @@
+import os
+import tempfile
+import unittest
+
+from .outcomes import failed_first, last_failed, OutcomeCache
+from .running import ErrorResult, FailResult, NotRunResult, PassResult, TestContext, TestMethods
+
+
+def test_passes(t: TestContext):
+    pass
+
+
+def test_fails(t: TestContext):
+    t.fail()
+
+
+class TestClass:
+    def test_passes(self, t: TestContext):
+        pass
+
+    def test_fails(self, t: TestContext):
+        t.fail()
+
+
+class TestOutcomeCache(unittest.TestCase):
+    longMessage = False
+
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.cache_dir = os.path.join(temp_dir.name, ".testipy_cache")
+
+    def test_failed_tests_and_test_methods_are_read_back_after_saving(self):
+        cache = OutcomeCache(self.cache_dir)
+        cache.record(test_passes, PassResult("test_passes"))
+        cache.record(test_fails, FailResult("test_fails"))
+        cache.record(
+            TestClass,
+            FailResult(
+                "TestClass",
+                sub_results=[PassResult("test_passes"), ErrorResult("test_fails")],
+            ),
+        )
+        cache.save()
+
+        actual = OutcomeCache(self.cache_dir).failed()
+
+        expected = {f"{__name__}::test_fails", f"{__name__}::TestClass::test_fails"}
+        self.assertEqual(expected, actual, f"expected failed tests {expected}, got {actual}")
+
+    def test_class_is_failed_when_it_errors_outside_of_its_test_methods(self):
+        cache = OutcomeCache(self.cache_dir)
+        cache.record(TestClass, ErrorResult("TestClass", error=ValueError("oh no!")))
+
+        actual = cache.failed()
+
+        expected = {f"{__name__}::TestClass"}
+        self.assertEqual(expected, actual, f"expected failed tests {expected}, got {actual}")
+
+    def test_tests_which_were_not_run_keep_their_outcome(self):
+        cache = OutcomeCache(self.cache_dir)
+        cache.record(test_fails, FailResult("test_fails"))
+        cache.record(test_fails, NotRunResult("test_fails"))
+
+        actual = cache.failed()
+
+        expected = {f"{__name__}::test_fails"}
+        self.assertEqual(expected, actual, f"expected failed tests {expected}, got {actual}")
+
+    def test_tests_which_pass_again_are_no_longer_failed(self):
+        cache = OutcomeCache(self.cache_dir)
+        cache.record(test_fails, FailResult("test_fails"))
+        cache.record(test_fails, PassResult("test_fails"))
+
+        actual = cache.failed()
+
+        self.assertEqual(set(), actual, f"expected no failed tests, got {actual}")
+
+    def test_outcomes_of_tests_removed_from_a_module_are_forgotten(self):
+        cache = OutcomeCache(self.cache_dir)
+        cache.record(test_fails, FailResult("test_fails"))
+        cache.record(TestClass, FailResult("TestClass", sub_results=[ErrorResult("test_fails")]))
+        cache.record(TestClass, FailResult("TestClass", sub_results=[ErrorResult("test_gone")]))
+        cache._outcomes["other_test::test_fails"] = "fail"
+
+        cache.forget_removed([test_passes, TestClass])
+
+        actual = cache.failed()
+        expected = {f"{__name__}::TestClass::test_fails", "other_test::test_fails"}
+        self.assertEqual(expected, actual, f"expected failed tests {expected}, got {actual}")
+
+
+class TestLastFailed(unittest.TestCase):
+    longMessage = False
+
+    def test_only_failed_tests_and_test_methods_are_selected(self):
+        failed = {f"{__name__}::test_fails", f"{__name__}::TestClass::test_fails"}
+
+        actual = list(last_failed([test_passes, TestClass, test_fails], failed))
+
+        expected = [TestMethods(TestClass, ("test_fails",)), test_fails]
+        self.assertEqual(expected, actual, f"expected tests {expected}, got {actual}")
+
+    def test_whole_class_is_selected_when_it_failed(self):
+        failed = {f"{__name__}::TestClass", f"{__name__}::TestClass::test_fails"}
+
+        actual = list(last_failed([test_passes, TestClass], failed))
+
+        expected = [TestClass]
+        self.assertEqual(expected, actual, f"expected tests {expected}, got {actual}")
+
+    def test_all_tests_are_selected_when_none_of_them_failed(self):
+        failed = {"other_test::test_fails"}
+
+        actual = list(last_failed([test_passes, TestClass, test_fails], failed))
+
+        expected = [test_passes, TestClass, test_fails]
+        self.assertEqual(expected, actual, f"expected tests {expected}, got {actual}")
+
+
+class TestFailedFirst(unittest.TestCase):
+    longMessage = False
+
+    def test_failed_tests_are_moved_to_the_front(self):
+        failed = {f"{__name__}::test_fails", f"{__name__}::TestClass::test_fails"}
+
+        actual = failed_first([test_passes, TestClass, test_fails], failed)
+
+        expected = [TestClass, test_fails, test_passes]
+        self.assertEqual(expected, actual, f"expected tests {expected}, got {actual}")
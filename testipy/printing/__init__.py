@@ -1 +1,3 @@
 from .friendly_printer import FriendlyPrinter  # noqa: F401
+from .collected_printer import CollectedPrinter  # noqa: F401
+from .durations import DurationsPrinter  # noqa: F401
@@ -0,0 +1,39 @@
+import sys
+from typing import Iterable, TextIO
+
+from rich import console
+
+from ..running import TestReference
+
+
+class CollectedPrinter:
+    """
+    Prints the tests which were collected without running them.
+
+    The format for each test is:
+        $PATH:$LINE $TEST_NAME
+    followed by a line for each test method of a test class:
+        $PATH:$LINE $TEST_CLASS_NAME/$TEST_METHOD_NAME
+    """
+
+    def __init__(self, tests: Iterable[TestReference], *, colourise: bool = True):
+        self._tests = tests
+        self._colourise = colourise
+
+    def print(self, *, out: TextIO = sys.stdout):
+        c = console.Console(file=out)
+        tests_collected = 0
+        for test in self._tests:
+            lines = [f"{test.path}:{test.line} {test.name}"]
+            lines.extend(f"{test.path}:{line} {test.name}/{name}" for name, line in test.methods)
+            # the lines are meant to be read by tools too, so they're never wrapped
+            c.print("\n".join(lines), highlight=False, markup=False, soft_wrap=True)
+            tests_collected += 1 + len(test.methods)
+        c.print(self._summary(tests_collected), highlight=False)
+
+    def _summary(self, tests_collected: int) -> str:
+        plural = "s" if tests_collected != 1 else ""
+        summary = f"{tests_collected} test{plural} collected"
+        if self._colourise:
+            summary = f"[bold]{summary}[/bold]"
+        return summary
@@ -0,0 +1,58 @@
+import io
+import os
+import unittest
+from unittest import mock
+
+from ..running import TestReference
+from ..printing import CollectedPrinter
+from ..common_test import dedent
+
+
+class TestCollectedPrinter(unittest.TestCase):
+    longMessage = False
+
+    def test_formats_each_test_with_its_location(self):
+        tests = [
+            TestReference("tests/foo_test.py", "tests.foo_test", "test_foo", 4),
+            TestReference(
+                "tests/foo_test.py",
+                "tests.foo_test",
+                "TestFoo",
+                8,
+                methods=(("test_a", 9), ("test_b", 12)),
+            ),
+        ]
+
+        actual = self.print_tests_to_string(tests)
+
+        expected = dedent(
+            """
+            tests/foo_test.py:4 test_foo
+            tests/foo_test.py:8 TestFoo
+            tests/foo_test.py:9 TestFoo/test_a
+            tests/foo_test.py:12 TestFoo/test_b
+            4 tests collected
+            """
+        )
+        self.assertEqual(
+            expected,
+            actual,
+            f"expected tests to be formatted as:\n\n'{expected}'\ngot:\n\n'{actual}'",
+        )
+
+    def test_formats_summary_when_no_tests_collected(self):
+        actual = self.print_tests_to_string([])
+
+        expected = "0 tests collected\n"
+        self.assertEqual(
+            expected,
+            actual,
+            f"expected tests to be formatted as:\n\n'{expected}'\ngot:\n\n'{actual}'",
+        )
+
+    def print_tests_to_string(self, *args, **kwargs) -> str:
+        out = io.StringIO()
+        # output which isn't to a terminal shouldn't be wrapped however narrow the terminal is
+        with mock.patch.dict(os.environ, {"COLUMNS": "40"}):
+            CollectedPrinter(*args, **kwargs).print(out=out)
+        return out.getvalue()
@@ -0,0 +1,160 @@
+import math
+import sys
+from typing import Iterator, Optional, TextIO
+
+from rich import console
+
+from ..running import TestResults
+from ..running.results import TestResult
+
+
+def format_duration(ns: int) -> str:
+    """Format a duration in nanoseconds with a unit which keeps it short, e.g. 1.23ms."""
+    if ns < 1_000:
+        return f"{ns}ns"
+    if ns < 1_000_000:
+        return f"{ns / 1_000:.2f}µs"
+    if ns < 1_000_000_000:
+        return f"{ns / 1_000_000:.2f}ms"
+    return f"{ns / 1_000_000_000:.2f}s"
+
+
+def _format_power_of_ten_ns(exponent: int) -> str:
+    # e.g. 10^4ns is formatted as 10µs
+    units = ["ns", "µs", "ms", "s"]
+    unit_index = min(exponent // 3, len(units) - 1)
+    return f"{10 ** (exponent - 3 * unit_index)}{units[unit_index]}"
+
+
+class DurationsPrinter:
+    """
+    Prints a report of where the time went when running some tests, made of three sections.
+
+    The slowest tests: the test functions, test classes and test methods which took the longest
+    wall time, slowest first, limited to the given number of them if there is one. The format for
+    each test is:
+        $WALL_TIME wall $CPU_TIME CPU $TEST_NAME
+
+    A histogram of the wall time taken by each test function and test method, with one bucket per
+    power of ten nanoseconds between the fastest and slowest tests. The format for each bucket is:
+        $LOWER_BOUND-$UPPER_BOUND $BAR $COUNT
+
+    The phases of each test class, limited in the same way as the slowest tests. For each test
+    class, the wall time spent in each phase of running it is printed: setup_class;
+    the setup, call and teardown of its test methods, summed over the methods; and teardown_class.
+    This is followed by the share of that time which was spent in fixtures, i.e. everything but the
+    test method calls. The classes are ordered by the time spent in fixtures, most first, and
+    classes which spent at least half of their time in fixtures are highlighted, since they're the
+    ones whose per-method setup could be moved into setup_class.
+
+    The format for each test class is:
+        $TEST_CLASS_NAME $TOTAL_TIME: $PHASE $PHASE_TIME, ...; $SHARE% in fixtures
+    """
+
+    _class_phases = ["setup_class", "setup", "call", "teardown", "teardown_class"]
+
+    _histogram_width = 40
+
+    def __init__(
+        self, results: TestResults, *, slowest: Optional[int] = None, colourise: bool = True
+    ):
+        self._results = results
+        self._slowest = slowest
+        self._colourise = colourise
+
+    def print(self, *, out: TextIO = sys.stdout):
+        c = console.Console(file=out)
+        for section in [self._slowest_tests(), self._histogram(), self._phases()]:
+            if section:
+                c.print("\n".join(section), highlight=False, soft_wrap=True)
+
+    def _slowest_tests(self) -> list[str]:
+        timed_results = [
+            (name, result) for name, result in self._flatten(self._results) if result.duration
+        ]
+        if not timed_results:
+            return []
+        timed_results.sort(key=lambda name_result: name_result[1].duration.wall_ns, reverse=True)
+        lines = [self._style("slowest tests:", "bold")]
+        for name, result in timed_results[: self._slowest]:
+            wall = format_duration(result.duration.wall_ns)
+            cpu = format_duration(result.duration.cpu_ns)
+            lines.append(f"{wall:>9} wall {cpu:>9} CPU {name}")
+        return lines
+
+    def _flatten(self, results: TestResults, prefix: str = "") -> Iterator[tuple[str, TestResult]]:
+        for result in results:
+            name = f"{prefix}/{result.test_name}" if prefix else result.test_name
+            yield name, result
+            yield from self._flatten(result.sub_results, prefix=name)
+
+    def _histogram(self) -> list[str]:
+        # test classes are left out since they'd be counted twice along with their methods
+        durations_ns = [
+            result.duration.wall_ns
+            for _, result in self._flatten(self._results)
+            if result.duration and not result.sub_results
+        ]
+        if not durations_ns:
+            return []
+        buckets: dict[int, int] = {}
+        for ns in durations_ns:
+            exponent = math.floor(math.log10(ns)) if ns > 0 else 0
+            buckets[exponent] = buckets.get(exponent, 0) + 1
+        largest_count = max(buckets.values())
+        exponents = range(min(buckets), max(buckets) + 1)
+        bounds = [
+            f"{_format_power_of_ten_ns(exponent)}-{_format_power_of_ten_ns(exponent + 1)}"
+            for exponent in exponents
+        ]
+        bounds_width = max(len(bound) for bound in bounds)
+        lines = [self._style("test duration histogram (wall time):", "bold")]
+        for exponent, bound in zip(exponents, bounds):
+            count = buckets.get(exponent, 0)
+            bar = "█" * math.ceil(self._histogram_width * count / largest_count)
+            lines.append(
+                " ".join(part for part in [f"{bound:>{bounds_width}}", bar, str(count)] if part)
+            )
+        return lines
+
+    def _phases(self) -> list[str]:
+        class_phases = [
+            (result.test_name, self._sum_class_phases(result))
+            for result in self._results
+            if result.sub_results
+        ]
+        if not class_phases:
+            return []
+        class_phases.sort(key=lambda name_phases: self._fixtures_ns(name_phases[1]), reverse=True)
+        lines = [self._style("test class phase durations (wall time):", "bold")]
+        lines.extend(
+            self._format_class_phases(name, phases)
+            for name, phases in class_phases[: self._slowest]
+        )
+        return lines
+
+    def _sum_class_phases(self, result: TestResult) -> dict[str, int]:
+        phases = dict.fromkeys(self._class_phases, 0)
+        for name, duration in result.phases.items():
+            phases[name] += duration.wall_ns
+        for sub_result in result.sub_results:
+            for name, duration in sub_result.phases.items():
+                phases[name] += duration.wall_ns
+        return phases
+
+    def _fixtures_ns(self, phases: dict[str, int]) -> int:
+        return sum(ns for name, ns in phases.items() if name != "call")
+
+    def _format_class_phases(self, test_name: str, phases: dict[str, int]) -> str:
+        total_ns = sum(phases.values())
+        formatted_phases = ", ".join(f"{name} {format_duration(ns)}" for name, ns in phases.items())
+        fixtures_share = self._fixtures_ns(phases) / total_ns if total_ns else 0
+        formatted_share = f"{fixtures_share:.0%} in fixtures"
+        if fixtures_share >= 0.5:
+            formatted_share = self._style(formatted_share, "yellow bold")
+        return f"{test_name} {format_duration(total_ns)}: {formatted_phases}; {formatted_share}"
+
+    def _style(self, s: str, style: str) -> str:
+        if not self._colourise:
+            return s
+        return f"[{style}]{s}[/{style}]"
@@ -0,0 +1,123 @@
+import io
+import os
+import unittest
+from unittest import mock
+
+from ..common_test import dedent
+from ..running import Duration, FailResult, PassResult
+from .durations import DurationsPrinter, format_duration
+
+
+class TestFormatDuration(unittest.TestCase):
+    longMessage = False
+
+    def test_formats_duration_with_shortest_unit(self):
+        cases = [
+            (999, "999ns"),
+            (1_500, "1.50µs"),
+            (12_345_678, "12.35ms"),
+            (3_210_000_000, "3.21s"),
+        ]
+        for ns, expected in cases:
+            actual = format_duration(ns)
+            self.assertEqual(
+                expected,
+                actual,
+                f"expected {ns}ns to be formatted as {expected}, got {actual}",
+            )
+
+
+class TestDurationsPrinter(unittest.TestCase):
+    longMessage = False
+
+    def test_formats_slowest_tests_and_histogram(self):
+        results = [
+            PassResult("test_fast", duration=Duration(5_000, 4_000)),
+            FailResult(
+                "TestFoo",
+                sub_results=[
+                    PassResult("test_a", duration=Duration(2_000_000, 1_000_000)),
+                    FailResult("test_b", duration=Duration(4_000_000, 3_000_000)),
+                ],
+                duration=Duration(7_000_000, 5_000_000),
+            ),
+            PassResult("test_slow", duration=Duration(3_000_000, 3_000_000)),
+        ]
+
+        actual = self.print_durations_to_string(results, slowest=3)
+
+        expected = dedent(
+            """
+            slowest tests:
+               7.00ms wall    5.00ms CPU TestFoo
+               4.00ms wall    3.00ms CPU TestFoo/test_b
+               3.00ms wall    3.00ms CPU test_slow
+            test duration histogram (wall time):
+              1µs-10µs ██████████████ 1
+            10µs-100µs 0
+             100µs-1ms 0
+              1ms-10ms ████████████████████████████████████████ 3
+            test class phase durations (wall time):
+            TestFoo 0ns: setup_class 0ns, setup 0ns, call 0ns, teardown 0ns, teardown_class 0ns; 0% in fixtures
+            """  # noqa: E501
+        )
+        self.assertPrintedDurationsEqual(expected, actual)
+
+    def test_formats_phases_of_test_classes_by_fixture_time(self):
+        results = [
+            PassResult("test_function"),
+            PassResult(
+                "TestFastFixtures",
+                sub_results=[PassResult("test_a", phases={"call": Duration(3_000_000, 0)})],
+                phases={"setup_class": Duration(1_000_000, 0)},
+            ),
+            PassResult(
+                "TestSlowFixtures",
+                sub_results=[
+                    PassResult(
+                        "test_a",
+                        phases={
+                            "setup": Duration(4_000_000, 0),
+                            "call": Duration(1_000_000, 0),
+                            "teardown": Duration(1_000_000, 0),
+                        },
+                    ),
+                    PassResult(
+                        "test_b",
+                        phases={"setup": Duration(4_000_000, 0), "call": Duration(1_000_000, 0)},
+                    ),
+                ],
+            ),
+        ]
+
+        actual = self.print_durations_to_string(results)
+
+        expected = dedent(
+            """
+            test class phase durations (wall time):
+            TestSlowFixtures 11.00ms: setup_class 0ns, setup 8.00ms, call 2.00ms, teardown 1.00ms, teardown_class 0ns; 82% in fixtures
+            TestFastFixtures 4.00ms: setup_class 1.00ms, setup 0ns, call 3.00ms, teardown 0ns, teardown_class 0ns; 25% in fixtures
+            """  # noqa: E501
+        )
+        self.assertPrintedDurationsEqual(expected, actual)
+
+    def test_prints_nothing_without_durations_or_test_classes(self):
+        results = [PassResult("test_function")]
+
+        actual = self.print_durations_to_string(results)
+
+        self.assertPrintedDurationsEqual("", actual)
+
+    def assertPrintedDurationsEqual(self, expected: str, actual: str):
+        self.assertEqual(
+            expected,
+            actual,
+            f"expected durations to be formatted as:\n\n'{expected}'\ngot:\n\n'{actual}'",
+        )
+
+    def print_durations_to_string(self, *args, **kwargs) -> str:
+        out = io.StringIO()
+        # output which isn't to a terminal shouldn't be wrapped however narrow the terminal is
+        with mock.patch.dict(os.environ, {"COLUMNS": "40"}):
+            DurationsPrinter(*args, **kwargs).print(out=out)
+        return out.getvalue()
@@ -1,46 +1,66 @@
-import io
 import sys
 import textwrap
-import traceback as tb
-from typing import TextIO
+from typing import Iterable, TextIO
 
 from rich import console
 
-from ..running import ErrorResult, FailResult, PassResult, TestResults
-
-
-class NoNextTracebackError(Exception):
-    pass
+from ..running import ErrorResult, FailResult, NotRunResult, PassResult, TestResults
+from ..running.results import TestResult, format_error
+from .durations import format_duration
 
 
 class FriendlyPrinter:
-    # TODO: update this to be accurate
     """
     Prints test results in a friendly human-readable way.
 
     The format for each result is:
-        $TEST_NAME (PASS | FAIL | ERROR)
+        [$CLASS_NAME/]$TEST_NAME (PASS [(cached)] | FAIL | ERROR | NOT RUN) [($WALL wall, $CPU CPU)]
             [$FAILURE_MESSAGES | $ERROR_TRACEBACK]
+
+    The results of a test class's test methods follow the class's own result, prefixed with the
+    class's name. Passes which were reused from an earlier run rather than run again are marked as
+    cached. The wall and CPU durations are only printed if show_durations is set and the result
+    has them.
+
+    The results are followed by a summary of how many tests were run and how many of them passed,
+    failed or errored, and how many weren't run.
     """
 
-    def __init__(self, results: TestResults, *, colourise: bool = True, indent_size: int = 4):
+    def __init__(
+        self,
+        results: Iterable[TestResult],
+        *,
+        colourise: bool = True,
+        indent_size: int = 4,
+        show_durations: bool = False,
+    ):
         self._results = results
         self._colourise = colourise
         self._indent_size = indent_size
+        self._show_durations = show_durations
         self._tests_run = 0
         self._tests_passed = 0
         self._tests_failed = 0
         self._tests_errored = 0
+        self._tests_not_run = 0
 
     def print(self, *, out: TextIO = sys.stdout):
-        formatted = self._format(self._results)
+        """
+        Print each result as soon as it's taken from the results given to the printer, followed by
+        a summary once they've all been printed.
+        """
         c = console.Console(file=out)
-        c.print(formatted, highlight=False)
+        for result in self._results:
+            c.print(self._format([result]), highlight=False)
         c.print(self._summary(), highlight=False)
 
     def _format(self, results: TestResults, prefix: str = "") -> str:
         formatted_results = []
         for result in results:
+            if isinstance(result, NotRunResult):
+                self._tests_not_run += 1
+                formatted_results.append(self._format_not_run_result(result, prefix))
+                continue
             self._tests_run += 1
             if isinstance(result, PassResult):
                 self._tests_passed += 1
@@ -55,30 +75,40 @@ class FriendlyPrinter:
         return formatted
 
     def _format_pass_result(self, result: PassResult, test_prefix: str = "") -> str:
-        lines = [self._format_test_name(result.test_name, "PASS", test_prefix, style="green bold")]
+        result_type = "PASS (cached)" if result.cached else "PASS"
+        lines = [self._format_test_name(result, result_type, test_prefix, style="green bold")]
         lines.extend(self._format_sub_results(result.test_name, result.sub_results))
         return "\n".join(lines)
 
     def _format_fail_result(self, result: FailResult, test_prefix: str = "") -> str:
-        lines = [self._format_test_name(result.test_name, "FAIL", test_prefix, style="red bold")]
+        lines = [self._format_test_name(result, "FAIL", test_prefix, style="red bold")]
         lines.extend(self._indent(f"- {message}") for message in result.messages)
         lines.extend(self._format_sub_results(result.test_name, result.sub_results))
         return "\n".join(lines)
 
     def _format_error_result(self, result: ErrorResult, test_prefix: str = "") -> str:
-        lines = [self._format_test_name(result.test_name, "ERROR", test_prefix, style="blue bold")]
+        lines = [self._format_test_name(result, "ERROR", test_prefix, style="blue bold")]
         if result.error:
-            traceback = self._get_traceback_without_first_stack_trace(result.error)
+            traceback = format_error(result.error)
             lines.extend(self._indent(line) for line in traceback.splitlines())
         lines.extend(self._format_sub_results(result.test_name, result.sub_results))
         return "\n".join(lines)
 
-    def _format_test_name(self, test_name: str, result: str, test_prefix: str, style: str) -> str:
-        formatted = f"{test_name} {result}"
+    def _format_not_run_result(self, result: NotRunResult, test_prefix: str = "") -> str:
+        return self._format_test_name(result, "NOT RUN", test_prefix, style="yellow bold")
+
+    def _format_test_name(
+        self, result: TestResult, result_type: str, test_prefix: str, style: str
+    ) -> str:
+        formatted = f"{result.test_name} {result_type}"
         if test_prefix:
             formatted = f"{test_prefix}/{formatted}"
         if self._colourise and style:
             formatted = self._style(formatted, style)
+        if self._show_durations and result.duration:
+            wall = format_duration(result.duration.wall_ns)
+            cpu = format_duration(result.duration.cpu_ns)
+            formatted += f" ({wall} wall, {cpu} CPU)"
         return formatted
 
     def _style(self, s: str, style: str) -> str:
@@ -91,26 +121,6 @@ class FriendlyPrinter:
             lines.append(formatted)
         return lines
 
-    def _get_traceback_without_first_stack_trace(self, e: Exception) -> str:
-        string_io = io.StringIO()
-        # __traceback__ is guaranteed to not be None since the exception will
-        # always be thrown from inside a test function call meaning that we'll
-        # always have a call like test_xxx as the first stack trace entry followed
-        # by at least one other entry which is where the exception was actually
-        # raised
-        if not e.__traceback__:
-            raise NoNextTracebackError(
-                f"Expected traceback {e.__traceback__} to have another traceback chained on to it."
-            )
-        next_traceback = e.__traceback__.tb_next
-        tb.print_exception(
-            type(e),
-            value=e,
-            tb=next_traceback,
-            file=string_io,
-        )
-        return string_io.getvalue()
-
     def _indent(self, s: str) -> str:
         return textwrap.indent(s, self._indent_size * " ")
 
@@ -124,5 +134,7 @@ class FriendlyPrinter:
             parts.append(self._style(f"{self._tests_failed} failed", "red"))
         if self._tests_errored:
             parts.append(self._style(f"{self._tests_errored} errored", "blue"))
+        if self._tests_not_run:
+            parts.append(self._style(f"{self._tests_not_run} not run", "yellow"))
         summary += " " + ", ".join(parts)
         return self._style(summary, "bold")
@@ -3,7 +3,7 @@ import unittest
 
 from testipy.running.results import TestResults
 
-from ..running import PassResult, FailResult, ErrorResult
+from ..running import PassResult, FailResult, ErrorResult, NotRunResult, Duration
 from ..printing import FriendlyPrinter
 from ..common_test import dedent, get_project_root, def_line
 
@@ -177,6 +177,33 @@ class TestFriendlyPrinter(BaseTestCase):
         )
         self.assertPrintedResultsEqual(expected, actual)
 
+    def test_formats_not_run_results_as_a_single_line_not_counted_as_run(self):
+        results = [FailResult("test_fails"), NotRunResult("test_passes")]
+
+        actual = self.print_results_to_string(results)
+
+        expected = dedent(
+            """
+            test_fails FAIL
+            test_passes NOT RUN
+            1 test run; 1 failed, 1 not run
+            """
+        )
+        self.assertPrintedResultsEqual(expected, actual)
+
+    def test_formats_cached_passing_results_as_cached(self):
+        results = [PassResult("test_passes", cached=True)]
+
+        actual = self.print_results_to_string(results)
+
+        expected = dedent(
+            """
+            test_passes PASS (cached)
+            1 test run; 1 passed
+            """
+        )
+        self.assertPrintedResultsEqual(expected, actual)
+
 
 class TestSubResults(BaseTestCase):
     def test_formats_pass_result_with_sub_results_indented(self):
@@ -345,3 +372,59 @@ class TestSubResults(BaseTestCase):
             raise_value_error_line=def_line(raises_exception) + 1,
         )
         self.assertPrintedResultsEqual(expected, actual)
+
+
+class TestFriendlyPrinterDurations(BaseTestCase):
+    def test_formats_durations_after_result_when_shown(self):
+        results = [
+            FailResult(
+                "TestFoo",
+                sub_results=[FailResult("test_fails", duration=Duration(2_000_000, 1_500_000))],
+                duration=Duration(3_000_000, 2_000_000),
+            )
+        ]
+
+        actual = self.print_results_to_string(results, show_durations=True)
+
+        expected = dedent(
+            """
+            TestFoo FAIL (3.00ms wall, 2.00ms CPU)
+            TestFoo/test_fails FAIL (2.00ms wall, 1.50ms CPU)
+            2 tests run; 2 failed
+            """
+        )
+        self.assertPrintedResultsEqual(expected, actual)
+
+    def test_does_not_format_durations_by_default(self):
+        results = [PassResult("test_passes", duration=Duration(2_000_000, 1_500_000))]
+
+        actual = self.print_results_to_string(results)
+
+        expected = dedent(
+            """
+            test_passes PASS
+            1 test run; 1 passed
+            """
+        )
+        self.assertPrintedResultsEqual(expected, actual)
+
+
+class TestFriendlyPrinterStreaming(BaseTestCase):
+    def test_prints_each_result_before_taking_the_next(self):
+        out = io.StringIO()
+        printed_before_second_result = []
+
+        def results():
+            yield PassResult("test_first")
+            printed_before_second_result.append(out.getvalue())
+            yield PassResult("test_second")
+
+        FriendlyPrinter(results()).print(out=out)
+
+        expected = ["test_first PASS\n"]
+        self.assertEqual(
+            expected,
+            printed_before_second_result,
+            f"expected {expected} to be printed before the second result was taken, "
+            f"got {printed_before_second_result}",
+        )
@@ -0,0 +1,189 @@
+import collections
+import dataclasses
+import hashlib
+import inspect
+import itertools
+import marshal
+import sys
+from types import CodeType
+from typing import Any, Callable, Iterable, Iterator, Optional
+
+from .cache import read_cache, write_cache
+from .discovery.imports import project_dependencies
+from .running import PassResult, TestMethods, TestReference, TestUnit
+from .running.results import TestResult, _result_from_dict, _result_to_dict
+from .running.units import _test_unit_id, _test_unit_path
+
+DEFAULT_MAX_ENTRIES = 10_000
+
+
+class ResultCache:
+    """
+    On-disk store of the results of tests which passed, keyed by a hash of the test's code and the
+    source of every project module that its module imports, so that a test which passed can be
+    skipped until something that it could depend on changes.
+
+    The store holds a result for up to max_entries tests, evicting the least recently used ones
+    when it's saved.
+
+    This assumes that tests are deterministic: a test which passed once will keep passing as long
+    as its code and the project's code that it imports are the same. Only enable it for suites
+    where that's true.
+    """
+
+    _NAME = "results.json"
+
+    def __init__(self, cache_dir: str, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self._cache_dir = cache_dir
+        self._max_entries = max_entries
+        # test ID -> {"hash": ..., "result": ...}, least recently used first
+        self._entries: dict[str, Any] = read_cache(cache_dir, self._NAME) or {}
+        self._dependencies: dict[str, set[str]] = {}
+        self._file_hashes: dict[str, str] = {}
+
+    def get(self, test: TestUnit) -> Optional[TestResult]:
+        """
+        Return the stored result of a test if it passed and hasn't changed since. The result is
+        marked as cached and has no durations, since the test didn't take any time this run.
+        """
+        test_id = _test_unit_id(test)
+        entry = self._entries.get(test_id)
+        if entry is None or isinstance(test, TestMethods):
+            return None
+        test_hash = self._hash(test)
+        if test_hash is None or entry["hash"] != test_hash:
+            return None
+        # move the entry to the end so that it's evicted last
+        self._entries[test_id] = self._entries.pop(test_id)
+        return _reused(_result_from_dict(entry["result"]))
+
+    def set(self, test: TestUnit, result: TestResult):
+        """Store the result of a test if it passed, or forget the stored one if it didn't."""
+        test_id = _test_unit_id(test)
+        self._entries.pop(test_id, None)
+        # the result of only some of a class's test methods passing says nothing about the rest
+        if not isinstance(result, PassResult) or isinstance(test, TestMethods):
+            return
+        test_hash = self._hash(test)
+        if test_hash is not None:
+            self._entries[test_id] = {"hash": test_hash, "result": _result_to_dict(result)}
+
+    def save(self):
+        """Write the store to disk, evicting the least recently used entries beyond max_entries."""
+        evicted = max(len(self._entries) - self._max_entries, 0)
+        entries = dict(itertools.islice(self._entries.items(), evicted, None))
+        write_cache(self._cache_dir, self._NAME, entries)
+
+    def _hash(self, test: TestUnit) -> Optional[str]:
+        """
+        Return a hash of a test's code and the source of the project modules that it could depend
+        on, or None if its module's source can't be found so there's no telling what those are.
+        """
+        path = _test_unit_path(test)
+        if path is None:
+            return None
+        h = hashlib.sha256()
+        # code objects are marshalled differently by each version of Python
+        h.update(sys.version.encode())
+        h.update(_test_unit_id(test).encode())
+        for code in _code_objects(test):
+            h.update(marshal.dumps(code))
+        if path not in self._dependencies:
+            self._dependencies[path] = project_dependencies(path)
+        for dependency in sorted(self._dependencies[path]):
+            h.update(dependency.encode())
+            h.update(self._hash_file(dependency).encode())
+        return h.hexdigest()
+
+    def _hash_file(self, path: str) -> str:
+        if path not in self._file_hashes:
+            try:
+                with open(path, "rb") as f:
+                    self._file_hashes[path] = hashlib.sha256(f.read()).hexdigest()
+            except OSError:
+                self._file_hashes[path] = ""
+        return self._file_hashes[path]
+
+
+def reuse_results(
+    tests: Iterable[TestUnit],
+    cache: ResultCache,
+    run: Callable[[Iterator[TestUnit]], Iterator[TestResult]],
+) -> Iterator[TestResult]:
+    """
+    Yield the result of each of the tests, in the order that they're given, reusing the stored
+    results of the tests which are in the cache and running the rest with run. The results of the
+    tests which are run are stored in the cache, which is saved once they've all been yielded.
+
+    run is given an iterator of the tests which need running and must yield a result for each of
+    them in the same order, as stream_tests does.
+    """
+    source = iter(tests)
+    # (test, stored result or None if it's being run) for the tests whose results haven't been
+    # yielded yet
+    pending: collections.deque[tuple[TestUnit, Optional[TestResult]]] = collections.deque()
+    # tests which need running that were looked up before run asked for them
+    looked_up: collections.deque[TestUnit] = collections.deque()
+
+    def look_up_next_test() -> bool:
+        """Look up the next test in the cache, returning False if there are no tests left."""
+        test = next(source, None)
+        if test is None:
+            return False
+        stored_result = cache.get(test)
+        pending.append((test, stored_result))
+        if stored_result is None:
+            looked_up.append(test)
+        return True
+
+    def tests_to_run() -> Iterator[TestUnit]:
+        while looked_up or look_up_next_test():
+            while looked_up:
+                yield looked_up.popleft()
+
+    results = run(tests_to_run())
+    while True:
+        # stored results are yielded as soon as every test before them has its result, rather
+        # than waiting on the next test to be run
+        while pending and pending[0][1] is not None:
+            yield pending.popleft()[1]  # type: ignore[misc]
+        if pending:
+            test, _ = pending.popleft()
+            result = next(results)
+            cache.set(test, result)
+            yield result
+        elif not look_up_next_test():
+            break
+    # let run finish, now that there are no tests left to give it
+    for _ in results:
+        pass
+    cache.save()
+
+
+def _reused(result: TestResult) -> TestResult:
+    sub_results = [_reused(sub_result) for sub_result in result.sub_results]
+    if not isinstance(result, PassResult):
+        return result
+    return dataclasses.replace(
+        result, sub_results=sub_results, duration=None, phases={}, cached=True
+    )
+
+
+def _code_objects(test: TestUnit) -> Iterator[CodeType]:
+    """
+    Yield the code objects of a test function, or of each function defined on a test class and its
+    base classes. Test references haven't been imported, so their code is covered by the hash of
+    their module's source instead.
+    """
+    if isinstance(test, TestMethods):
+        test = test.test_class
+    if isinstance(test, TestReference):
+        return
+    if not inspect.isclass(test):
+        yield test.__code__
+        return
+    for klass in test.__mro__[:-1]:
+        for _, value in sorted(vars(klass).items()):
+            function = getattr(value, "__func__", value)
+            if inspect.isfunction(function):
+                yield function.__code__
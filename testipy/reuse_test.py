@@ -0,0 +1,145 @@
+import os
+import tempfile
+import unittest
+from typing import Iterator
+
+from .reuse import ResultCache, reuse_results
+from .running import Duration, FailResult, PassResult, TestReference, TestUnit
+from .running.results import TestResult
+
+
+class TestResultCache(unittest.TestCase):
+    longMessage = False
+
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.temp_dir = temp_dir.name
+        self.cache_dir = os.path.join(temp_dir.name, ".testipy_cache")
+
+    def test_passing_result_is_reused_after_saving(self):
+        test = self.reference("test_a")
+        cache = ResultCache(self.cache_dir)
+        cache.set(test, PassResult("test_a"))
+        cache.save()
+
+        actual = ResultCache(self.cache_dir).get(test)
+
+        expected = PassResult("test_a")
+        self.assertEqual(expected, actual, f"expected stored result {expected}, got {actual}")
+
+    def test_reused_result_is_cached_without_durations(self):
+        test = self.reference("test_a")
+        cache = ResultCache(self.cache_dir)
+        cache.set(test, PassResult("test_a", duration=Duration(1, 1)))
+
+        result = cache.get(test)
+
+        actual = (result.cached, result.duration) if result else None
+        expected = (True, None)
+        self.assertEqual(
+            expected, actual, f"expected reused result (cached, duration) {expected}, got {actual}"
+        )
+
+    def test_failing_result_is_not_stored(self):
+        test = self.reference("test_a")
+        cache = ResultCache(self.cache_dir)
+        cache.set(test, FailResult("test_a"))
+
+        actual = cache.get(test)
+
+        self.assertIsNone(actual, f"expected no stored result, got {actual}")
+
+    def test_result_is_not_reused_once_test_module_changes(self):
+        test = self.reference("test_a")
+        cache = ResultCache(self.cache_dir)
+        cache.set(test, PassResult("test_a"))
+        cache.save()
+        with open(test.path, "a") as f:
+            f.write("# changed\n")
+
+        actual = ResultCache(self.cache_dir).get(test)
+
+        self.assertIsNone(actual, f"expected no stored result after change, got {actual}")
+
+    def test_least_recently_used_results_are_evicted_when_saving(self):
+        test_a, test_b, test_c = (self.reference(name) for name in ["test_a", "test_b", "test_c"])
+        cache = ResultCache(self.cache_dir, max_entries=2)
+        cache.set(test_a, PassResult("test_a"))
+        cache.set(test_b, PassResult("test_b"))
+        cache.get(test_a)
+        cache.set(test_c, PassResult("test_c"))
+        cache.save()
+
+        cache = ResultCache(self.cache_dir, max_entries=2)
+        actual = [cache.get(test) is not None for test in [test_a, test_b, test_c]]
+
+        expected = [True, False, True]
+        self.assertEqual(
+            expected, actual, f"expected results to be stored for {expected}, got {actual}"
+        )
+
+    def reference(self, name: str) -> TestReference:
+        path = os.path.join(self.temp_dir, f"{name}_test.py")
+        with open(path, "w") as f:
+            f.write(f"def {name}(t):\n    pass\n")
+        return TestReference(path, f"{name}_test", name, 1)
+
+
+class TestReuseResults(unittest.TestCase):
+    longMessage = False
+
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.temp_dir = temp_dir.name
+        self.cache_dir = os.path.join(temp_dir.name, ".testipy_cache")
+
+    def test_only_tests_without_stored_results_are_run_and_results_keep_test_order(self):
+        test_a, test_b, test_c = (self.reference(name) for name in ["test_a", "test_b", "test_c"])
+        cache = ResultCache(self.cache_dir)
+        cache.set(test_a, PassResult("test_a", duration=Duration(1, 1)))
+        cache.set(test_c, PassResult("test_c", duration=Duration(1, 1)))
+        run_tests: list[TestUnit] = []
+
+        def run(tests: Iterator[TestUnit]) -> Iterator[TestResult]:
+            for test in tests:
+                run_tests.append(test)
+                yield FailResult(test.name)
+
+        actual = list(reuse_results([test_a, test_b, test_c], cache, run))
+
+        expected = [
+            PassResult("test_a", duration=Duration(1, 1)),
+            FailResult("test_b"),
+            PassResult("test_c", duration=Duration(1, 1)),
+        ]
+        self.assertEqual(expected, actual, f"expected results {expected}, got {actual}")
+        self.assertEqual([test_b], run_tests, f"expected only {test_b} to be run, got {run_tests}")
+
+    def test_stored_results_are_yielded_before_running_the_tests_after_them(self):
+        test_a, test_b, test_c = (self.reference(name) for name in ["test_a", "test_b", "test_c"])
+        cache = ResultCache(self.cache_dir)
+        cache.set(test_b, PassResult("test_b", duration=Duration(1, 1)))
+        run_tests: list[TestUnit] = []
+
+        def run(tests: Iterator[TestUnit]) -> Iterator[TestResult]:
+            for test in tests:
+                run_tests.append(test)
+                yield FailResult(test.name)
+
+        results = reuse_results([test_a, test_b, test_c], cache, run)
+        next(results)
+        actual = next(results)
+
+        expected = PassResult("test_b", duration=Duration(1, 1))
+        self.assertEqual(expected, actual, f"expected result {expected}, got {actual}")
+        self.assertEqual(
+            [test_a], run_tests, f"expected only {test_a} to have been run, got {run_tests}"
+        )
+
+    def reference(self, name: str) -> TestReference:
+        path = os.path.join(self.temp_dir, f"{name}_test.py")
+        with open(path, "w") as f:
+            f.write(f"def {name}(t):\n    pass\n")
+        return TestReference(path, f"{name}_test", name, 1)
@@ -1,4 +1,16 @@
 from .context import TestContext  # noqa: F401
-from .results import TestResults, PassResult, FailResult, ErrorResult  # noqa: F401
-from .running import run_tests  # noqa: F401
-from .functions import TestFunction  # noqa: F401
+from .results import (  # noqa: F401
+    TestResults,
+    PassResult,
+    FailResult,
+    ErrorResult,
+    NotRunResult,
+    Duration,
+)
+from .running import run_tests, stream_tests  # noqa: F401
+from .functions import TestFunction, TestTimeoutError  # noqa: F401
+from .distributed import Coordinator, WorkerDisconnectedError, run_worker  # noqa: F401
+from .forking import ForkedProcessError, ForkingNotSupportedError  # noqa: F401
+from .markers import serial, timeout  # noqa: F401
+from .monitoring import LineRecorder, MonitoringNotSupportedError  # noqa: F401
+from .units import TestMethods, TestReference, TestUnit  # noqa: F401
@@ -1,10 +1,22 @@
 import collections
 import inspect
-from typing import Callable, Any
-
-from .context import TestContext
-from .functions import _run_test_function
-from .results import PassResult, FailResult, ErrorResult, TestResult, TestResults
+import time
+from typing import Collection, Optional
+
+from .functions import _call_with_timeout, _run_test_function
+from .introspection import _definition_line, _is_test_method
+from .markers import _get_timeout
+from .monitoring import _recording_lines
+from .results import (
+    Duration,
+    PassResult,
+    FailResult,
+    ErrorResult,
+    FormattedError,
+    TestResult,
+    TestResults,
+)
+from .timing import Stopwatch, _timed_phase
 
 
 class TestClassSetupError(Exception):
@@ -30,6 +42,15 @@ class TestTeardownError(Exception):
         self.current_results = current_results or []
 
 
+class MissingTestMethodsError(FormattedError):
+    """
+    Given to a test class which was to be run with some of its test methods when none of them are
+    test methods of the class, so that it isn't reported as passing without running anything.
+    """
+
+    pass
+
+
 class TestClassTeardownError(Exception):
     """Raised when an error occurs during test class teardown."""
 
@@ -38,9 +59,30 @@ class TestClassTeardownError(Exception):
         self.results = results
 
 
-def _run_test_class(test_class: type) -> TestResult:
+def _run_test_class(
+    test_class: type,
+    timeout: Optional[float] = None,
+    method_names: Optional[Collection[str]] = None,
+) -> TestResult:
+    stopwatch = Stopwatch()
+    phases: dict[str, Duration] = {}
+    with _recording_lines(_test_class_id(test_class)):
+        result = _run_test_class_untimed(test_class, phases, timeout, method_names)
+    result.duration = stopwatch.elapsed()
+    result.phases = phases
+    return result
+
+
+def _run_test_class_untimed(
+    test_class: type,
+    phases: dict[str, Duration],
+    timeout: Optional[float],
+    method_names: Optional[Collection[str]],
+) -> TestResult:
     try:
-        sub_results = _run_test_methods(test_class)
+        sub_results = _run_test_methods(test_class, phases, timeout, method_names)
+    except MissingTestMethodsError as e:
+        return ErrorResult(test_class.__name__, error=e)
     except TestClassSetupError as e:
         return ErrorResult(test_class.__name__, error=e.raised_error)
     except TestSetupError as e:
@@ -53,49 +95,112 @@ def _run_test_class(test_class: type) -> TestResult:
     return result_type(test_class.__name__, sub_results=sub_results)
 
 
-def _run_test_methods(test_class: type) -> TestResults:
+def _run_test_methods(
+    test_class: type,
+    phases: dict[str, Duration],
+    timeout: Optional[float],
+    method_names: Optional[Collection[str]] = None,
+) -> TestResults:
+    """
+    Run the test methods of a test class, recording how long the class setup and teardown took in
+    the given phases and how long each method's setup, call and teardown took in its result's
+    phases. Setup and teardown phases are only recorded if the class defines them.
+
+    Each test method is run with the given timeout, unless it or the class is marked with its own,
+    which its setup and teardown share with it. The class setup and teardown are each run with the
+    class's timeout.
+
+    If method names are given, only those test methods are run, still in the order that they're
+    defined and still wrapped by the class setup and teardown. If none of them are test methods of
+    the class, a MissingTestMethodsError is raised without setting up the class.
+    """
     results: list[TestResult] = []
-    _setup_class(test_class)
     test_method_names = _get_sorted_test_method_names(test_class)
+    if method_names is not None:
+        test_method_names = [name for name in test_method_names if name in method_names]
+        if not test_method_names:
+            message = f"{test_class.__name__} has no test methods named {', '.join(method_names)}"
+            raise MissingTestMethodsError(
+                message, traceback=f"{MissingTestMethodsError.__name__}: {message}\n"
+            )
+    class_timeout = _get_timeout(test_class, None, default=timeout)
+    _setup_class(test_class, phases, class_timeout)
     for name in test_method_names:
-        instance = test_class()
-        _setup(instance, current_results=results)
-        test_method = getattr(instance, name)
-        result = _run_test_function(test_method)
-        results.append(result)
-        _teardown(instance, current_results=results)
-    _teardown_class(test_class, results=results)
+        with _recording_lines(f"{_test_class_id(test_class)}::{name}"):
+            instance = test_class()
+            method_phases: dict[str, Duration] = {}
+            test_method = getattr(instance, name)
+            method_timeout = _get_timeout(test_method, test_class, default=timeout)
+            start = time.monotonic()
+            _setup(instance, results, method_phases, method_timeout, start)
+            result = _run_test_function(test_method, timeout=method_timeout, start=start)
+            if result.duration:
+                method_phases["call"] = result.duration
+            result.phases = method_phases
+            results.append(result)
+            _teardown(instance, results, method_phases, method_timeout, start)
+    _teardown_class(test_class, results, phases, class_timeout)
     return results
 
 
-def _setup_class(test_class: type):
+def _test_class_id(test_class: type) -> str:
+    return f"{test_class.__module__}::{test_class.__name__}"
+
+
+def _setup_class(test_class: type, phases: dict[str, Duration], timeout: Optional[float]):
     if hasattr(test_class, "setup_class"):
         try:
-            test_class.setup_class()
+            with _timed_phase(phases, "setup_class"):
+                _call_with_timeout(
+                    test_class.setup_class, f"{test_class.__name__}.setup_class", timeout
+                )
         except Exception as e:
             raise TestClassSetupError(raised_error=e)
 
 
-def _setup(instance: object, current_results: TestResults):
+def _setup(
+    instance: object,
+    current_results: TestResults,
+    phases: dict[str, Duration],
+    timeout: Optional[float],
+    start: float,
+):
     if hasattr(instance, "setup"):
         try:
-            instance.setup()
+            with _timed_phase(phases, "setup"):
+                _call_with_timeout(
+                    instance.setup, f"{type(instance).__name__}.setup", timeout, start=start
+                )
         except Exception as e:
             raise TestSetupError(raised_error=e, current_results=current_results)
 
 
-def _teardown(instance: object, current_results: TestResults):
+def _teardown(
+    instance: object,
+    current_results: TestResults,
+    phases: dict[str, Duration],
+    timeout: Optional[float],
+    start: float,
+):
     if hasattr(instance, "teardown"):
         try:
-            instance.teardown()
+            with _timed_phase(phases, "teardown"):
+                _call_with_timeout(
+                    instance.teardown, f"{type(instance).__name__}.teardown", timeout, start=start
+                )
         except Exception as e:
             raise TestTeardownError(raised_error=e, current_results=current_results)
 
 
-def _teardown_class(test_class, results: TestResults):
+def _teardown_class(
+    test_class, results: TestResults, phases: dict[str, Duration], timeout: Optional[float]
+):
     if hasattr(test_class, "teardown_class"):
         try:
-            test_class.teardown_class()
+            with _timed_phase(phases, "teardown_class"):
+                _call_with_timeout(
+                    test_class.teardown_class, f"{test_class.__name__}.teardown_class", timeout
+                )
         except Exception as e:
             raise TestClassTeardownError(raised_error=e, results=results)
 
@@ -105,32 +210,13 @@ NameLineNo = collections.namedtuple("NameLineNo", ["name", "line_no"])
 
 def _get_sorted_test_method_names(test_class: type) -> list[str]:
     name_line_no_pairs = [
-        NameLineNo(name=name, line_no=_func_definition_line(method))
+        NameLineNo(name=name, line_no=_definition_line(method))
         for name, method in inspect.getmembers(test_class, predicate=_is_test_method)
     ]
     name_line_no_pairs.sort(key=lambda pair: pair.line_no)
     return [pair.name for pair in name_line_no_pairs]
 
 
-def _func_definition_line(f: Callable) -> int:
-    return f.__code__.co_firstlineno
-
-
-def _is_test_method(value: Any) -> bool:
-    if not inspect.isfunction(value):
-        return False
-    if not value.__name__.startswith("test_"):
-        return False
-
-    sig = inspect.signature(value)
-    # should have self and TestContext parameters
-    if len(sig.parameters) != 2:
-        return False
-
-    parameter = list(sig.parameters.values())[1]
-    return parameter.annotation == TestContext
-
-
 def _get_overall_result_type(results: TestResults) -> type[TestResult]:
     result_type: type[TestResult] = PassResult
     for result in results:
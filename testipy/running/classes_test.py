@@ -1,7 +1,11 @@
+import asyncio
+import time
 import unittest
 
 from .results import ErrorResult, FailResult, PassResult
 from .context import TestContext
+from .functions import TestTimeoutError
+from .markers import timeout
 from .running import run_tests
 
 
@@ -772,3 +776,227 @@ class TestTeardownClass(unittest.TestCase):
             actual,
             f"expected running class with erroring teardown_class method to return {expected}, got {actual}",
         )
+
+
+class TestClassTiming(unittest.TestCase):
+    longMessage = False
+
+    def test_duration_is_recorded_on_class_and_method_results(self):
+        class TestSleeps:
+            def test_first(self, t: TestContext):
+                time.sleep(0.01)
+
+            def test_second(self, t: TestContext):
+                time.sleep(0.01)
+
+        [result] = run_tests([TestSleeps])
+
+        for sub_result in result.sub_results:
+            self.assertGreaterEqual(
+                sub_result.duration.wall_ns,
+                10_000_000,
+                f"expected method which sleeps for 10ms to take at least 10ms, took "
+                f"{sub_result.duration}",
+            )
+        self.assertGreaterEqual(
+            result.duration.wall_ns,
+            20_000_000,
+            f"expected class with two methods which sleep for 10ms to take at least 20ms, took "
+            f"{result.duration}",
+        )
+
+    def test_duration_is_recorded_on_class_result_when_setup_class_errors(self):
+        class TestFailsSetupClass:
+            @classmethod
+            def setup_class(cls):
+                raise ValueError("oh no!")
+
+            def test_passes(self, t: TestContext):
+                pass
+
+        [result] = run_tests([TestFailsSetupClass])
+
+        self.assertIsNotNone(result.duration, "expected erroring class to have a duration")
+
+    def test_phase_durations_are_recorded_on_class_and_method_results(self):
+        class TestWithFixtures:
+            @classmethod
+            def setup_class(cls):
+                time.sleep(0.01)
+
+            def setup(self):
+                time.sleep(0.01)
+
+            def teardown(self):
+                pass
+
+            @classmethod
+            def teardown_class(cls):
+                pass
+
+            def test_passes(self, t: TestContext):
+                pass
+
+        [result] = run_tests([TestWithFixtures])
+
+        actual_class_phases = sorted(result.phases)
+        expected_class_phases = ["setup_class", "teardown_class"]
+        self.assertEqual(
+            expected_class_phases,
+            actual_class_phases,
+            f"expected class result to have phases {expected_class_phases}, got "
+            f"{actual_class_phases}",
+        )
+        [method_result] = result.sub_results
+        actual_method_phases = sorted(method_result.phases)
+        expected_method_phases = ["call", "setup", "teardown"]
+        self.assertEqual(
+            expected_method_phases,
+            actual_method_phases,
+            f"expected method result to have phases {expected_method_phases}, got "
+            f"{actual_method_phases}",
+        )
+        self.assertGreaterEqual(
+            method_result.phases["setup"].wall_ns,
+            10_000_000,
+            f"expected setup which sleeps for 10ms to take at least 10ms, took "
+            f"{method_result.phases['setup']}",
+        )
+
+    def test_phases_are_only_recorded_for_defined_fixtures(self):
+        class TestWithoutFixtures:
+            def test_passes(self, t: TestContext):
+                pass
+
+        [result] = run_tests([TestWithoutFixtures])
+
+        self.assertEqual({}, result.phases, f"expected no class phases, got {result.phases}")
+        [method_result] = result.sub_results
+        actual = sorted(method_result.phases)
+        self.assertEqual(["call"], actual, f"expected only a call phase, got {actual}")
+
+
+class TestClassTimeouts(unittest.TestCase):
+    longMessage = False
+
+    def test_class_timeout_applies_to_methods_without_their_own(self):
+        @timeout(0.05)
+        class TestHangs:
+            def test_hangs(self, t: TestContext):
+                time.sleep(10)
+
+            @timeout(None)
+            def test_sleeps(self, t: TestContext):
+                time.sleep(0.1)
+
+        actual = run_tests([TestHangs])
+
+        expected = [
+            ErrorResult(
+                "TestHangs",
+                sub_results=[
+                    ErrorResult(
+                        "test_hangs", error=TestTimeoutError("test_hangs timed out after 0.05s")
+                    ),
+                    PassResult("test_sleeps"),
+                ],
+            )
+        ]
+        self.assertEqual(
+            expected,
+            actual,
+            f"expected class timeout to apply only to methods without their own, got {actual}",
+        )
+
+    def test_setup_and_teardown_share_the_timeout_of_their_method(self):
+        class TestSlowSetup:
+            def setup(self):
+                time.sleep(0.15)
+
+            def test_sleeps(self, t: TestContext):
+                time.sleep(0.15)
+
+            def teardown(self):
+                time.sleep(10)
+
+        [result] = run_tests([TestSlowSetup], timeout=0.2)
+
+        expected = ErrorResult(
+            "TestSlowSetup",
+            error=TestTimeoutError("TestSlowSetup.teardown timed out after 0.2s"),
+            sub_results=[
+                ErrorResult(
+                    "test_sleeps", error=TestTimeoutError("test_sleeps timed out after 0.2s")
+                )
+            ],
+        )
+        self.assertEqual(
+            expected,
+            result,
+            f"expected the setup, call and teardown of a method to share its timeout, got {result}",
+        )
+
+    def test_class_setup_is_timed_out(self):
+        class TestHangingSetup:
+            @classmethod
+            def setup_class(cls):
+                time.sleep(10)
+
+            def test_passes(self, t: TestContext):
+                pass
+
+        [result] = run_tests([TestHangingSetup], timeout=0.05)
+
+        expected = ErrorResult(
+            "TestHangingSetup",
+            error=TestTimeoutError("TestHangingSetup.setup_class timed out after 0.05s"),
+        )
+        self.assertEqual(
+            expected,
+            result,
+            f"expected a hanging class setup to time out, got {result}",
+        )
+        self.assertIn(
+            "time.sleep(10)",
+            result.error.traceback,
+            f"expected timeout error to show the line the setup was stuck on, got:\n\n"
+            f"{result.error.traceback}",
+        )
+
+
+class TestAsyncTestMethods(unittest.TestCase):
+    longMessage = False
+
+    def test_async_test_methods_are_awaited_between_setup_and_teardown(self):
+        calls = []
+
+        class TestAsync:
+            def setup(self):
+                calls.append("setup")
+
+            async def test_awaits(self, t: TestContext):
+                await asyncio.sleep(0)
+                calls.append("test_awaits")
+                t.fail("failed after awaiting")
+
+            def teardown(self):
+                calls.append("teardown")
+
+        actual = run_tests([TestAsync])
+
+        expected = [
+            FailResult(
+                "TestAsync",
+                sub_results=[FailResult("test_awaits", messages=["failed after awaiting"])],
+            )
+        ]
+        self.assertEqual(
+            expected,
+            actual,
+            f"expected running class with async test method to return {expected}, got {actual}",
+        )
+        self.assertEqual(
+            ["setup", "test_awaits", "teardown"],
+            calls,
+            f"expected async test method to be awaited between setup and teardown, got {calls}",
+        )
@@ -0,0 +1,63 @@
+import asyncio
+import collections
+import inspect
+from typing import Iterable, Iterator, Optional
+
+from .functions import _event_loop, _is_async_test, _run_async_test_function
+from .markers import _get_timeout
+from .results import TestResult
+from .units import TestUnit, _run_test_unit
+
+
+def _run_tests_concurrently(
+    tests: Iterable[TestUnit], concurrency: int, timeout: Optional[float]
+) -> Iterator[TestResult]:
+    """
+    Run some test units, running up to the given number of async test functions concurrently on the
+    shared event loop and yielding the results in the same order as the tests were given.
+
+    Only async test functions are run concurrently with each other. Test classes and sync test
+    functions are run on their own once the async tests before them have finished, since they may
+    depend on what ran before them.
+    """
+    loop = _event_loop()
+    pending_tasks: collections.deque[asyncio.Task[TestResult]] = collections.deque()
+    try:
+        for test in tests:
+            if not _is_concurrent_test(test):
+                yield from _wait_for_tasks(loop, pending_tasks, limit=0)
+                yield _run_test_unit(test, timeout=timeout)
+                continue
+            test_timeout = _get_timeout(test, None, timeout)
+            pending_tasks.append(loop.create_task(_run_async_test_function(test, test_timeout)))
+            yield from _wait_for_tasks(loop, pending_tasks, limit=concurrency - 1)
+        yield from _wait_for_tasks(loop, pending_tasks, limit=0)
+    finally:
+        # if the run is stopped early, the tests which are still running shouldn't be left on the
+        # loop to carry on running alongside later tests
+        for task in pending_tasks:
+            task.cancel()
+        if pending_tasks:
+            loop.run_until_complete(asyncio.wait(pending_tasks))
+
+
+def _wait_for_tasks(
+    loop: asyncio.AbstractEventLoop,
+    tasks: collections.deque[asyncio.Task[TestResult]],
+    limit: int,
+) -> Iterator[TestResult]:
+    """
+    Run the event loop until at most limit of the given tasks are still running, yielding the result
+    of each task as soon as it and all of the tasks before it have finished.
+    """
+    while True:
+        while tasks and tasks[0].done():
+            yield tasks.popleft().result()
+        running = {task for task in tasks if not task.done()}
+        if len(running) <= limit:
+            return
+        loop.run_until_complete(asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED))
+
+
+def _is_concurrent_test(test: TestUnit) -> bool:
+    return inspect.isfunction(test) and _is_async_test(test)
@@ -1,3 +1,4 @@
+import threading
 from typing import Any
 
 
@@ -13,12 +14,16 @@ class TestContext:
     def __init__(self):
         self._passed = True
         self._messages = []
+        # tests can fail from threads of their own, and without the GIL appending to the messages
+        # from several threads at once isn't safe
+        self._lock = threading.Lock()
 
     def fail(self, message: str = "", *, require: bool = False):
         """Fail the current test, optionally with a given failure message."""
-        self._passed = False
-        if message:
-            self._messages.append(message)
+        with self._lock:
+            self._passed = False
+            if message:
+                self._messages.append(message)
         if require:
             raise StopTest()
 
@@ -1,3 +1,4 @@
+import threading
 import unittest
 
 from .context import TestContext
@@ -213,3 +214,27 @@ class TestAssertFalse(unittest.TestCase):
             actual,
             f"expected asserting falsey value to be False to return {expected}, got {actual}",
         )
+
+
+class TestFailFromThreads(unittest.TestCase):
+    longMessage = False
+
+    def test_failures_from_multiple_threads_are_all_recorded(self):
+        def test_fails(t: TestContext):
+            def fail_many_times():
+                for _ in range(1000):
+                    t.fail("failed in thread")
+
+            threads = [threading.Thread(target=fail_many_times) for _ in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        [result] = run_tests([test_fails])
+
+        self.assertEqual(
+            8000,
+            len(result.messages),
+            f"expected 8000 failure messages from 8 threads, got {len(result.messages)}",
+        )
@@ -0,0 +1,294 @@
+import contextlib
+import dataclasses
+import itertools
+import json
+import socket
+import threading
+import time
+from typing import Any, BinaryIO, Iterable, Iterator, Optional
+
+from .results import ErrorResult, FormattedError, TestResult, _result_from_dict, _result_to_dict
+from .units import (
+    TestMethods,
+    TestReference,
+    TestUnit,
+    _run_test_unit,
+    _test_unit_module,
+    _test_unit_name,
+)
+
+
+class WorkerDisconnectedError(FormattedError):
+    """
+    Given to the tests of a test module which every worker that was handed it disconnected from the
+    coordinator before sending back the results.
+    """
+
+    pass
+
+
+@dataclasses.dataclass
+class _WorkItem:
+    tests: list[TestUnit]
+    attempts: int = 0
+    results: Optional[list[TestResult]] = None
+
+
+class Coordinator:
+    """
+    Hands out the tests of a run to any number of workers which connect to it over TCP and run them
+    with run_worker, collecting their results.
+
+    The tests of each test module are handed out together, so that a module is only imported by one
+    worker and each test class is run as a whole. Workers are sent the module and name of each test
+    to import and run, so they must run from a copy of the project where the same modules can be
+    imported.
+
+    If a worker disconnects before sending back the results of the tests it was handed, they're
+    handed to the next worker to ask for more. Tests which have been handed out max_attempts times
+    without any results coming back error with a WorkerDisconnectedError instead, so that a test
+    which kills its worker doesn't take down every worker in turn.
+
+    Workers send a heartbeat while they run the tests that they were handed. A worker which sends
+    nothing for heartbeat_timeout seconds, like one which has hung or lost its connection without it
+    being closed, is treated as having disconnected, as is one which sends back anything other than
+    the results of the tests.
+
+    The coordinator starts listening straight away, so that its address is known before the run
+    starts. Use port 0 to listen on any free port.
+    """
+
+    def __init__(
+        self,
+        host: str = "localhost",
+        port: int = 0,
+        *,
+        max_attempts: int = 3,
+        heartbeat_timeout: float = 30.0,
+    ):
+        self._server = socket.create_server((host, port))
+        # accept is woken up regularly so that the server can be closed from another thread
+        self._server.settimeout(0.1)
+        self._max_attempts = max_attempts
+        self._heartbeat_timeout = heartbeat_timeout
+        self._condition = threading.Condition()
+        self._queue: list[_WorkItem] = []
+        self._unfinished = 0
+        self._all_queued = False
+        self._closed = False
+
+    @property
+    def address(self) -> tuple[str, int]:
+        host, port = self._server.getsockname()[:2]
+        return host, port
+
+    def _run(self, tests: Iterable[TestUnit], timeout: Optional[float]) -> Iterator[TestResult]:
+        """
+        Run some tests on the workers which connect, yielding their results in the same order as
+        the tests were given.
+        """
+        accepter = threading.Thread(
+            target=self._accept_workers, args=(timeout,), name="testipy-coordinator", daemon=True
+        )
+        accepter.start()
+        items: list[_WorkItem] = []
+        try:
+            for _, module_tests in itertools.groupby(tests, key=_test_unit_module):
+                item = _WorkItem(list(module_tests))
+                items.append(item)
+                with self._condition:
+                    self._queue.append(item)
+                    self._unfinished += 1
+                    self._condition.notify_all()
+                while items and items[0].results is not None:
+                    yield from items.pop(0).results or []
+            with self._condition:
+                self._all_queued = True
+                self._condition.notify_all()
+            for item in items:
+                with self._condition:
+                    self._condition.wait_for(lambda: item.results is not None)
+                yield from item.results or []
+        finally:
+            # if the run is stopped early, the workers are told that there's nothing left to run
+            with self._condition:
+                self._closed = True
+                self._condition.notify_all()
+            accepter.join()
+            self._server.close()
+
+    def _accept_workers(self, timeout: Optional[float]):
+        while not self._closed:
+            try:
+                connection, _ = self._server.accept()
+            except TimeoutError:
+                continue
+            connection.settimeout(self._heartbeat_timeout)
+            threading.Thread(
+                target=self._serve_worker,
+                args=(connection, timeout),
+                name="testipy-coordinator-worker",
+                daemon=True,
+            ).start()
+
+    def _serve_worker(self, connection: socket.socket, timeout: Optional[float]):
+        with connection, connection.makefile("rb") as reader:
+            while True:
+                item = self._next_item()
+                if item is None:
+                    try:
+                        _send(connection, {"type": "done"})
+                    except OSError:
+                        pass
+                    return
+                try:
+                    results = self._run_on_worker(connection, reader, item, timeout)
+                except Exception:
+                    # whatever went wrong with the worker, its tests need to be run by another
+                    self._requeue(item)
+                    return
+                self._finish(item, results)
+
+    def _run_on_worker(
+        self,
+        connection: socket.socket,
+        reader: BinaryIO,
+        item: _WorkItem,
+        timeout: Optional[float],
+    ) -> list[TestResult]:
+        _send(
+            connection,
+            {
+                "type": "work",
+                "tests": [_unit_to_dict(test) for test in item.tests],
+                "timeout": timeout,
+                "heartbeat_interval": self._heartbeat_timeout / 3,
+            },
+        )
+        while True:
+            # reading times out if the worker has sent nothing for heartbeat_timeout seconds
+            line = reader.readline()
+            if not line:
+                raise ConnectionError("worker disconnected")
+            message = json.loads(line)
+            if message["type"] == "heartbeat":
+                continue
+            if message["type"] != "results" or len(message["results"]) != len(item.tests):
+                raise ValueError(f"expected the results of {len(item.tests)} tests, got {line!r}")
+            return [_result_from_dict(data) for data in message["results"]]
+
+    def _next_item(self) -> Optional[_WorkItem]:
+        """
+        Wait for a test module to hand out, returning None once there are none left. Workers wait
+        while there are still test modules being run by other workers, since they might disconnect.
+        """
+        with self._condition:
+            self._condition.wait_for(
+                lambda: self._queue or self._closed or (self._all_queued and not self._unfinished)
+            )
+            if self._closed or not self._queue:
+                return None
+            return self._queue.pop(0)
+
+    def _requeue(self, item: _WorkItem):
+        with self._condition:
+            item.attempts += 1
+            if item.attempts < self._max_attempts:
+                self._queue.insert(0, item)
+                self._condition.notify_all()
+                return
+        message = (
+            f"workers disconnected {item.attempts} times before sending the results of the tests"
+        )
+        error = WorkerDisconnectedError(
+            message, traceback=f"{WorkerDisconnectedError.__name__}: {message}\n"
+        )
+        self._finish(item, [ErrorResult(_test_unit_name(test), error=error) for test in item.tests])
+
+    def _finish(self, item: _WorkItem, results: list[TestResult]):
+        with self._condition:
+            item.results = results
+            self._unfinished -= 1
+            self._condition.notify_all()
+
+
+def run_worker(host: str, port: int, *, connect_timeout: float = 10.0):
+    """
+    Connect to a coordinator and run the tests that it hands out until it says that there are none
+    left or disconnects. Connecting is retried until connect_timeout seconds have passed, so that
+    workers can be started before the coordinator.
+    """
+    connection = _connect(host, port, connect_timeout)
+    send_lock = threading.Lock()
+    with connection, connection.makefile("rb") as reader:
+        for line in reader:
+            message = json.loads(line)
+            if message["type"] == "done":
+                return
+            with _sending_heartbeats(connection, send_lock, message["heartbeat_interval"]):
+                results = [
+                    _result_to_dict(
+                        _run_test_unit(_unit_from_dict(data), timeout=message["timeout"])
+                    )
+                    for data in message["tests"]
+                ]
+            try:
+                with send_lock:
+                    _send(connection, {"type": "results", "results": results})
+            except OSError:
+                # the coordinator gave up on the worker or the run was stopped
+                return
+
+
+@contextlib.contextmanager
+def _sending_heartbeats(
+    connection: socket.socket, send_lock: threading.Lock, interval: float
+) -> Iterator[None]:
+    """Send heartbeats to the coordinator every interval seconds while inside the block."""
+    stopped = threading.Event()
+
+    def send_heartbeats():
+        while not stopped.wait(interval):
+            try:
+                with send_lock:
+                    _send(connection, {"type": "heartbeat"})
+            except OSError:
+                return
+
+    heartbeats = threading.Thread(target=send_heartbeats, name="testipy-heartbeat", daemon=True)
+    heartbeats.start()
+    try:
+        yield
+    finally:
+        stopped.set()
+        heartbeats.join()
+
+
+def _connect(host: str, port: int, timeout: float) -> socket.socket:
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            return socket.create_connection((host, port))
+        except ConnectionRefusedError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.1)
+
+
+def _send(connection: socket.socket, message: dict[str, Any]):
+    connection.sendall(json.dumps(message).encode() + b"\n")
+
+
+def _unit_to_dict(test: TestUnit) -> dict[str, Any]:
+    data: dict[str, Any] = {"module": _test_unit_module(test), "name": _test_unit_name(test)}
+    if isinstance(test, TestMethods):
+        data["method_names"] = list(test.method_names)
+    return data
+
+
+def _unit_from_dict(data: dict[str, Any]) -> TestUnit:
+    # the worker only needs the module and name to import the test
+    reference = TestReference("", data["module"], data["name"], 0)
+    if "method_names" in data:
+        return TestMethods(reference, tuple(data["method_names"]))
+    return reference
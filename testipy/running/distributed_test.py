@@ -0,0 +1,155 @@
+import socket
+import threading
+import unittest
+
+from .distributed import Coordinator, WorkerDisconnectedError, run_worker
+from .functions import TestTimeoutError
+from .results import ErrorResult, PassResult
+from .running import run_tests
+from test_data.e2e.classes_test import TestAdd
+from test_data.e2e.exceptions_test import test_exceptions_error_the_test
+from test_data.e2e.failures_test import test_multiple_failures, test_require_failure
+from test_data.e2e.passing_test import test_passes
+from test_data.processes.hangs import test_hangs
+
+
+class TestRunningOnWorkers(unittest.TestCase):
+    longMessage = False
+
+    def test_results_are_same_as_serial_run(self):
+        tests = [
+            test_multiple_failures,
+            test_require_failure,
+            TestAdd,
+            test_exceptions_error_the_test,
+            test_passes,
+        ]
+        coordinator = Coordinator()
+        self._start_workers(coordinator, run_worker, run_worker)
+
+        actual = run_tests(tests, coordinator=coordinator)
+
+        expected = run_tests(tests)
+        self.assertEqual(
+            expected,
+            actual,
+            f"expected running {tests} on 2 workers to return {expected}, got {actual}",
+        )
+
+    def test_tests_of_disconnected_workers_are_run_by_other_workers(self):
+        coordinator = Coordinator()
+        disconnected = self._start_workers(coordinator, _disconnect_once)[0]
+
+        def run_worker_once_disconnected(host: str, port: int):
+            disconnected.join()
+            run_worker(host, port)
+
+        self._start_workers(coordinator, run_worker_once_disconnected)
+
+        actual = run_tests([test_passes], coordinator=coordinator)
+
+        expected = [PassResult("test_passes")]
+        self.assertEqual(
+            expected,
+            actual,
+            f"expected the tests of a disconnected worker to be run by another, got {actual}",
+        )
+
+    def test_tests_error_once_handed_out_max_attempts_times(self):
+        coordinator = Coordinator(max_attempts=2)
+        self._start_workers(coordinator, _disconnect_once, _disconnect_once)
+
+        actual = run_tests([test_passes], coordinator=coordinator)
+
+        message = "workers disconnected 2 times before sending the results of the tests"
+        expected = [ErrorResult("test_passes", error=WorkerDisconnectedError(message))]
+        self.assertEqual(
+            expected,
+            actual,
+            f"expected tests which every worker disconnected on to error, got {actual}",
+        )
+
+    def test_tests_of_workers_which_stop_replying_are_run_by_other_workers(self):
+        coordinator = Coordinator(heartbeat_timeout=0.2)
+        hung = threading.Event()
+
+        def hang(host: str, port: int):
+            with socket.create_connection((host, port)) as connection:
+                with connection.makefile("rb") as reader:
+                    reader.readline()
+                    hung.set()
+                    # the coordinator closes the connection once it gives up on the worker
+                    reader.readline()
+
+        def run_worker_once_hung(host: str, port: int):
+            hung.wait()
+            run_worker(host, port)
+
+        self._start_workers(coordinator, hang, run_worker_once_hung)
+
+        actual = run_tests([test_passes], coordinator=coordinator)
+
+        expected = [PassResult("test_passes")]
+        self.assertEqual(
+            expected,
+            actual,
+            f"expected the tests of a worker which hung to be run by another, got {actual}",
+        )
+
+    def test_workers_running_slow_tests_send_heartbeats(self):
+        coordinator = Coordinator(max_attempts=1, heartbeat_timeout=0.2)
+        self._start_workers(coordinator, run_worker)
+
+        actual = run_tests([test_hangs], coordinator=coordinator, timeout=0.6)
+
+        expected = [
+            ErrorResult("test_hangs", error=TestTimeoutError("test_hangs timed out after 0.6s"))
+        ]
+        self.assertEqual(
+            expected,
+            actual,
+            f"expected a test slower than the heartbeat timeout to time out on the worker, got "
+            f"{actual}",
+        )
+
+    def test_tests_of_workers_which_reply_with_nonsense_are_run_by_other_workers(self):
+        coordinator = Coordinator()
+        replied = threading.Event()
+
+        def reply_with_nonsense(host: str, port: int):
+            with socket.create_connection((host, port)) as connection:
+                with connection.makefile("rb") as reader:
+                    reader.readline()
+                    connection.sendall(b'{"type": "results", "results": [{}]}\n')
+                    replied.set()
+                    reader.readline()
+
+        def run_worker_once_replied(host: str, port: int):
+            replied.wait()
+            run_worker(host, port)
+
+        self._start_workers(coordinator, reply_with_nonsense, run_worker_once_replied)
+
+        actual = run_tests([test_passes], coordinator=coordinator)
+
+        expected = [PassResult("test_passes")]
+        self.assertEqual(
+            expected,
+            actual,
+            f"expected the tests of a worker which replied with nonsense to be rerun, got {actual}",
+        )
+
+    def _start_workers(self, coordinator: Coordinator, *workers) -> list[threading.Thread]:
+        host, port = coordinator.address
+        threads = [threading.Thread(target=worker, args=(host, port)) for worker in workers]
+        for thread in threads:
+            thread.start()
+            self.addCleanup(thread.join)
+        return threads
+
+
+def _disconnect_once(host: str, port: int):
+    """Connect to a coordinator and disconnect as soon as it hands out some tests."""
+    with socket.create_connection((host, port)) as connection:
+        with connection.makefile("rb") as reader:
+            reader.readline()
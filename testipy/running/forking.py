@@ -0,0 +1,142 @@
+import collections
+import dataclasses
+import gc
+import importlib
+import itertools
+import os
+import pickle
+import selectors
+import signal
+import sys
+import traceback
+from typing import Iterable, Iterator, Optional, Sequence
+
+from .results import ErrorResult, FormattedError, TestResult, _make_picklable
+from .units import TestUnit, _run_test_unit, _test_unit_module, _test_unit_name
+
+
+class ForkingNotSupportedError(Exception):
+    """Raised when tests are run in forked processes on a platform without os.fork."""
+
+    pass
+
+
+class ForkedProcessError(FormattedError):
+    """Given to the tests of a forked process which exited without sending back their results."""
+
+    pass
+
+
+@dataclasses.dataclass
+class _Fork:
+    pid: int
+    fd: int
+    tests: list[TestUnit]
+    chunks: list[bytes] = dataclasses.field(default_factory=list)
+    results: Optional[list[TestResult]] = None
+
+
+def _run_tests_in_forks(
+    tests: Iterable[TestUnit],
+    max_forks: int,
+    timeout: Optional[float],
+    preload: Sequence[str] = (),
+) -> Iterator[TestResult]:
+    """
+    Run the tests of each test module in a process of its own which is forked from this one, so
+    that the modules don't share any global state, running up to the given number of forked
+    processes at once. The results are yielded in the same order as the tests were given.
+
+    The given modules are imported before any processes are forked and every object that exists
+    then is frozen with gc.freeze, so that the forked processes share the modules' memory with this
+    process instead of importing them again or copying the pages that the garbage collector would
+    otherwise write to.
+
+    All of the tests are taken before any processes are forked, so that discovery has finished
+    with its threads by then. Forking while another thread is running could leave a forked process
+    deadlocked on a lock which that thread was holding.
+    """
+    if not hasattr(os, "fork"):
+        raise ForkingNotSupportedError("running tests in forked processes needs os.fork")
+    tests = list(tests)
+    for module in preload:
+        importlib.import_module(module)
+    gc.collect()
+    gc.freeze()
+    selector = selectors.DefaultSelector()
+    pending_forks: collections.deque[_Fork] = collections.deque()
+    try:
+        for _, module_tests in itertools.groupby(tests, key=_test_unit_module):
+            while len(selector.get_map()) >= max_forks:
+                _read_results(selector)
+            fork = _fork(list(module_tests), timeout)
+            selector.register(fork.fd, selectors.EVENT_READ, fork)
+            pending_forks.append(fork)
+            while pending_forks and pending_forks[0].results is not None:
+                yield from pending_forks.popleft().results or []
+        while pending_forks:
+            while pending_forks[0].results is None:
+                _read_results(selector)
+            yield from pending_forks.popleft().results or []
+    finally:
+        # if the run is stopped early, the processes which are still running are killed
+        for key in list(selector.get_map().values()):
+            fork = key.data
+            os.kill(fork.pid, signal.SIGKILL)
+            _finish(selector, fork)
+        selector.close()
+        gc.unfreeze()
+
+
+def _fork(tests: list[TestUnit], timeout: Optional[float]) -> _Fork:
+    read_fd, write_fd = os.pipe()
+    # anything left in the buffers would be written by both processes
+    sys.stdout.flush()
+    sys.stderr.flush()
+    pid = os.fork()
+    if pid == 0:
+        os.close(read_fd)
+        _run_tests_in_child(tests, timeout, write_fd)
+    os.close(write_fd)
+    return _Fork(pid, read_fd, tests)
+
+
+def _run_tests_in_child(tests: list[TestUnit], timeout: Optional[float], fd: int):
+    """Run some tests in a forked process, writing their pickled results to fd and exiting."""
+    status = 0
+    try:
+        results = [_make_picklable(_run_test_unit(test, timeout=timeout)) for test in tests]
+        with os.fdopen(fd, "wb") as f:
+            f.write(pickle.dumps(results))
+    except BaseException:
+        traceback.print_exc()
+        status = 1
+    finally:
+        sys.stdout.flush()
+        sys.stderr.flush()
+        # the child mustn't run any of the parent's cleanup, like atexit handlers
+        os._exit(status)
+
+
+def _read_results(selector: selectors.BaseSelector):
+    """Wait for any of the forked processes to send some of their results and read them."""
+    for key, _ in selector.select():
+        fork = key.data
+        chunk = os.read(fork.fd, 1 << 16)
+        if chunk:
+            fork.chunks.append(chunk)
+        else:
+            _finish(selector, fork)
+
+
+def _finish(selector: selectors.BaseSelector, fork: _Fork):
+    selector.unregister(fork.fd)
+    os.close(fork.fd)
+    _, status = os.waitpid(fork.pid, 0)
+    exit_code = os.waitstatus_to_exitcode(status)
+    if exit_code == 0 and fork.chunks:
+        fork.results = pickle.loads(b"".join(fork.chunks))
+        return
+    message = f"forked process running the tests exited with {exit_code} before sending results"
+    error = ForkedProcessError(message, traceback=f"{ForkedProcessError.__name__}: {message}\n")
+    fork.results = [ErrorResult(_test_unit_name(test), error=error) for test in fork.tests]
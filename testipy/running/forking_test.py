@@ -0,0 +1,131 @@
+import gc
+import os
+import sys
+import time
+import unittest
+from unittest import mock
+
+from .forking import ForkedProcessError
+from .results import ErrorResult, FailResult, NotRunResult, PassResult
+from .running import run_tests
+from test_data.e2e.classes_test import TestAdd
+from test_data.e2e.exceptions_test import test_exceptions_error_the_test
+from test_data.e2e.failures_test import test_multiple_failures, test_require_failure
+from test_data.e2e.passing_test import test_passes
+from test_data.forking.exits_test import test_exits
+from test_data.forking.module_state_test import test_increments_counter, test_objects_are_frozen
+from test_data.processes.hangs import test_hangs
+
+
+class TestRunningInForks(unittest.TestCase):
+    longMessage = False
+
+    def test_results_are_same_as_serial_run(self):
+        tests = [
+            test_multiple_failures,
+            test_require_failure,
+            TestAdd,
+            test_exceptions_error_the_test,
+            test_passes,
+        ]
+
+        actual = run_tests(tests, forks=2)
+
+        expected = run_tests(tests)
+        self.assertEqual(
+            expected,
+            actual,
+            f"expected running {tests} in 2 forks to return {expected}, got {actual}",
+        )
+
+    def test_tests_are_all_taken_before_forking(self):
+        taken_all_tests = []
+
+        def tests():
+            yield test_passes
+            yield test_increments_counter
+            taken_all_tests.append(True)
+
+        forked_after_taking_all_tests = []
+        fork = os.fork
+
+        def record_fork():
+            forked_after_taking_all_tests.append(bool(taken_all_tests))
+            return fork()
+
+        with mock.patch("os.fork", side_effect=record_fork):
+            run_tests(tests(), forks=2)
+
+        expected = [True, True]
+        self.assertEqual(
+            expected,
+            forked_after_taking_all_tests,
+            f"expected each fork to happen after discovery had finished, got "
+            f"{forked_after_taking_all_tests}",
+        )
+
+    def test_each_module_is_run_with_its_own_global_state(self):
+        tests = [test_increments_counter, test_passes, test_increments_counter]
+
+        actual = run_tests(tests, forks=1)
+
+        expected = [
+            PassResult("test_increments_counter"),
+            PassResult("test_passes"),
+            PassResult("test_increments_counter"),
+        ]
+        self.assertEqual(
+            expected,
+            actual,
+            f"expected each run of a module to start with fresh global state, got {actual}",
+        )
+
+    def test_preloaded_modules_are_imported_and_objects_frozen_before_forking(self):
+        module_name = "test_data.e2e.numbers"
+        sys.modules.pop(module_name, None)
+
+        actual = run_tests([test_objects_are_frozen], forks=1, preload=[module_name])
+
+        expected = [PassResult("test_objects_are_frozen")]
+        self.assertEqual(
+            expected,
+            actual,
+            f"expected objects to be frozen in the forked process, got {actual}",
+        )
+        self.assertIn(module_name, sys.modules, f"expected {module_name} to be preloaded")
+        self.assertEqual(
+            0, gc.get_freeze_count(), "expected objects to be unfrozen once the tests have run"
+        )
+
+    def test_tests_error_when_forked_process_exits_without_results(self):
+        actual = run_tests([test_exits, test_passes], forks=1)
+
+        message = "forked process running the tests exited with 3 before sending results"
+        expected = [
+            ErrorResult("test_exits", error=ForkedProcessError(message)),
+            PassResult("test_passes"),
+        ]
+        self.assertEqual(
+            expected,
+            actual,
+            f"expected tests of exited process to error with {message}, got {actual}",
+        )
+
+    def test_running_forks_are_killed_when_stopped_early(self):
+        tests = [test_require_failure, test_hangs, test_passes]
+
+        start = time.perf_counter()
+        actual = run_tests(tests, forks=3, maxfail=1)
+        elapsed = time.perf_counter() - start
+
+        expected = [
+            FailResult("test_require_failure", messages=["requiring a failure stops the test"]),
+            NotRunResult("test_hangs"),
+            NotRunResult("test_passes"),
+        ]
+        self.assertEqual(
+            expected,
+            actual,
+            f"expected run in 3 forks with maxfail=1 to return {expected}, got {actual}",
+        )
+        self.assertLess(elapsed, 30, f"expected hanging fork to be killed, run took {elapsed:.1f}s")
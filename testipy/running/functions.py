@@ -1,20 +1,275 @@
-from typing import Callable
+import asyncio
+import ctypes
+import inspect
+import os
+import signal
+import sys
+import threading
+import time
+import traceback as tb
+from types import FrameType
+from typing import Any, Awaitable, Callable, Optional, TypeVar, Union
 
 from .context import TestContext, StopTest
-from .results import PassResult, FailResult, ErrorResult, TestResult
+from .results import Duration, PassResult, FailResult, ErrorResult, FormattedError, TestResult
+from .timing import Stopwatch
 
 
-TestFunction = Callable[[TestContext], None]
+TestFunction = Callable[[TestContext], Union[None, Awaitable[None]]]
 
+T = TypeVar("T")
 
-def _run_test_function(f: TestFunction) -> TestResult:
+
+class TestTimeoutError(FormattedError):
+    """Error that a test is given when it runs for longer than its timeout."""
+
+    pass
+
+
+def _run_test_function(
+    f: TestFunction, timeout: Optional[float] = None, *, start: Optional[float] = None
+) -> TestResult:
+    """
+    Run a test function, timing it out if it's still running timeout seconds after start (from
+    time.monotonic), or after it started if no start is given.
+    """
+    if _is_async_test(f):
+        return _event_loop().run_until_complete(_run_async_test_function(f, timeout, start=start))
+    stopwatch = Stopwatch()
+    t = TestContext()
+    try:
+        error = _call_with_timeout(lambda: _call_test(f, t), f.__name__, timeout, start=start)
+    except TestTimeoutError as e:
+        error = e
+    return _result(f, t, error, stopwatch.elapsed())
+
+
+async def _run_async_test_function(
+    f: TestFunction, timeout: Optional[float], *, start: Optional[float] = None
+) -> TestResult:
+    """
+    Run an async test function on the running event loop. Other tasks on the loop, including other
+    tests, carry on running while the test is awaiting, so its CPU time includes theirs.
+    """
+    stopwatch = Stopwatch()
     t = TestContext()
+    error = await _await_test(f, t, timeout, start)
+    return _result(f, t, error, stopwatch.elapsed())
+
+
+def _is_async_test(f: TestFunction) -> bool:
+    return inspect.iscoroutinefunction(f)
+
+
+def _result(
+    f: TestFunction, t: TestContext, error: Optional[Exception], duration: Duration
+) -> TestResult:
+    if error:
+        return ErrorResult(f.__name__, error=error, duration=duration)
+    if not t._passed:
+        return FailResult(f.__name__, messages=t._messages, duration=duration)
+    return PassResult(f.__name__, duration=duration)
+
+
+def _call_test(f: TestFunction, t: TestContext) -> Optional[Exception]:
     try:
         f(t)
     except StopTest:
         pass
     except Exception as e:
-        return ErrorResult(f.__name__, error=e)
-    if not t._passed:
-        return FailResult(f.__name__, messages=t._messages)
-    return PassResult(f.__name__)
+        return e
+    return None
+
+
+class _TimedOut(BaseException):
+    """
+    Raised by the alarm in a call which has run for longer than its timeout. It isn't an Exception
+    so that the call doesn't catch it along with its own errors.
+    """
+
+    def __init__(self, frames: list[tuple[FrameType, int]]):
+        self.frames = frames
+
+
+def _call_with_timeout(
+    call: Callable[[], T], name: str, timeout: Optional[float], *, start: Optional[float] = None
+) -> T:
+    """
+    Make a call which is part of running a test, raising a TestTimeoutError with a dump of where it
+    was stuck if it's still running timeout seconds after start (from time.monotonic), or after it
+    was made if no start is given. Calls given the same start share the timeout between them.
+
+    On the main thread, the call is made on the same thread and interrupted by a SIGALRM timer, so
+    that it can do things which only work on the main thread, like installing signal handlers.
+    Elsewhere, or if the timer is already in use, the call is made on a separate thread which is
+    watched by the current one, which means that tests run with a timeout in threads can't install
+    signal handlers.
+    """
+    if timeout is None:
+        return _call_timed(call)
+    remaining = timeout if start is None else timeout - (time.monotonic() - start)
+    if remaining <= 0:
+        raise _timeout_error(name, timeout, [])
+    if _can_use_alarm():
+        return _call_with_alarm(call, name, timeout, remaining)
+    return _call_on_watched_thread(call, name, timeout, remaining)
+
+
+def _call_timed(call: Callable[[], T]) -> T:
+    # the stack dumped when a call times out starts from the frame that this calls
+    return call()
+
+
+def _can_use_alarm() -> bool:
+    return (
+        hasattr(signal, "setitimer")
+        and threading.current_thread() is threading.main_thread()
+        # the timer is only used if nothing else, like an outer timeout, is using it
+        and signal.getitimer(signal.ITIMER_REAL) == (0.0, 0.0)
+    )
+
+
+def _call_with_alarm(call: Callable[[], T], name: str, timeout: float, remaining: float) -> T:
+    running = True
+
+    def on_alarm(signum: int, frame: Optional[FrameType]):
+        # the alarm can go off just after the call has finished, which doesn't count
+        if running:
+            raise _TimedOut(_frames_from_call(frame))
+
+    try:
+        previous_handler = signal.signal(signal.SIGALRM, on_alarm)
+    except ValueError:
+        # signal handlers can only be installed by the main interpreter
+        return _call_on_watched_thread(call, name, timeout, remaining)
+    signal.setitimer(signal.ITIMER_REAL, remaining)
+    try:
+        return _call_timed(call)
+    except _TimedOut as e:
+        raise _timeout_error(name, timeout, e.frames) from None
+    finally:
+        running = False
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous_handler)
+
+
+def _call_on_watched_thread(
+    call: Callable[[], T], name: str, timeout: float, remaining: float
+) -> T:
+    """
+    Make a call on a separate thread which is watched by the current one.
+
+    A thread which is stuck can't be stopped, so it's left running as a daemon thread after
+    raising an exception in it, which stops it as soon as it next runs any Python code.
+    """
+    outcomes: list[tuple[bool, Any]] = []
+
+    def make_call():
+        try:
+            outcomes.append((True, _call_timed(call)))
+        except BaseException as e:
+            outcomes.append((False, e))
+
+    thread = threading.Thread(target=make_call, name=f"testipy: {name}", daemon=True)
+    thread.start()
+    thread.join(remaining)
+    if not thread.is_alive():
+        returned, value = outcomes[0]
+        if returned:
+            return value
+        raise value
+    frames = _frames_from_call(
+        sys._current_frames().get(thread.ident) if thread.ident is not None else None
+    )
+    if thread.ident is not None:
+        ctypes.pythonapi.PyThreadState_SetAsyncExc(
+            ctypes.c_ulong(thread.ident), ctypes.py_object(StopTest)
+        )
+    raise _timeout_error(name, timeout, frames)
+
+
+def _frames_from_call(frame: Optional[FrameType]) -> list[tuple[FrameType, int]]:
+    """
+    Return the (frame, line) pairs of the stack of a timed call, outermost first. Only the frames
+    from the test function or the setup or teardown onwards are interesting, not the ones which
+    called it.
+    """
+    frames: list[tuple[FrameType, int]] = []
+    while frame and frame.f_code not in (_call_timed.__code__, _call_test.__code__):
+        frames.append((frame, frame.f_lineno))
+        frame = frame.f_back
+    frames.reverse()
+    return frames
+
+
+async def _await_test(
+    f: TestFunction, t: TestContext, timeout: Optional[float], start: Optional[float] = None
+) -> Optional[Exception]:
+    """
+    Await an async test, cancelling it and returning a TestTimeoutError with a dump of where it was
+    awaiting if it doesn't finish within the timeout, counted from start if it's given.
+    """
+    remaining = timeout
+    if timeout is not None and start is not None:
+        remaining = max(timeout - (time.monotonic() - start), 0)
+    task = asyncio.ensure_future(_call_async_test(f, t))
+    done, _ = await asyncio.wait({task}, timeout=remaining)
+    if done:
+        return task.result()
+    # the frames of the coroutines that the test is awaiting, skipping _call_async_test's
+    frames = _coroutine_frames(task.get_coro())[1:]
+    task.cancel()
+    await asyncio.wait({task})
+    assert timeout is not None
+    return _timeout_error(f.__name__, timeout, frames)
+
+
+async def _call_async_test(f: TestFunction, t: TestContext) -> Optional[Exception]:
+    try:
+        await f(t)  # type: ignore[misc]
+    except StopTest:
+        pass
+    except Exception as e:
+        return e
+    return None
+
+
+def _coroutine_frames(coroutine: Any) -> list[tuple[FrameType, int]]:
+    frames = []
+    while coroutine is not None:
+        frame = getattr(coroutine, "cr_frame", None) or getattr(coroutine, "gi_frame", None)
+        if frame is None:
+            break
+        frames.append((frame, frame.f_lineno))
+        coroutine = getattr(coroutine, "cr_await", None) or getattr(coroutine, "gi_yieldfrom", None)
+    return frames
+
+
+def _timeout_error(
+    name: str, timeout: float, frames: list[tuple[FrameType, int]]
+) -> TestTimeoutError:
+    """
+    Return the error for a test, or the setup or teardown, which timed out, showing the stack of
+    (frame, line) pairs that it was stuck at. The lines are taken at the time so that they aren't
+    moved on by stopping the test.
+    """
+    message = f"{name} timed out after {timeout:g}s"
+    stack = tb.StackSummary.extract(iter(frames))
+    traceback = "Stack when timed out (most recent call last):\n" + "".join(stack.format())
+    return TestTimeoutError(
+        message, traceback=f"{traceback}{TestTimeoutError.__name__}: {message}\n"
+    )
+
+
+# async tests are run on an event loop which is shared by every test run by the same thread, rather
+# than one per test, so that they can share resources tied to the loop. Loops don't survive being
+# forked, so a worker process doesn't use the loop it inherits from its parent.
+_event_loops = threading.local()
+
+
+def _event_loop() -> asyncio.AbstractEventLoop:
+    loop, pid = getattr(_event_loops, "loop", None), getattr(_event_loops, "pid", None)
+    if loop is None or pid != os.getpid():
+        loop = asyncio.new_event_loop()
+        _event_loops.loop, _event_loops.pid = loop, os.getpid()
+    return loop
@@ -1,7 +1,12 @@
+import asyncio
+import signal
+import time
 import unittest
 
 from .results import ErrorResult, FailResult, PassResult
 from .context import TestContext
+from .functions import TestTimeoutError
+from .markers import timeout
 from .running import run_tests
 
 
@@ -152,3 +157,288 @@ class TestFunctionBasedTests(unittest.TestCase):
             f"expected running mix of passing / failing / erroring tests to return {expected}, "
             f"got {actual}",
         )
+
+
+class TestFunctionTiming(unittest.TestCase):
+    longMessage = False
+
+    def test_wall_time_is_recorded_on_result(self):
+        def test_sleeps(t: TestContext):
+            time.sleep(0.01)
+
+        [result] = run_tests([test_sleeps])
+
+        self.assertGreaterEqual(
+            result.duration.wall_ns,
+            10_000_000,
+            f"expected test which sleeps for 10ms to take at least 10ms, took {result.duration}",
+        )
+
+    def test_cpu_time_is_recorded_on_result(self):
+        def test_sleeps(t: TestContext):
+            time.sleep(0.01)
+
+        [result] = run_tests([test_sleeps])
+
+        self.assertLess(
+            result.duration.cpu_ns,
+            result.duration.wall_ns,
+            f"expected test which sleeps to use less CPU time than wall time, took "
+            f"{result.duration}",
+        )
+
+    def test_duration_is_recorded_on_errored_result(self):
+        def test_errors(t: TestContext):
+            raise ValueError("oh no!")
+
+        [result] = run_tests([test_errors])
+
+        self.assertIsNotNone(result.duration, "expected erroring test to have a duration")
+
+
+class TestFunctionTimeouts(unittest.TestCase):
+    longMessage = False
+
+    def test_result_is_error_when_test_runs_for_longer_than_timeout(self):
+        def test_hangs(t: TestContext):
+            time.sleep(10)
+
+        [result] = run_tests([test_hangs], timeout=0.05)
+
+        expected = ErrorResult(
+            "test_hangs", error=TestTimeoutError("test_hangs timed out after 0.05s")
+        )
+        self.assertEqual(
+            expected,
+            result,
+            f"expected running a hanging test with a timeout to return {expected}, got {result}",
+        )
+
+    def test_timeout_error_shows_where_test_was_stuck(self):
+        def test_hangs(t: TestContext):
+            time.sleep(10)
+
+        [result] = run_tests([test_hangs], timeout=0.05)
+
+        self.assertIn(
+            "time.sleep(10)",
+            result.error.traceback,
+            f"expected timeout error to show the line the test was stuck on, got:\n\n"
+            f"{result.error.traceback}",
+        )
+
+    def test_tests_after_timed_out_test_are_run(self):
+        def test_hangs(t: TestContext):
+            time.sleep(10)
+
+        def test_passes(t: TestContext):
+            pass
+
+        actual = run_tests([test_hangs, test_passes], timeout=0.05)
+
+        expected = [
+            ErrorResult("test_hangs", error=TestTimeoutError("test_hangs timed out after 0.05s")),
+            PassResult("test_passes"),
+        ]
+        self.assertEqual(
+            expected,
+            actual,
+            f"expected tests after a timed out test to be run, got {actual}",
+        )
+
+    def test_tests_can_install_signal_handlers_when_run_with_timeout(self):
+        def test_installs_signal_handler(t: TestContext):
+            previous_handler = signal.signal(signal.SIGUSR1, lambda signum, frame: None)
+            signal.signal(signal.SIGUSR1, previous_handler)
+
+        actual = run_tests([test_installs_signal_handler], timeout=1)
+
+        expected = [PassResult("test_installs_signal_handler")]
+        self.assertEqual(
+            expected,
+            actual,
+            f"expected a test run with a timeout to run on the main thread, got {actual}",
+        )
+
+    def test_tests_run_in_threads_are_timed_out(self):
+        def test_hangs(t: TestContext):
+            time.sleep(10)
+
+        def test_passes(t: TestContext):
+            pass
+
+        actual = run_tests([test_hangs, test_passes], threads=2, timeout=0.05)
+
+        expected = [
+            ErrorResult("test_hangs", error=TestTimeoutError("test_hangs timed out after 0.05s")),
+            PassResult("test_passes"),
+        ]
+        self.assertEqual(
+            expected,
+            actual,
+            f"expected a hanging test run in a thread to time out, got {actual}",
+        )
+
+    def test_timeout_decorator_overrides_timeout(self):
+        @timeout(None)
+        def test_sleeps(t: TestContext):
+            time.sleep(0.1)
+
+        actual = run_tests([test_sleeps], timeout=0.01)
+
+        expected = [PassResult("test_sleeps")]
+        self.assertEqual(
+            expected,
+            actual,
+            f"expected test decorated with timeout(None) to not time out, got {actual}",
+        )
+
+
+class TestAsyncFunctionBasedTests(unittest.TestCase):
+    longMessage = False
+
+    def test_async_test_is_awaited(self):
+        async def test_fails(t: TestContext):
+            await asyncio.sleep(0)
+            t.fail("failed after awaiting")
+
+        actual = run_tests([test_fails])
+
+        expected = [FailResult("test_fails", messages=["failed after awaiting"])]
+        self.assertEqual(
+            expected,
+            actual,
+            f"expected running an async failing test to return {expected}, got {actual}",
+        )
+
+    def test_result_is_error_when_exception_raised_inside_async_test(self):
+        async def test_errors(t: TestContext):
+            await asyncio.sleep(0)
+            raise ValueError("oh no!")
+
+        actual = run_tests([test_errors])
+
+        expected = [ErrorResult("test_errors", error=ValueError("oh no!"))]
+        self.assertEqual(
+            expected,
+            actual,
+            f"expected running an async erroring test to return {expected}, got {actual}",
+        )
+
+    def test_async_tests_share_event_loop(self):
+        loops = []
+
+        async def test_first(t: TestContext):
+            loops.append(asyncio.get_running_loop())
+
+        async def test_second(t: TestContext):
+            loops.append(asyncio.get_running_loop())
+
+        run_tests([test_first, test_second])
+
+        self.assertIs(loops[0], loops[1], f"expected async tests to share a loop, got {loops}")
+
+    def test_async_test_which_runs_for_longer_than_timeout_is_cancelled(self):
+        cancelled = []
+
+        async def test_hangs(t: TestContext):
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append(True)
+                raise
+
+        [result] = run_tests([test_hangs], timeout=0.05)
+
+        expected = ErrorResult(
+            "test_hangs", error=TestTimeoutError("test_hangs timed out after 0.05s")
+        )
+        self.assertEqual(
+            expected,
+            result,
+            f"expected running a hanging async test with a timeout to return {expected}, "
+            f"got {result}",
+        )
+        self.assertEqual([True], cancelled, "expected timed out async test to be cancelled")
+        self.assertIn(
+            "await asyncio.sleep(10)",
+            result.error.traceback,
+            f"expected timeout error to show the line the test was awaiting on, got:\n\n"
+            f"{result.error.traceback}",
+        )
+
+
+class TestAsyncConcurrency(unittest.TestCase):
+    longMessage = False
+
+    def test_async_tests_are_run_concurrently_up_to_limit(self):
+        running = 0
+        max_running = 0
+
+        async def test_sleeps(t: TestContext):
+            nonlocal running, max_running
+            running += 1
+            max_running = max(max_running, running)
+            await asyncio.sleep(0.05)
+            running -= 1
+
+        start = time.perf_counter()
+        actual = run_tests([test_sleeps] * 6, async_concurrency=3)
+        elapsed = time.perf_counter() - start
+
+        expected = [PassResult("test_sleeps")] * 6
+        self.assertEqual(
+            expected, actual, f"expected concurrent async tests to return {expected}, got {actual}"
+        )
+        self.assertEqual(
+            3, max_running, f"expected 3 async tests to run at once, got {max_running}"
+        )
+        self.assertLess(
+            elapsed,
+            0.25,
+            f"expected 6 async tests of 50ms run 3 at a time to take ~0.1s, took {elapsed}",
+        )
+
+    def test_results_are_in_order_of_tests(self):
+        async def test_slow(t: TestContext):
+            await asyncio.sleep(0.05)
+            t.fail()
+
+        async def test_fast(t: TestContext):
+            pass
+
+        def test_sync(t: TestContext):
+            pass
+
+        actual = run_tests([test_slow, test_fast, test_sync, test_fast], async_concurrency=2)
+
+        expected = [
+            FailResult("test_slow"),
+            PassResult("test_fast"),
+            PassResult("test_sync"),
+            PassResult("test_fast"),
+        ]
+        self.assertEqual(
+            expected,
+            actual,
+            f"expected concurrent results to be in order of tests {expected}, got {actual}",
+        )
+
+    def test_sync_test_is_run_after_async_tests_before_it_finish(self):
+        finished = []
+
+        async def test_slow(t: TestContext):
+            await asyncio.sleep(0.05)
+            finished.append("test_slow")
+
+        def test_sync(t: TestContext):
+            t.assert_equal(["test_slow"], finished)
+
+        actual = run_tests([test_slow, test_sync], async_concurrency=2)
+
+        expected = [PassResult("test_slow"), PassResult("test_sync")]
+        self.assertEqual(
+            expected,
+            actual,
+            f"expected sync test to run after async test before it, got {actual}",
+        )
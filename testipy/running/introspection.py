@@ -0,0 +1,100 @@
+import dataclasses
+import inspect
+import threading
+import weakref
+from typing import Any, Callable, get_type_hints
+
+from .context import TestContext
+
+
+@dataclasses.dataclass(frozen=True)
+class _FunctionInfo:
+    parameter_count: int
+    last_parameter_is_test_context: bool
+    first_line: int
+
+
+# Keyed by function rather than by code object since decorated functions can share their wrapper's
+# code object while having different signatures and definition lines.
+_function_infos: "weakref.WeakKeyDictionary[Callable, _FunctionInfo]" = weakref.WeakKeyDictionary()
+_function_infos_lock = threading.Lock()
+
+
+def _function_info(f: Callable) -> _FunctionInfo:
+    """
+    Return the signature and definition line of a function, which are only worked out the first
+    time that they're asked for since inspect.signature is relatively slow and discovery and
+    running both need them.
+    """
+    with _function_infos_lock:
+        info = _function_infos.get(f)
+    if info is not None:
+        return info
+    parameters = list(inspect.signature(f).parameters.values())
+    info = _FunctionInfo(
+        parameter_count=len(parameters),
+        last_parameter_is_test_context=bool(parameters) and _is_test_context(f, parameters[-1]),
+        first_line=inspect.unwrap(f).__code__.co_firstlineno,
+    )
+    with _function_infos_lock:
+        _function_infos[f] = info
+    return info
+
+
+def _is_test_context(f: Callable, parameter: inspect.Parameter) -> bool:
+    """
+    Return whether a parameter of a function is annotated as a TestContext. String annotations,
+    like the ones that from __future__ import annotations makes, are resolved if they can be and
+    are otherwise recognised by their name like static collection recognises them.
+    """
+    annotation = parameter.annotation
+    if not isinstance(annotation, str):
+        return annotation == TestContext
+    try:
+        return get_type_hints(f).get(parameter.name) == TestContext
+    except Exception:
+        return annotation.split(".")[-1] == "TestContext"
+
+
+def _is_test_function(obj: Any) -> bool:
+    if not inspect.isfunction(obj):
+        return False
+    if not obj.__name__.startswith("test_"):
+        return False
+    info = _function_info(obj)
+    return info.parameter_count == 1 and info.last_parameter_is_test_context
+
+
+def _is_test_method(obj: Any) -> bool:
+    if not inspect.isfunction(obj):
+        return False
+    if not obj.__name__.startswith("test_"):
+        return False
+    info = _function_info(obj)
+    # should have self and TestContext parameters
+    return info.parameter_count == 2 and info.last_parameter_is_test_context
+
+
+def _definition_line(obj: Any) -> int:
+    """
+    Return the line that a function or class was defined at, counting from 1.
+
+    A class's definition line is only recorded by Python 3.13 onwards, so on earlier versions the
+    line of the first function defined in its body is used instead, which orders it the same
+    relative to other top level definitions. Only classes without any functions of their own fall
+    back to inspect.findsource, which has to read and parse the whole source file.
+    """
+    if not inspect.isclass(obj):
+        return _function_info(obj).first_line
+    first_line = getattr(obj, "__firstlineno__", None)
+    if first_line is not None:
+        return first_line
+    function_lines = [
+        _function_info(value).first_line
+        for value in vars(obj).values()
+        if inspect.isfunction(value) and value.__qualname__.startswith(f"{obj.__qualname__}.")
+    ]
+    if function_lines:
+        return min(function_lines)
+    _, line = inspect.findsource(obj)
+    return line + 1
@@ -0,0 +1,134 @@
+import functools
+import inspect
+import unittest
+from unittest import mock
+
+from .context import TestContext
+from .introspection import _definition_line, _is_test_function, _is_test_method
+
+
+def decorator(f):
+    @functools.wraps(f)
+    def wrapper(*args, **kwargs):
+        return f(*args, **kwargs)
+
+    return wrapper
+
+
+class TestIsTestFunction(unittest.TestCase):
+    longMessage = False
+
+    def test_returns_true_for_function_with_test_context_parameter(self):
+        def test_foo(t: TestContext):
+            pass
+
+        self.assertTrue(_is_test_function(test_foo), "expected test_foo to be a test function")
+
+    def test_returns_false_for_function_without_test_prefix(self):
+        def foo(t: TestContext):
+            pass
+
+        self.assertFalse(_is_test_function(foo), "expected foo to not be a test function")
+
+    def test_returns_false_for_function_with_untyped_parameter(self):
+        def test_foo(t):
+            pass
+
+        self.assertFalse(_is_test_function(test_foo), "expected test_foo to not be a test function")
+
+    def test_returns_true_for_function_with_string_test_context_annotation(self):
+        def test_foo(t: "TestContext"):
+            pass
+
+        self.assertTrue(_is_test_function(test_foo), "expected test_foo to be a test function")
+
+    def test_returns_true_for_decorated_test_function(self):
+        @decorator
+        def test_foo(t: TestContext):
+            pass
+
+        self.assertTrue(_is_test_function(test_foo), "expected test_foo to be a test function")
+
+    def test_signature_is_only_inspected_once(self):
+        def test_foo(t: TestContext):
+            pass
+
+        with mock.patch("inspect.signature", wraps=inspect.signature) as signature:
+            _is_test_function(test_foo)
+            _is_test_function(test_foo)
+            _definition_line(test_foo)
+
+        self.assertEqual(
+            1,
+            signature.call_count,
+            f"expected signature to be inspected once, was inspected {signature.call_count} times",
+        )
+
+
+class TestIsTestMethod(unittest.TestCase):
+    longMessage = False
+
+    def test_returns_true_for_method_with_self_and_test_context_parameters(self):
+        class TestFoo:
+            def test_foo(self, t: TestContext):
+                pass
+
+        self.assertTrue(_is_test_method(TestFoo.test_foo), "expected test_foo to be a test method")
+
+    def test_returns_false_for_method_without_test_context_parameter(self):
+        class TestFoo:
+            def test_foo(self):
+                pass
+
+        self.assertFalse(
+            _is_test_method(TestFoo.test_foo), "expected test_foo to not be a test method"
+        )
+
+
+class TestDefinitionLine(unittest.TestCase):
+    longMessage = False
+
+    def test_returns_first_line_of_function(self):
+        def test_foo(t: TestContext):
+            pass
+
+        actual = _definition_line(test_foo)
+
+        expected = test_foo.__code__.co_firstlineno
+        self.assertEqual(expected, actual, f"expected line {expected}, got {actual}")
+
+    def test_returns_first_line_of_decorated_function_not_its_wrapper(self):
+        @decorator
+        def test_foo(t: TestContext):
+            pass
+
+        actual = _definition_line(test_foo)
+
+        expected = test_foo.__wrapped__.__code__.co_firstlineno
+        self.assertEqual(expected, actual, f"expected line {expected}, got {actual}")
+
+    def test_orders_classes_by_where_they_are_defined(self):
+        from test_data.discovery.unsorted_tests import test_b, TestB, test_a, TestA
+
+        tests = [TestA, test_a, TestB, test_b]
+        actual = sorted(tests, key=_definition_line)
+
+        expected = [test_b, TestB, test_a, TestA]
+        self.assertEqual(
+            expected,
+            actual,
+            f"expected tests to be ordered as {expected}, got {actual}",
+        )
+
+    def test_returns_line_of_class_without_functions_of_its_own(self):
+        class Base:
+            def test_foo(self, t: TestContext):
+                pass
+
+        class TestFoo(Base):
+            pass
+
+        actual = _definition_line(TestFoo)
+
+        expected = Base.test_foo.__code__.co_firstlineno + 3
+        self.assertEqual(expected, actual, f"expected line {expected}, got {actual}")
@@ -0,0 +1,44 @@
+from typing import Any, Callable, Optional, TypeVar
+
+
+T = TypeVar("T")
+
+_TIMEOUT_ATTRIBUTE = "__testipy_timeout__"
+_SERIAL_ATTRIBUTE = "__testipy_serial__"
+
+
+def timeout(seconds: Optional[float]) -> Callable[[T], T]:
+    """
+    Decorate a test function, test class or test method to override the timeout that it's run with.
+    A timeout of None means that the test is never timed out.
+
+    The timeout of a test class applies to each of its test methods which don't have their own.
+    """
+
+    def decorator(test: T) -> T:
+        setattr(test, _TIMEOUT_ATTRIBUTE, seconds)
+        return test
+
+    return decorator
+
+
+def _get_timeout(
+    test: Any, test_class: Optional[type], default: Optional[float]
+) -> Optional[float]:
+    for marked in [test, test_class]:
+        if hasattr(marked, _TIMEOUT_ATTRIBUTE):
+            return getattr(marked, _TIMEOUT_ATTRIBUTE)
+    return default
+
+
+def serial(test: T) -> T:
+    """
+    Decorate a test function or test class so that it's never run at the same time as any other
+    test when the tests are run in threads.
+    """
+    setattr(test, _SERIAL_ATTRIBUTE, True)
+    return test
+
+
+def _is_serial(test: Any) -> bool:
+    return getattr(test, _SERIAL_ATTRIBUTE, False)
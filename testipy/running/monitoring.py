@@ -0,0 +1,118 @@
+import contextlib
+import os
+import platform
+import sys
+from types import CodeType
+from typing import Any, Iterator, Optional
+
+
+class MonitoringNotSupportedError(Exception):
+    """Raised when the lines that tests run are recorded by a version of Python without them."""
+
+    pass
+
+
+class LineRecorder:
+    """
+    Records which lines of the project's source files each test function and test method runs,
+    using sys.monitoring.
+
+    A test method's lines include those run by the test class's setup and teardown, and the lines
+    run by the class setup and teardown are recorded for the test class itself. Project files are
+    those under the current directory which aren't installed packages or testipy itself.
+
+    Each line is only reported once per test: the first time that it runs, the event for it is
+    disabled until the next test starts, so a test pays for its lines being recorded once rather
+    than each time that they run.
+    """
+
+    def __init__(self):
+        if not hasattr(sys, "monitoring"):
+            raise MonitoringNotSupportedError(
+                f"recording the lines that tests run needs Python 3.12 or later, got "
+                f"{platform.python_version()}"
+            )
+        # test ID -> path relative to the current directory -> lines
+        self.lines: dict[str, dict[str, set[int]]] = {}
+        # lines recorded for each test which is being run, innermost last
+        self._recording_tests: list[tuple[str, dict[str, set[int]]]] = []
+        self._project_paths: dict[str, Optional[str]] = {}
+        self._root = os.getcwd()
+        self._runner_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+    @contextlib.contextmanager
+    def _monitoring(self) -> Iterator[None]:
+        monitoring: Any = sys.monitoring  # type: ignore[attr-defined]
+        tool_id = _free_tool_id()
+        monitoring.use_tool_id(tool_id, "testipy")
+        monitoring.register_callback(tool_id, monitoring.events.LINE, self._record_line)
+        monitoring.set_events(tool_id, monitoring.events.LINE)
+        global _active_recorder
+        _active_recorder = self
+        try:
+            yield
+        finally:
+            _active_recorder = None
+            monitoring.set_events(tool_id, monitoring.events.NO_EVENTS)
+            monitoring.register_callback(tool_id, monitoring.events.LINE, None)
+            monitoring.free_tool_id(tool_id)
+
+    @contextlib.contextmanager
+    def _recording(self, test_id: str) -> Iterator[None]:
+        lines: dict[str, set[int]] = {}
+        self._recording_tests.append((test_id, lines))
+        # lines which have run before have had their events disabled
+        sys.monitoring.restart_events()  # type: ignore[attr-defined]
+        try:
+            yield
+        finally:
+            self._recording_tests.pop()
+            self.lines[test_id] = lines
+            sys.monitoring.restart_events()  # type: ignore[attr-defined]
+
+    def _record_line(self, code: CodeType, line: int) -> Any:
+        if self._recording_tests:
+            path = self._project_path(code.co_filename)
+            if path is not None:
+                _, lines = self._recording_tests[-1]
+                lines.setdefault(path, set()).add(line)
+        return sys.monitoring.DISABLE  # type: ignore[attr-defined]
+
+    def _project_path(self, filename: str) -> Optional[str]:
+        """Return the path of a project file relative to the current directory, or None."""
+        if filename not in self._project_paths:
+            path = os.path.abspath(filename)
+            # generated code, like dataclasses' methods, has a filename like <string>
+            is_project_file = (
+                os.path.isfile(path)
+                and path.startswith(self._root + os.sep)
+                and not path.startswith(self._runner_root + os.sep)
+                and "site-packages" not in path
+            )
+            self._project_paths[filename] = (
+                os.path.relpath(path, self._root) if is_project_file else None
+            )
+        return self._project_paths[filename]
+
+
+# the line recorder which is recording the tests being run, if any
+_active_recorder: Optional[LineRecorder] = None
+
+
+@contextlib.contextmanager
+def _recording_lines(test_id: str) -> Iterator[None]:
+    """Record the lines run inside the block for the given test if they're being recorded."""
+    if _active_recorder is None:
+        yield
+        return
+    with _active_recorder._recording(test_id):
+        yield
+
+
+def _free_tool_id() -> int:
+    monitoring: Any = sys.monitoring  # type: ignore[attr-defined]
+    # the coverage ID is preferred, but coverage.py might be measuring testipy itself
+    for tool_id in [monitoring.COVERAGE_ID, 3, 4]:
+        if monitoring.get_tool(tool_id) is None:
+            return tool_id
+    raise MonitoringNotSupportedError("no sys.monitoring tool IDs are free to record lines with")
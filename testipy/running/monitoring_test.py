@@ -0,0 +1,42 @@
+import sys
+import unittest
+
+from .monitoring import LineRecorder, MonitoringNotSupportedError
+from .running import run_tests
+from test_data.monitoring import lines_test
+
+
+@unittest.skipUnless(hasattr(sys, "monitoring"), "sys.monitoring needs Python 3.12 or later")
+class TestLineRecorder(unittest.TestCase):
+    longMessage = False
+
+    def test_lines_run_by_each_test_are_recorded(self):
+        recorder = LineRecorder()
+
+        run_tests([lines_test.test_add, lines_test.TestHelpers], line_recorder=recorder)
+
+        helpers = "test_data/monitoring/helpers.py"
+        tests = "test_data/monitoring/lines_test.py"
+        module = "test_data.monitoring.lines_test"
+        expected = {
+            f"{module}::test_add": {tests: {7}, helpers: {2}},
+            f"{module}::TestHelpers": {tests: {13}, helpers: {10}},
+            f"{module}::TestHelpers::test_add": {tests: {16}, helpers: {2}},
+            f"{module}::TestHelpers::test_subtract": {tests: {19}, helpers: {6}},
+        }
+        self.assertEqual(
+            expected,
+            recorder.lines,
+            f"expected lines {expected} to be recorded, got {recorder.lines}",
+        )
+
+    def test_recording_lines_of_tests_run_in_threads_raises_error(self):
+        with self.assertRaises(ValueError):
+            run_tests([lines_test.test_add], threads=2, line_recorder=LineRecorder())
+
+
+@unittest.skipIf(hasattr(sys, "monitoring"), "sys.monitoring is available")
+class TestLineRecorderNotSupported(unittest.TestCase):
+    def test_creating_recorder_raises_error(self):
+        with self.assertRaises(MonitoringNotSupportedError):
+            LineRecorder()
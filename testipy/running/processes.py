@@ -0,0 +1,34 @@
+import collections
+import multiprocessing
+from multiprocessing.pool import AsyncResult
+from typing import Iterable, Iterator, Optional
+
+from .results import TestResult, _make_picklable
+from .units import TestUnit, _run_test_unit
+
+
+def _run_tests_in_processes(
+    tests: Iterable[TestUnit], workers: int, timeout: Optional[float]
+) -> Iterator[TestResult]:
+    """
+    Run some test units spread over a pool of worker processes, yielding their results in the same
+    order as the tests were given.
+
+    Each test is handed to the pool as soon as it's taken from the given iterable and results are
+    yielded as soon as they and all of the results before them are ready.
+
+    Test units are pickled by reference, so they must be importable from the worker processes. Each
+    worker times out its own tests, as _run_test_unit does.
+    """
+    with multiprocessing.Pool(workers) as pool:
+        pending_results: collections.deque[AsyncResult] = collections.deque()
+        for test in tests:
+            pending_results.append(pool.apply_async(_run_test_unit_in_worker, (test, timeout)))
+            while pending_results and pending_results[0].ready():
+                yield pending_results.popleft().get()
+        while pending_results:
+            yield pending_results.popleft().get()
+
+
+def _run_test_unit_in_worker(test: TestUnit, timeout: Optional[float]) -> TestResult:
+    return _make_picklable(_run_test_unit(test, timeout=timeout))
@@ -0,0 +1,92 @@
+import unittest
+
+from .results import ErrorResult, FailResult, FormattedError, PassResult
+from .running import run_tests
+from test_data.e2e.classes_test import TestAdd
+from test_data.e2e.exceptions_test import test_exceptions_error_the_test
+from test_data.e2e.failures_test import test_multiple_failures, test_require_failure
+from test_data.e2e.passing_test import test_passes
+from test_data.processes.worker_test import TestRunInOneProcess, test_runs_in_worker_process
+
+
+class TestRunningInProcesses(unittest.TestCase):
+    longMessage = False
+
+    def test_results_are_same_as_serial_run(self):
+        tests = [
+            test_multiple_failures,
+            TestAdd,
+            test_passes,
+            TestRunInOneProcess,
+            test_require_failure,
+        ]
+
+        actual = run_tests(tests, workers=2)
+
+        expected = run_tests(tests)
+        self.assertEqual(
+            expected,
+            actual,
+            f"expected running {tests} in 2 workers to return {expected}, got {actual}",
+        )
+
+    def test_tests_are_run_in_worker_processes(self):
+        actual = run_tests([test_runs_in_worker_process], workers=2)
+
+        expected = [PassResult("test_runs_in_worker_process")]
+        self.assertEqual(
+            expected,
+            actual,
+            f"expected running a test in 2 workers to return {expected}, got {actual}",
+        )
+
+    def test_test_classes_are_run_as_a_whole_by_one_worker(self):
+        actual = run_tests([TestRunInOneProcess], workers=2)
+
+        expected = [
+            PassResult(
+                "TestRunInOneProcess",
+                sub_results=[PassResult("test_first"), PassResult("test_second")],
+            )
+        ]
+        self.assertEqual(
+            expected,
+            actual,
+            f"expected running a class with setup in 2 workers to return {expected}, got {actual}",
+        )
+
+    def test_errors_are_returned_with_formatted_traceback(self):
+        actual = run_tests([test_exceptions_error_the_test], workers=2)
+
+        expected = [ErrorResult("test_exceptions_error_the_test", error=ValueError("oh no!"))]
+        self.assertEqual(
+            expected,
+            actual,
+            f"expected running an erroring test in 2 workers to return {expected}, got {actual}",
+        )
+        error = actual[0].error
+        self.assertIsInstance(
+            error,
+            FormattedError,
+            f"expected error of erroring test run in a worker to be a FormattedError, got {error}",
+        )
+        self.assertIn(
+            'raise ValueError("oh no!")',
+            error.traceback,
+            f"expected traceback to contain the line which raised the error, got {error.traceback}",
+        )
+
+    def test_failure_messages_are_returned(self):
+        actual = run_tests([test_multiple_failures], workers=2)
+
+        expected = [
+            FailResult(
+                "test_multiple_failures",
+                messages=["failure message", "multiple failures are allowed in the same test"],
+            )
+        ]
+        self.assertEqual(
+            expected,
+            actual,
+            f"expected running a failing test in 2 workers to return {expected}, got {actual}",
+        )
@@ -1,14 +1,47 @@
 from __future__ import annotations
 
 import dataclasses
+import io
+import json
+import pickle
+import traceback as tb
 from typing import Sequence, Union, Optional, Any
 
 
+class NoNextTracebackError(Exception):
+    pass
+
+
+class FormattedError(Exception):
+    """
+    Stands in for an error whose traceback is no longer available, such as one which was raised in
+    another process, holding the traceback already formatted.
+    """
+
+    def __init__(self, *args: Any, traceback: str = ""):
+        super().__init__(*args)
+        self.traceback = traceback
+
+
+@dataclasses.dataclass(frozen=True)
+class Duration:
+    """How long something took to run, in nanoseconds of wall time and of process CPU time."""
+
+    wall_ns: int
+    cpu_ns: int
+
+
 @dataclasses.dataclass
 class PassResult:
     test_name: str
     _: dataclasses.KW_ONLY
     sub_results: Sequence[PassResult] = dataclasses.field(default_factory=list)
+    duration: Optional[Duration] = dataclasses.field(default=None, compare=False)
+    # durations of the phases that the test was run in, e.g. setup, call and teardown for a test
+    # method
+    phases: dict[str, Duration] = dataclasses.field(default_factory=dict, compare=False)
+    # whether the result was reused from an earlier run rather than the test being run again
+    cached: bool = dataclasses.field(default=False, compare=False)
 
     def __repr__(self) -> str:
         args = [repr(self.test_name)]
@@ -24,6 +57,8 @@ class FailResult:
     _: dataclasses.KW_ONLY
     messages: list[str] = dataclasses.field(default_factory=list)
     sub_results: Sequence[Union[PassResult, FailResult]] = dataclasses.field(default_factory=list)
+    duration: Optional[Duration] = dataclasses.field(default=None, compare=False)
+    phases: dict[str, Duration] = dataclasses.field(default_factory=dict, compare=False)
 
     def __repr__(self) -> str:
         args = [repr(self.test_name)]
@@ -43,6 +78,8 @@ class ErrorResult:
     sub_results: Sequence[Union[PassResult, FailResult, ErrorResult]] = dataclasses.field(
         default_factory=list
     )
+    duration: Optional[Duration] = dataclasses.field(default=None, compare=False)
+    phases: dict[str, Duration] = dataclasses.field(default_factory=dict, compare=False)
 
     def __eq__(self, other: Any) -> bool:
         if not isinstance(other, ErrorResult):
@@ -63,5 +100,125 @@ class ErrorResult:
         return f"ErrorResult({joined_args})"
 
 
-TestResult = Union[PassResult, FailResult, ErrorResult]
+@dataclasses.dataclass
+class NotRunResult:
+    """Result of a test which wasn't run because the run was stopped early."""
+
+    test_name: str
+    _: dataclasses.KW_ONLY
+    sub_results: Sequence[NotRunResult] = dataclasses.field(default_factory=list)
+    duration: Optional[Duration] = dataclasses.field(default=None, compare=False)
+    phases: dict[str, Duration] = dataclasses.field(default_factory=dict, compare=False)
+
+    def __repr__(self) -> str:
+        return f"NotRunResult({repr(self.test_name)})"
+
+
+TestResult = Union[PassResult, FailResult, ErrorResult, NotRunResult]
 TestResults = Sequence[TestResult]
+
+
+def format_error(e: Exception) -> str:
+    """Format the traceback of an error raised by a test, without the test runner's stack entry."""
+    if isinstance(e, FormattedError):
+        return e.traceback
+    string_io = io.StringIO()
+    # __traceback__ is guaranteed to not be None since the exception will
+    # always be thrown from inside a test function call meaning that we'll
+    # always have a call like test_xxx as the first stack trace entry followed
+    # by at least one other entry which is where the exception was actually
+    # raised
+    if not e.__traceback__:
+        raise NoNextTracebackError(
+            f"Expected traceback {e.__traceback__} to have another traceback chained on to it."
+        )
+    next_traceback = e.__traceback__.tb_next
+    tb.print_exception(
+        type(e),
+        value=e,
+        tb=next_traceback,
+        file=string_io,
+    )
+    return string_io.getvalue()
+
+
+def _make_picklable(result: TestResult) -> TestResult:
+    """
+    Return a copy of the given result which can be sent to another process. Tracebacks can't be
+    pickled, so errors are replaced by FormattedErrors holding the formatted traceback.
+    """
+    sub_results = [_make_picklable(sub_result) for sub_result in result.sub_results]
+    if isinstance(result, ErrorResult) and result.error:
+        error = FormattedError(*_picklable_args(result.error), traceback=format_error(result.error))
+        return dataclasses.replace(result, error=error, sub_results=sub_results)
+    return dataclasses.replace(result, sub_results=sub_results)
+
+
+def _picklable_args(e: Exception) -> tuple[Any, ...]:
+    try:
+        pickle.dumps(e.args)
+    except Exception:
+        return (str(e),)
+    return e.args
+
+
+_RESULT_TYPES: dict[str, type[TestResult]] = {
+    "pass": PassResult,
+    "fail": FailResult,
+    "error": ErrorResult,
+    "not_run": NotRunResult,
+}
+
+
+def _result_to_dict(result: TestResult) -> dict[str, Any]:
+    """
+    Return a JSON serialisable form of a result, which can be turned back into the result by
+    _result_from_dict. Errors become FormattedErrors, as they do when made picklable.
+    """
+    data: dict[str, Any] = {
+        "type": next(name for name, type_ in _RESULT_TYPES.items() if isinstance(result, type_)),
+        "test_name": result.test_name,
+    }
+    if isinstance(result, FailResult) and result.messages:
+        data["messages"] = result.messages
+    if isinstance(result, ErrorResult) and result.error:
+        data["error"] = {
+            "args": _json_serialisable_args(result.error),
+            "traceback": format_error(result.error),
+        }
+    if result.sub_results:
+        data["sub_results"] = [_result_to_dict(sub_result) for sub_result in result.sub_results]
+    if result.duration:
+        data["duration"] = _duration_to_list(result.duration)
+    if result.phases:
+        data["phases"] = {name: _duration_to_list(d) for name, d in result.phases.items()}
+    return data
+
+
+def _result_from_dict(data: dict[str, Any]) -> TestResult:
+    kwargs: dict[str, Any] = {}
+    if "messages" in data:
+        kwargs["messages"] = data["messages"]
+    if "error" in data:
+        kwargs["error"] = FormattedError(
+            *data["error"]["args"], traceback=data["error"]["traceback"]
+        )
+    if "sub_results" in data:
+        kwargs["sub_results"] = [_result_from_dict(sub_data) for sub_data in data["sub_results"]]
+    if "duration" in data:
+        kwargs["duration"] = Duration(*data["duration"])
+    if "phases" in data:
+        kwargs["phases"] = {name: Duration(*d) for name, d in data["phases"].items()}
+    return _RESULT_TYPES[data["type"]](data["test_name"], **kwargs)
+
+
+def _duration_to_list(duration: Duration) -> list[int]:
+    return [duration.wall_ns, duration.cpu_ns]
+
+
+def _json_serialisable_args(e: Exception) -> list[Any]:
+    try:
+        json.dumps(e.args)
+    except (TypeError, ValueError):
+        return [str(e)]
+    return list(e.args)
@@ -0,0 +1,63 @@
+import json
+import unittest
+
+from .results import (
+    Duration,
+    ErrorResult,
+    FailResult,
+    FormattedError,
+    NotRunResult,
+    PassResult,
+    _result_from_dict,
+    _result_to_dict,
+)
+from .running import run_tests
+from test_data.e2e.exceptions_test import test_exceptions_error_the_test
+
+
+class TestResultSerialisation(unittest.TestCase):
+    longMessage = False
+
+    def test_results_are_the_same_after_round_trip_through_json(self):
+        results = [
+            PassResult("test_passes", duration=Duration(1, 2)),
+            FailResult("test_fails", messages=["oh no!"]),
+            ErrorResult(
+                "TestErrors",
+                error=FormattedError("oh no!", traceback="Traceback ..."),
+                sub_results=[PassResult("test_passes")],
+            ),
+            NotRunResult("test_not_run"),
+        ]
+
+        actual = [_result_from_dict(json.loads(json.dumps(_result_to_dict(r)))) for r in results]
+
+        self.assertEqual(
+            results,
+            actual,
+            f"expected results to be {results} after round trip through JSON, got {actual}",
+        )
+
+    def test_durations_and_phases_are_kept(self):
+        result = PassResult(
+            "TestPasses", duration=Duration(3, 4), phases={"setup_class": Duration(1, 2)}
+        )
+
+        actual = _result_from_dict(_result_to_dict(result))
+
+        self.assertEqual(
+            (result.duration, result.phases),
+            (actual.duration, actual.phases),
+            f"expected duration and phases to be kept, got {actual.duration} and {actual.phases}",
+        )
+
+    def test_error_traceback_is_kept(self):
+        [result] = run_tests([test_exceptions_error_the_test])
+
+        actual = _result_from_dict(_result_to_dict(result))
+
+        self.assertIn(
+            'raise ValueError("oh no!")',
+            actual.error.traceback,
+            f"expected error traceback to be kept, got:\n\n{actual.error.traceback}",
+        )
@@ -1,23 +1,213 @@
-import inspect
-from typing import Iterable, Union
+import collections
+import os
+from typing import Iterable, Iterator, Mapping, Optional, Sequence
 
-from .results import TestResults
-from .functions import _run_test_function, TestFunction
-from .classes import _run_test_class
+from .concurrency import _run_tests_concurrently
+from .distributed import Coordinator
+from .forking import _run_tests_in_forks
+from .monitoring import LineRecorder
+from .processes import _run_tests_in_processes
+from .scheduling import _run_longest_first
+from .results import ErrorResult, FailResult, NotRunResult, TestResult, TestResults
+from .threads import _is_free_threaded, _run_tests_in_threads
+from .units import TestUnit, _is_test_unit, _run_test_unit, _test_unit_name
 
 
-def run_tests(tests: Iterable[Union[TestFunction, type]]) -> TestResults:
-    """Runs some test functions and test classes and returns their result."""
-    results: TestResults = []
+def run_tests(
+    tests: Iterable[TestUnit],
+    *,
+    workers: int = 1,
+    threads: int = 1,
+    forks: int = 0,
+    preload: Sequence[str] = (),
+    parallel: bool = False,
+    timeout: Optional[float] = None,
+    maxfail: Optional[int] = None,
+    async_concurrency: int = 1,
+    line_recorder: Optional[LineRecorder] = None,
+    durations: Optional[Mapping[str, float]] = None,
+    coordinator: Optional[Coordinator] = None,
+) -> TestResults:
+    """
+    Runs some test functions and test classes and returns their result.
+
+    If workers is greater than one, the tests are spread over that many worker processes. Each test
+    class is run as a whole by a single worker so that its setup and teardown wrap its methods.
+
+    If threads is greater than one, the tests are instead spread over that many threads in this
+    process, which suits tests that spend most of their time blocked on I/O. Test functions and test
+    classes marked with the serial decorator are run on their own. The CPU time of a test which is
+    run in a thread includes the CPU time of the tests run alongside it.
+
+    If forks is greater than zero, the tests of each test module are instead run in a process of
+    their own which is forked from this one, with up to that many forked processes running at once.
+    The preload modules are imported once before any processes are forked so that each forked
+    process shares them rather than importing them again.
+
+    If a coordinator is given, the tests of each test module are instead handed out to the worker
+    processes which connect to it with run_worker, which can be on this machine or others. The tests
+    of workers which disconnect before sending back their results are handed to another worker.
+
+    If parallel is set, the tests are spread over one thread per CPU on a free-threaded interpreter,
+    where threads can run Python code at the same time, or one worker process per CPU otherwise.
+
+    If a timeout is given, each test function and test method which runs for longer than that many
+    seconds is stopped waiting for and errors with a TestTimeoutError, which shows where it was
+    stuck. Tests can override the timeout with the timeout decorator.
+
+    If maxfail is given, the run is stopped once that many test functions or test classes have
+    failed or errored and the rest of the tests are given a NotRunResult.
+
+    Async tests are run on an event loop which is shared between them. If async_concurrency is
+    greater than one, up to that many async test functions are run concurrently with each other
+    when the tests aren't spread over worker processes or threads.
+
+    If a line recorder is given, the lines of the project which each test function, test method and
+    test class runs are recorded in it. This needs the tests to be run one at a time in this
+    process, so it can't be combined with any of the ways of running tests at the same time.
+
+    If durations in seconds from earlier runs are given for the tests, keyed by test unit ID (e.g.
+    "tests.foo_test::TestFoo"), test modules whose tests are spread over worker processes or threads
+    are started longest first so that the run isn't left waiting on a long module which was started
+    last. Tests without a duration are expected to take the mean of the given durations. The tests
+    of each module are still run in order, modules are only reordered among the next few that are
+    taken so that tests are still run as they're taken, and the results are still returned in the
+    order of the tests.
+    """
+    return list(
+        stream_tests(
+            tests,
+            workers=workers,
+            threads=threads,
+            forks=forks,
+            preload=preload,
+            parallel=parallel,
+            timeout=timeout,
+            maxfail=maxfail,
+            async_concurrency=async_concurrency,
+            line_recorder=line_recorder,
+            durations=durations,
+            coordinator=coordinator,
+        )
+    )
+
+
+def stream_tests(
+    tests: Iterable[TestUnit],
+    *,
+    workers: int = 1,
+    threads: int = 1,
+    forks: int = 0,
+    preload: Sequence[str] = (),
+    parallel: bool = False,
+    timeout: Optional[float] = None,
+    maxfail: Optional[int] = None,
+    async_concurrency: int = 1,
+    line_recorder: Optional[LineRecorder] = None,
+    durations: Optional[Mapping[str, float]] = None,
+    coordinator: Optional[Coordinator] = None,
+) -> Iterator[TestResult]:
+    """
+    Runs some test functions and test classes like run_tests, but yields each result as soon as it's
+    ready instead of returning them all at the end.
+
+    The tests are only taken from the given iterable as they're needed, so the tests can be run as
+    they're discovered. The results are yielded in the same order as the tests.
+    """
+    executors = [
+        name
+        for name, is_used in [
+            ("workers", workers > 1),
+            ("threads", threads > 1),
+            ("forks", forks > 0),
+            ("parallel", parallel),
+            ("coordinator", coordinator is not None),
+        ]
+        if is_used
+    ]
+    if len(executors) > 1:
+        raise ValueError(
+            "tests can only be run with one of workers, threads, forks, parallel or a coordinator, "
+            f"got {' and '.join(executors)}"
+        )
+    if line_recorder is not None and (executors or async_concurrency > 1):
+        raise ValueError(
+            "lines can only be recorded when the tests are run one at a time in this process"
+        )
+    if parallel:
+        if _is_free_threaded():
+            threads = os.cpu_count() or 1
+        else:
+            workers = os.cpu_count() or 1
+    # tests which have been taken to be run but whose results haven't been yielded yet, so that
+    # they can be reported as not run if the run is stopped early
+    unreported_tests: collections.deque[TestUnit] = collections.deque()
+    test_units = _take(tests, unreported_tests)
+    results = _run_tests(
+        test_units,
+        workers,
+        threads,
+        forks,
+        preload,
+        timeout,
+        async_concurrency,
+        line_recorder,
+        durations,
+        coordinator,
+    )
+    failures = 0
+    for result in results:
+        unreported_tests.popleft()
+        yield result
+        if isinstance(result, (FailResult, ErrorResult)):
+            failures += 1
+            if maxfail is not None and failures >= maxfail:
+                break
+    # closing the results stops any tests which are still running
+    results.close()
+    for test in unreported_tests:
+        yield NotRunResult(_test_unit_name(test))
+    for test in test_units:
+        yield NotRunResult(_test_unit_name(test))
+
+
+def _take(tests: Iterable[TestUnit], taken: collections.deque[TestUnit]) -> Iterator[TestUnit]:
     for test in tests:
-        if inspect.isfunction(test):
-            test_function = test
-            result = _run_test_function(test_function)
-            results.append(result)
+        if _is_test_unit(test):
+            taken.append(test)
+            yield test
 
-        elif inspect.isclass(test):
-            test_class = test
-            result = _run_test_class(test_class)
-            results.append(result)
 
-    return results
+def _run_tests(
+    tests: Iterator[TestUnit],
+    workers: int,
+    threads: int,
+    forks: int,
+    preload: Sequence[str],
+    timeout: Optional[float],
+    async_concurrency: int,
+    line_recorder: Optional[LineRecorder],
+    durations: Optional[Mapping[str, float]],
+    coordinator: Optional[Coordinator],
+) -> Iterator[TestResult]:
+    if coordinator is not None:
+        yield from coordinator._run(tests, timeout)
+    elif workers > 1:
+        yield from _run_longest_first(
+            tests, durations, lambda tests: _run_tests_in_processes(tests, workers, timeout)
+        )
+    elif forks > 0:
+        yield from _run_tests_in_forks(tests, forks, timeout, preload)
+    elif threads > 1:
+        yield from _run_longest_first(
+            tests, durations, lambda tests: _run_tests_in_threads(tests, threads, timeout)
+        )
+    elif async_concurrency > 1:
+        yield from _run_tests_concurrently(tests, async_concurrency, timeout)
+    elif line_recorder is not None:
+        with line_recorder._monitoring():
+            for test in tests:
+                yield _run_test_unit(test, timeout=timeout)
+    else:
+        for test in tests:
+            yield _run_test_unit(test, timeout=timeout)
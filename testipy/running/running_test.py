@@ -0,0 +1,111 @@
+import time
+import unittest
+
+from .context import TestContext
+from .results import FailResult, NotRunResult, PassResult
+from .running import run_tests, stream_tests
+from test_data.e2e.failures_test import test_require_failure
+from test_data.e2e.passing_test import test_passes
+from test_data.processes.hangs import test_hangs
+
+
+class TestStreamTests(unittest.TestCase):
+    longMessage = False
+
+    def test_yields_each_result_before_taking_the_next_test(self):
+        taken = []
+
+        def test_first(t: TestContext):
+            pass
+
+        def test_second(t: TestContext):
+            pass
+
+        def tests():
+            for test in [test_first, test_second]:
+                taken.append(test.__name__)
+                yield test
+
+        results = stream_tests(tests())
+        actual = next(results)
+
+        self.assertEqual(
+            PassResult("test_first"),
+            actual,
+            f"expected first result to be PassResult('test_first'), got {actual}",
+        )
+        self.assertEqual(
+            ["test_first"],
+            taken,
+            f"expected only the first test to be taken before its result, got {taken}",
+        )
+
+    def test_yields_results_from_workers_in_order_of_tests(self):
+        tests = [test_passes] * 5
+
+        actual = list(stream_tests(iter(tests), workers=2))
+
+        expected = [PassResult("test_passes")] * 5
+        self.assertEqual(
+            expected,
+            actual,
+            f"expected streaming {tests} in 2 workers to return {expected}, got {actual}",
+        )
+
+
+class TestMaxFail(unittest.TestCase):
+    longMessage = False
+
+    def test_tests_after_maxfail_failures_are_not_run(self):
+        ran = []
+
+        def test_fails(t: TestContext):
+            ran.append("test_fails")
+            t.fail()
+
+        def test_passes(t: TestContext):
+            ran.append("test_passes")
+
+        def test_fails_again(t: TestContext):
+            ran.append("test_fails_again")
+            t.fail()
+
+        actual = run_tests([test_fails, test_passes, test_fails_again, test_passes], maxfail=2)
+
+        expected = [
+            FailResult("test_fails"),
+            PassResult("test_passes"),
+            FailResult("test_fails_again"),
+            NotRunResult("test_passes"),
+        ]
+        self.assertEqual(
+            expected,
+            actual,
+            f"expected run with maxfail=2 to return {expected}, got {actual}",
+        )
+        self.assertEqual(
+            ["test_fails", "test_passes", "test_fails_again"],
+            ran,
+            f"expected tests after the second failure to not be run, ran {ran}",
+        )
+
+    def test_running_tests_are_stopped_when_workers_reach_maxfail(self):
+        tests = [test_require_failure, test_hangs, test_passes]
+
+        start = time.perf_counter()
+        actual = run_tests(tests, workers=2, maxfail=1)
+        elapsed = time.perf_counter() - start
+
+        expected = [
+            FailResult("test_require_failure", messages=["requiring a failure stops the test"]),
+            NotRunResult("test_hangs"),
+            NotRunResult("test_passes"),
+        ]
+        self.assertEqual(
+            expected,
+            actual,
+            f"expected run in 2 workers with maxfail=1 to return {expected}, got {actual}",
+        )
+        self.assertLess(
+            elapsed, 30, f"expected hanging test to be stopped, run took {elapsed:.1f}s"
+        )
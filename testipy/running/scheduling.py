@@ -0,0 +1,80 @@
+import itertools
+import statistics
+from typing import Callable, Iterable, Iterator, Mapping, Optional
+
+from .results import TestResult
+from .units import TestUnit, _test_unit_id, _test_unit_module
+
+
+# how many test modules are looked at to pick the longest from, so that tests are still run while
+# the rest are being discovered
+_MODULE_LOOKAHEAD = 16
+
+
+def _run_longest_first(
+    tests: Iterable[TestUnit],
+    durations: Optional[Mapping[str, float]],
+    run: Callable[[Iterator[TestUnit]], Iterator[TestResult]],
+) -> Iterator[TestResult]:
+    """
+    Hand the test modules to run in order of how long their tests are expected to take, longest
+    first, and yield the results in the order that the tests were given.
+
+    Starting the longest modules first (longest processing time first scheduling) stops a run
+    that's spread over a pool of workers from being left waiting on a long module which was started
+    last, since the short modules at the end fill in around the long ones. Idle workers take the
+    next test from the pool's shared queue, so none of them sit idle while there's a test to run.
+
+    Tests are expected to take as long as the durations in seconds given for them by test unit ID,
+    and tests without a duration are expected to take the mean of the given durations. A module is
+    expected to take as long as its tests together.
+
+    The tests of each module are kept in the order that they were given, since tests can depend on
+    the ones before them having run. Each module is picked from the next _MODULE_LOOKAHEAD modules
+    rather than from all of them, so that tests are still run while the rest are being discovered.
+    run is given an iterator of the tests to run and must yield their results in the same order, as
+    the process and thread pools do. If no durations are given, the tests are run in the order
+    given.
+    """
+    if not durations:
+        yield from run(iter(tests))
+        return
+    default_estimate = statistics.fmean(durations.values())
+    # the index among the given tests of each test that's been handed to run, in the order that
+    # they were handed out
+    order: list[int] = []
+
+    def estimated(batch: list[tuple[int, TestUnit]]) -> tuple[float, list[tuple[int, TestUnit]]]:
+        return sum(durations.get(_test_unit_id(test), default_estimate) for _, test in batch), batch
+
+    def scheduled_tests() -> Iterator[TestUnit]:
+        batches = map(estimated, _module_batches(enumerate(tests)))
+        window = list(itertools.islice(batches, _MODULE_LOOKAHEAD))
+        while window:
+            # the first of the longest, so that modules expected to take as long keep their order
+            longest = max(range(len(window)), key=lambda i: window[i][0])
+            _, batch = window.pop(longest)
+            for i, test in batch:
+                order.append(i)
+                yield test
+            window.extend(itertools.islice(batches, 1))
+
+    # results which are ready but are waiting on the results of tests given before them
+    results: dict[int, TestResult] = {}
+    next_index = 0
+    scheduled_results = run(scheduled_tests())
+    try:
+        for i, result in enumerate(scheduled_results):
+            results[order[i]] = result
+            while next_index in results:
+                yield results.pop(next_index)
+                next_index += 1
+    finally:
+        # if the run is stopped early, the tests which are still running are stopped too
+        scheduled_results.close()  # type: ignore[attr-defined]
+
+
+def _module_batches(tests: Iterable[tuple[int, TestUnit]]) -> Iterator[list[tuple[int, TestUnit]]]:
+    """Yield lists of the consecutive (index, test) pairs whose tests are from the same module."""
+    for _, batch in itertools.groupby(tests, key=lambda i_test: _test_unit_module(i_test[1])):
+        yield list(batch)
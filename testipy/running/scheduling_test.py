@@ -0,0 +1,129 @@
+import itertools
+import unittest
+from typing import Iterator
+
+from .context import TestContext
+from .results import PassResult, TestResult
+from .running import run_tests, stream_tests
+from .scheduling import _run_longest_first
+from .units import TestUnit
+from test_data.e2e.failures_test import test_require_failure
+from test_data.e2e.passing_test import test_passes
+
+
+def test_short(t: TestContext):
+    pass
+
+
+def test_medium(t: TestContext):
+    pass
+
+
+def test_long(t: TestContext):
+    pass
+
+
+def test_unknown(t: TestContext):
+    pass
+
+
+DURATIONS = {
+    f"{__name__}::test_short": 1.0,
+    f"{__name__}::test_medium": 2.0,
+    f"{__name__}::test_long": 6.0,
+}
+
+
+class TestRunLongestFirst(unittest.TestCase):
+    longMessage = False
+
+    def test_modules_are_run_longest_first_with_unknown_tests_taking_the_mean(self):
+        durations = {
+            f"{__name__}::test_short": 1.0,
+            f"{__name__}::test_medium": 4.0,
+            "test_data.e2e.passing_test::test_passes": 6.0,
+        }
+        run_tests: list[TestUnit] = []
+
+        def run(tests: Iterator[TestUnit]) -> Iterator[TestResult]:
+            for test in tests:
+                run_tests.append(test)
+                yield PassResult(test.__name__)
+
+        list(
+            _run_longest_first(
+                [test_require_failure, test_short, test_medium, test_passes], durations, run
+            )
+        )
+
+        expected = [test_passes, test_short, test_medium, test_require_failure]
+        self.assertEqual(
+            expected, run_tests, f"expected tests to be run {expected}, got {run_tests}"
+        )
+
+    def test_tests_of_each_module_are_run_in_order(self):
+        run_tests: list[TestUnit] = []
+
+        def run(tests: Iterator[TestUnit]) -> Iterator[TestResult]:
+            for test in tests:
+                run_tests.append(test)
+                yield PassResult(test.__name__)
+
+        list(_run_longest_first([test_short, test_medium, test_unknown, test_long], DURATIONS, run))
+
+        expected = [test_short, test_medium, test_unknown, test_long]
+        self.assertEqual(
+            expected, run_tests, f"expected tests to be run {expected}, got {run_tests}"
+        )
+
+    def test_results_are_yielded_in_order_of_tests(self):
+        def run(tests: Iterator[TestUnit]) -> Iterator[TestResult]:
+            for test in tests:
+                yield PassResult(test.__name__)
+
+        actual = list(_run_longest_first([test_short, test_medium, test_long], DURATIONS, run))
+
+        expected = [PassResult("test_short"), PassResult("test_medium"), PassResult("test_long")]
+        self.assertEqual(expected, actual, f"expected results {expected}, got {actual}")
+
+    def test_tests_spread_over_threads_are_returned_in_order(self):
+        actual = run_tests(
+            [test_short, test_medium, test_unknown, test_long], threads=2, durations=DURATIONS
+        )
+
+        expected = [
+            PassResult("test_short"),
+            PassResult("test_medium"),
+            PassResult("test_unknown"),
+            PassResult("test_long"),
+        ]
+        self.assertEqual(expected, actual, f"expected results {expected}, got {actual}")
+
+    def test_results_are_yielded_before_all_of_the_tests_are_taken(self):
+        for executor in [{"threads": 2}, {"workers": 2}]:
+            with self.subTest(**executor):
+                taken = 0
+
+                def tests() -> Iterator[TestUnit]:
+                    nonlocal taken
+                    # far more tests than are taken before the first result is ready
+                    for test in itertools.islice(
+                        itertools.cycle([test_short, test_long, test_passes, test_require_failure]),
+                        100_000,
+                    ):
+                        taken += 1
+                        yield test
+
+                results = stream_tests(tests(), durations=DURATIONS, **executor)
+                actual = next(results)
+                results.close()
+
+                expected = PassResult("test_short")
+                self.assertEqual(
+                    expected, actual, f"expected first result {expected}, got {actual}"
+                )
+                self.assertLess(
+                    taken,
+                    100_000,
+                    f"expected some tests to be left to take, all {taken} were taken",
+                )
@@ -0,0 +1,58 @@
+import collections
+import concurrent.futures
+import sys
+from typing import Iterable, Iterator, Optional
+
+from .markers import _is_serial
+from .results import TestResult
+from .units import TestMethods, TestReference, TestUnit, _run_test_unit
+
+
+def _run_tests_in_threads(
+    tests: Iterable[TestUnit], threads: int, timeout: Optional[float]
+) -> Iterator[TestResult]:
+    """
+    Run some test units spread over a pool of threads, yielding their results in the same order as
+    the tests were given.
+
+    Each test is handed to the pool as soon as it's taken from the given iterable and results are
+    yielded as soon as they and all of the results before them are ready. A test marked as serial
+    is only run once all of the tests before it have finished, and no other tests are run until it
+    has finished.
+    """
+    executor = concurrent.futures.ThreadPoolExecutor(threads, thread_name_prefix="testipy")
+    pending_results: collections.deque[concurrent.futures.Future[TestResult]] = collections.deque()
+    try:
+        for test in tests:
+            if _is_serial(_loaded(test)):
+                while pending_results:
+                    yield pending_results.popleft().result()
+                yield _run_test_unit(test, timeout=timeout)
+                continue
+            pending_results.append(executor.submit(_run_test_unit, test, timeout=timeout))
+            while pending_results and pending_results[0].done():
+                yield pending_results.popleft().result()
+        while pending_results:
+            yield pending_results.popleft().result()
+    finally:
+        # threads can't be stopped, so if the run is stopped early then the tests which are still
+        # running are left to finish in the background while the queued ones are dropped
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _loaded(test: TestUnit) -> object:
+    """Load a test reference to check its markers, leaving it to error when run if it can't be."""
+    if isinstance(test, TestMethods):
+        test = test.test_class
+    if not isinstance(test, TestReference):
+        return test
+    try:
+        return test.load()
+    except Exception:
+        return test
+
+
+def _is_free_threaded() -> bool:
+    """Return whether the interpreter is running without the GIL, so threads can run in parallel."""
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", None)
+    return is_gil_enabled is not None and not is_gil_enabled()
@@ -0,0 +1,127 @@
+import threading
+import time
+import unittest
+from unittest import mock
+
+from .context import TestContext
+from .markers import serial
+from .results import FailResult, NotRunResult, PassResult
+from .running import run_tests, stream_tests
+from test_data.e2e.classes_test import TestAdd
+from test_data.e2e.failures_test import test_multiple_failures
+from test_data.e2e.passing_test import test_passes
+from test_data.processes.worker_test import test_runs_in_worker_process
+
+
+class TestRunningInThreads(unittest.TestCase):
+    longMessage = False
+
+    def test_results_are_same_as_serial_run(self):
+        tests = [test_multiple_failures, TestAdd, test_passes]
+
+        actual = run_tests(tests, threads=2)
+
+        expected = run_tests(tests)
+        self.assertEqual(
+            expected,
+            actual,
+            f"expected running {tests} in 2 threads to return {expected}, got {actual}",
+        )
+
+    def test_tests_are_run_at_the_same_time(self):
+        barrier = threading.Barrier(2, timeout=5)
+
+        def test_waits_for_other_test(t: TestContext):
+            barrier.wait()
+
+        actual = run_tests([test_waits_for_other_test] * 2, threads=2)
+
+        expected = [PassResult("test_waits_for_other_test")] * 2
+        self.assertEqual(
+            expected,
+            actual,
+            f"expected tests waiting for each other in 2 threads to return {expected}, "
+            f"got {actual}",
+        )
+
+    def test_serial_tests_are_run_on_their_own(self):
+        running = 0
+        overlapped = []
+
+        def test_sleeps(t: TestContext):
+            nonlocal running
+            running += 1
+            time.sleep(0.02)
+            running -= 1
+
+        @serial
+        def test_serial(t: TestContext):
+            overlapped.append(running)
+
+        run_tests([test_sleeps, test_sleeps, test_serial, test_sleeps], threads=3)
+
+        self.assertEqual(
+            [0], overlapped, f"expected serial test to run on its own, ran alongside {overlapped}"
+        )
+
+    def test_queued_tests_are_not_run_when_stopped_early(self):
+        ran = []
+
+        def test_fails(t: TestContext):
+            time.sleep(0.02)
+            t.fail()
+
+        def test_passes(t: TestContext):
+            time.sleep(0.02)
+            ran.append("test_passes")
+
+        actual = list(stream_tests([test_fails] + [test_passes] * 10, threads=2, maxfail=1))
+
+        expected = [FailResult("test_fails")] + [NotRunResult("test_passes")] * 10
+        self.assertEqual(
+            expected,
+            actual,
+            f"expected tests after the first failure to not be run, got {actual}",
+        )
+        self.assertLess(len(ran), 10, f"expected queued tests to be dropped, ran {len(ran)}")
+
+    def test_raises_error_when_run_in_both_processes_and_threads(self):
+        with self.assertRaises(ValueError):
+            run_tests([test_passes], workers=2, threads=2)
+
+
+class TestParallel(unittest.TestCase):
+    longMessage = False
+
+    def test_runs_tests_in_threads_when_free_threaded(self):
+        thread_names = []
+
+        def test_records_thread(t: TestContext):
+            thread_names.append(threading.current_thread().name)
+
+        with mock.patch("testipy.running.running._is_free_threaded", return_value=True), mock.patch(
+            "os.cpu_count", return_value=2
+        ):
+            run_tests([test_records_thread], parallel=True)
+
+        self.assertTrue(
+            thread_names[0].startswith("testipy"),
+            f"expected test to run in a testipy thread, ran in {thread_names[0]}",
+        )
+
+    def test_runs_tests_in_worker_processes_when_not_free_threaded(self):
+        with mock.patch(
+            "testipy.running.running._is_free_threaded", return_value=False
+        ), mock.patch("os.cpu_count", return_value=2):
+            actual = run_tests([test_runs_in_worker_process], parallel=True)
+
+        expected = [PassResult("test_runs_in_worker_process")]
+        self.assertEqual(
+            expected,
+            actual,
+            f"expected test to run in a worker process, got {actual}",
+        )
+
+    def test_raises_error_when_given_number_of_threads(self):
+        with self.assertRaises(ValueError):
+            run_tests([test_passes], threads=2, parallel=True)
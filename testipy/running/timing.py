@@ -0,0 +1,29 @@
+import contextlib
+import time
+from typing import Iterator
+
+from .results import Duration
+
+
+class Stopwatch:
+    """Measures the wall time and process CPU time elapsed since it was started."""
+
+    def __init__(self):
+        self._wall_start_ns = time.perf_counter_ns()
+        self._cpu_start_ns = time.process_time_ns()
+
+    def elapsed(self) -> Duration:
+        return Duration(
+            wall_ns=time.perf_counter_ns() - self._wall_start_ns,
+            cpu_ns=time.process_time_ns() - self._cpu_start_ns,
+        )
+
+
+@contextlib.contextmanager
+def _timed_phase(phases: dict[str, Duration], name: str) -> Iterator[None]:
+    """Record how long the body of the with statement took under the given name in phases."""
+    stopwatch = Stopwatch()
+    try:
+        yield
+    finally:
+        phases[name] = stopwatch.elapsed()
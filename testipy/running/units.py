@@ -0,0 +1,132 @@
+import dataclasses
+import importlib
+import inspect
+import os
+import sys
+from typing import Any, Optional, Union
+
+from .classes import _run_test_class
+from .functions import TestFunction, _run_test_function
+from .markers import _get_timeout
+from .monitoring import _recording_lines
+from .results import ErrorResult, TestResult
+
+
+@dataclasses.dataclass(frozen=True)
+class TestReference:
+    """
+    Reference to a test function or test class by where it's defined, so that its module only needs
+    to be imported when the test is run.
+    """
+
+    path: str
+    module: str
+    name: str
+    line: int
+    _: dataclasses.KW_ONLY
+    # (name, line) of each test method, for test classes
+    methods: tuple[tuple[str, int], ...] = ()
+
+    @property
+    def is_class(self) -> bool:
+        return bool(self.methods)
+
+    @property
+    def method_names(self) -> list[str]:
+        return [name for name, _ in self.methods]
+
+    def load(self) -> Union[TestFunction, type]:
+        """Import the module that the test is defined in and return the test."""
+        module = importlib.import_module(self.module)
+        return getattr(module, self.name)
+
+
+@dataclasses.dataclass(frozen=True)
+class TestMethods:
+    """
+    Some of the test methods of a test class, which are run wrapped by the class setup and teardown
+    as if they were the only test methods that the class has.
+    """
+
+    test_class: Union[type, TestReference]
+    method_names: tuple[str, ...]
+
+
+# A test unit is the smallest piece of work which is run as a whole: a test function, or a test
+# class along with all (or some) of its test methods so that its class setup and teardown wrap them.
+TestUnit = Union[TestFunction, type, TestReference, TestMethods]
+
+
+def _is_test_unit(obj: Any) -> bool:
+    return (
+        inspect.isfunction(obj)
+        or inspect.isclass(obj)
+        or isinstance(obj, (TestReference, TestMethods))
+    )
+
+
+def _is_test_class(test: TestUnit) -> bool:
+    if isinstance(test, TestReference):
+        return test.is_class
+    return isinstance(test, TestMethods) or inspect.isclass(test)
+
+
+def _test_unit_name(test: TestUnit) -> str:
+    if isinstance(test, TestMethods):
+        test = test.test_class
+    if isinstance(test, TestReference):
+        return test.name
+    return test.__name__
+
+
+def _test_unit_module(test: TestUnit) -> str:
+    if isinstance(test, TestMethods):
+        test = test.test_class
+    if isinstance(test, TestReference):
+        return test.module
+    return test.__module__
+
+
+def _test_unit_id(test: TestUnit) -> str:
+    """
+    Return an ID for a test unit which is the same however it was found, e.g.
+    "tests.foo_test::TestFoo".
+    """
+    return f"{_test_unit_module(test)}::{_test_unit_name(test)}"
+
+
+def _test_unit_path(test: TestUnit) -> Optional[str]:
+    """Return the absolute path of the file that a test unit is defined in, if it has one."""
+    if isinstance(test, TestMethods):
+        test = test.test_class
+    if isinstance(test, TestReference):
+        return os.path.abspath(test.path)
+    module = sys.modules.get(test.__module__)
+    path = getattr(module, "__file__", None)
+    return os.path.abspath(path) if path else None
+
+
+def _run_test_unit(test: TestUnit, timeout: Optional[float] = None) -> TestResult:
+    """
+    Run a test unit, timing out each test function or test method which runs for longer than the
+    given timeout unless it's marked with its own timeout.
+    """
+    method_names = None
+    if isinstance(test, TestMethods):
+        method_names = test.method_names
+        test = test.test_class
+    if isinstance(test, TestReference):
+        # a collected test class runs the test methods it was collected with, so that it errors
+        # rather than passing if it doesn't have them once it's imported
+        if test.is_class and method_names is None:
+            method_names = test.method_names
+        try:
+            test = test.load()
+        except Exception as e:
+            return ErrorResult(test.name, error=e)
+    if inspect.isclass(test):
+        test_class = test
+        return _run_test_class(test_class, timeout=timeout, method_names=method_names)
+    test_function = test
+    with _recording_lines(_test_unit_id(test_function)):
+        return _run_test_function(test_function, timeout=_get_timeout(test_function, None, timeout))
@@ -0,0 +1,164 @@
+import unittest
+
+from .classes import MissingTestMethodsError
+from .context import TestContext
+from .results import ErrorResult, FailResult, PassResult
+from .running import run_tests
+from .units import TestMethods, TestReference
+
+
+class TestTestReferences(unittest.TestCase):
+    longMessage = False
+
+    def test_referenced_test_function_is_imported_and_run(self):
+        reference = TestReference(
+            "test_data/e2e/passing_test.py", "test_data.e2e.passing_test", "test_passes", 5
+        )
+
+        actual = run_tests([reference])
+
+        expected = [PassResult("test_passes")]
+        self.assertEqual(
+            expected,
+            actual,
+            f"expected running {reference} to return {expected}, got {actual}",
+        )
+
+    def test_referenced_test_class_is_imported_and_run(self):
+        reference = TestReference(
+            "test_data/discovery/one_valid_class.py",
+            "test_data.discovery.one_valid_class",
+            "TestOne",
+            14,
+            methods=(("test_one", 15),),
+        )
+
+        actual = run_tests([reference])
+
+        expected = [
+            FailResult("TestOne", sub_results=[FailResult("test_one", messages=["oh no!"])])
+        ]
+        self.assertEqual(
+            expected,
+            actual,
+            f"expected running {reference} to return {expected}, got {actual}",
+        )
+
+    def test_referenced_test_class_errors_without_the_test_methods_it_was_collected_with(self):
+        reference = TestReference(
+            "test_data/discovery/one_valid_class.py",
+            "test_data.discovery.one_valid_class",
+            "TestOne",
+            14,
+            methods=(("test_missing", 15),),
+        )
+
+        actual = run_tests([reference])
+
+        expected = [
+            ErrorResult(
+                "TestOne",
+                error=MissingTestMethodsError("TestOne has no test methods named test_missing"),
+            )
+        ]
+        self.assertEqual(
+            expected,
+            actual,
+            f"expected running {reference} to return {expected}, got {actual}",
+        )
+
+    def test_result_is_error_when_test_can_not_be_imported(self):
+        reference = TestReference(
+            "test_data/does_not_exist.py", "test_data.does_not_exist", "test_missing", 1
+        )
+
+        actual = run_tests([reference])
+
+        expected = [
+            ErrorResult(
+                "test_missing",
+                error=ModuleNotFoundError("No module named 'test_data.does_not_exist'"),
+            )
+        ]
+        self.assertEqual(
+            expected,
+            actual,
+            f"expected running {reference} to return {expected}, got {actual}",
+        )
+
+
+class TestTestMethods(unittest.TestCase):
+    longMessage = False
+
+    def test_only_given_methods_are_run_in_definition_order(self):
+        class TestClass:
+            def test_c(self, t: TestContext):
+                pass
+
+            def test_b(self, t: TestContext):
+                t.fail()
+
+            def test_a(self, t: TestContext):
+                pass
+
+        test_methods = TestMethods(TestClass, ("test_a", "test_c"))
+
+        actual = run_tests([test_methods])
+
+        expected = [
+            PassResult("TestClass", sub_results=[PassResult("test_c"), PassResult("test_a")])
+        ]
+        self.assertEqual(
+            expected,
+            actual,
+            f"expected running {test_methods} to return {expected}, got {actual}",
+        )
+
+    def test_class_setup_and_teardown_are_run(self):
+        calls = []
+
+        class TestClass:
+            @classmethod
+            def setup_class(cls):
+                calls.append("setup_class")
+
+            @classmethod
+            def teardown_class(cls):
+                calls.append("teardown_class")
+
+            def test_a(self, t: TestContext):
+                calls.append("test_a")
+
+            def test_b(self, t: TestContext):
+                calls.append("test_b")
+
+        run_tests([TestMethods(TestClass, ("test_b",))])
+
+        expected = ["setup_class", "test_b", "teardown_class"]
+        self.assertEqual(expected, calls, f"expected calls {expected}, got {calls}")
+
+    def test_methods_of_referenced_test_class_are_run(self):
+        reference = TestReference(
+            "test_data/e2e/classes_test.py",
+            "test_data.e2e.classes_test",
+            "TestAdd",
+            6,
+            methods=(
+                ("test_adding_two_and_three_returns_five", 7),
+                ("test_adding_three_and_three_returns_seven", 12),
+            ),
+        )
+        test_methods = TestMethods(reference, ("test_adding_two_and_three_returns_five",))
+
+        actual = run_tests([test_methods])
+
+        expected = [
+            PassResult(
+                "TestAdd", sub_results=[PassResult("test_adding_two_and_three_returns_five")]
+            )
+        ]
+        self.assertEqual(
+            expected,
+            actual,
+            f"expected running {test_methods} to return {expected}, got {actual}",
+        )
@@ -0,0 +1,190 @@
+import argparse
+import heapq
+import json
+import os
+import statistics
+import sys
+from typing import Any, Iterable, Mapping, Optional, Sequence
+
+from .history import _moving_average
+from .printing import FriendlyPrinter
+from .running import NotRunResult, TestMethods, TestUnit
+from .running.results import TestResult, _result_from_dict, _result_to_dict
+from .running.units import _test_unit_id
+
+
+class InvalidResultsFileError(Exception):
+    """Raised when a results file to merge can't be read."""
+
+    pass
+
+
+class InvalidDurationsFileError(Exception):
+    """Raised when a durations file to split the tests by can't be read."""
+
+    pass
+
+
+def shard_tests(
+    tests: Iterable[TestUnit],
+    shard: int,
+    shard_count: int,
+    durations: Optional[Mapping[str, float]] = None,
+) -> list[TestUnit]:
+    """
+    Return the tests which belong to a shard out of shard_count shards (numbered from 1), keeping
+    their order.
+
+    The tests are split so that each shard is expected to take about as long as the others, going
+    by the given durations in seconds keyed by test unit ID, with tests without a duration being
+    expected to take the mean of the others. Without any durations, each shard gets about the same
+    number of tests. Test classes are always kept together with all of their test methods.
+
+    The split only depends on the tests and the durations, so each shard must be given the same
+    durations for the shards to cover every test exactly once, like the ones read from a durations
+    file written by merge-results which is shared by every shard.
+    """
+    tests = list(tests)
+    durations = durations or {}
+    default_estimate = statistics.fmean(durations.values()) if durations else 1.0
+    estimates = [durations.get(_test_unit_id(test), default_estimate) for test in tests]
+    # the longest tests are placed first, each on the shard with the least expected time so far
+    order = sorted(range(len(tests)), key=lambda i: (-estimates[i], i))
+    shard_totals = [(0.0, n) for n in range(1, shard_count + 1)]
+    shard_indexes: set[int] = set()
+    for i in order:
+        total, n = heapq.heappop(shard_totals)
+        if n == shard:
+            shard_indexes.add(i)
+        heapq.heappush(shard_totals, (total + estimates[i], n))
+    return [test for i, test in enumerate(tests) if i in shard_indexes]
+
+
+class ResultsFile:
+    """
+    Writes the results of a run to a JSON file, so that the results of runs of different shards of
+    the tests can be merged into one with merge-results.
+
+    Each result is stored with the position of its test among all of the tests, given by positions
+    keyed by test unit ID, so that merged results are in the same order as an unsharded run's would
+    be. Tests without a position are placed in the order that they're recorded. How long each test
+    took is stored too, so that merge-results can write the durations for splitting later runs.
+    """
+
+    def __init__(self, path: str, positions: Optional[Mapping[str, int]] = None):
+        self._path = path
+        self._positions = positions or {}
+        self._entries: list[dict[str, Any]] = []
+
+    def record(self, test: TestUnit, result: TestResult):
+        """Record the result of running a test unit."""
+        test_id = _test_unit_id(test)
+        entry = {
+            "id": test_id,
+            "position": self._positions.get(test_id, len(self._entries)),
+            "result": _result_to_dict(result),
+        }
+        # running some of a class's test methods doesn't take as long as running the class
+        if (
+            not isinstance(result, NotRunResult)
+            and not isinstance(test, TestMethods)
+            and result.duration
+        ):
+            entry["seconds"] = result.duration.wall_ns / 1e9
+        self._entries.append(entry)
+
+    def save(self):
+        _write_results_file(self._path, self._entries)
+
+
+def merge_results(paths: Sequence[str]) -> list[TestResult]:
+    """
+    Return the results in the given results files, ordered by the position of their tests among
+    all of the tests. If a test has results in more than one file, the results of runs which
+    actually ran it are preferred over NotRunResults.
+    """
+    return [_result_from_dict(entry["result"]) for entry in _merge_entries(paths)]
+
+
+def _merge_entries(paths: Sequence[str]) -> list[dict[str, Any]]:
+    entries = []
+    for path in paths:
+        try:
+            with open(path, encoding="utf-8") as f:
+                entries.extend(json.load(f)["results"])
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            raise InvalidResultsFileError(f"can't read results file {path}: {e}")
+    entries_by_id: dict[str, dict[str, Any]] = {}
+    for entry in sorted(entries, key=lambda entry: entry["position"]):
+        if entry["id"] in entries_by_id and entry["result"]["type"] == "not_run":
+            continue
+        entries_by_id[entry["id"]] = entry
+    return sorted(entries_by_id.values(), key=lambda entry: entry["position"])
+
+
+def read_durations_file(path: str) -> Optional[dict[str, float]]:
+    """
+    Return the durations in seconds keyed by test unit ID in a durations file written by
+    merge-results, or None if there isn't one yet.
+    """
+    try:
+        with open(path, encoding="utf-8") as f:
+            durations = json.load(f)["durations"]
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        raise InvalidDurationsFileError(f"can't read durations file {path}: {e}")
+    return durations
+
+
+def _update_durations_file(path: str, entries: list[dict[str, Any]]):
+    """Update a durations file with how long each of the tests of some results file entries took."""
+    durations = read_durations_file(path) or {}
+    for entry in entries:
+        if "seconds" in entry:
+            durations[entry["id"]] = _moving_average(durations.get(entry["id"]), entry["seconds"])
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"durations": durations}, f, separators=(",", ":"))
+
+
+def _write_results_file(path: str, entries: list[dict[str, Any]]):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"results": entries}, f, separators=(",", ":"))
+
+
+def main(args: Sequence[str]):
+    parser = argparse.ArgumentParser(
+        prog="testipy merge-results",
+        description=(
+            "Merge the results files written by runs of each shard of the tests with --shard and "
+            "--results-file, and print the merged results."
+        ),
+    )
+    parser.add_argument("paths", nargs="+", metavar="FILE", help="results file to merge")
+    parser.add_argument(
+        "-o",
+        "--output",
+        metavar="FILE",
+        help="also write the merged results to FILE, as a results file",
+    )
+    parser.add_argument(
+        "--durations-file",
+        metavar="FILE",
+        help=(
+            "also update FILE with how long each test took, for the shards of later runs to be "
+            "split by with --durations-file"
+        ),
+    )
+    parsed_args = parser.parse_args(args)
+    try:
+        entries = _merge_entries(parsed_args.paths)
+        if parsed_args.durations_file:
+            _update_durations_file(parsed_args.durations_file, entries)
+    except (InvalidResultsFileError, InvalidDurationsFileError) as e:
+        parser.error(str(e))
+    if parsed_args.output:
+        _write_results_file(parsed_args.output, entries)
+    results = [_result_from_dict(entry["result"]) for entry in entries]
+    FriendlyPrinter(results).print(out=sys.stdout)
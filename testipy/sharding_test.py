@@ -0,0 +1,136 @@
+import contextlib
+import io
+import json
+import os
+import tempfile
+import unittest
+
+from .running import Duration, FailResult, NotRunResult, PassResult, TestContext
+from .sharding import main, merge_results, read_durations_file, ResultsFile, shard_tests
+
+
+def test_a(t: TestContext):
+    pass
+
+
+def test_b(t: TestContext):
+    pass
+
+
+def test_c(t: TestContext):
+    pass
+
+
+def test_d(t: TestContext):
+    pass
+
+
+class TestClass:
+    def test_method(self, t: TestContext):
+        pass
+
+
+TESTS = [test_a, test_b, test_c, test_d, TestClass]
+
+
+class TestShardTests(unittest.TestCase):
+    longMessage = False
+
+    def test_shards_are_balanced_by_duration(self):
+        durations = {
+            f"{__name__}::test_a": 5.0,
+            f"{__name__}::test_b": 1.0,
+            f"{__name__}::test_c": 2.0,
+            f"{__name__}::test_d": 2.0,
+            f"{__name__}::TestClass": 1.0,
+        }
+
+        actual = [shard_tests(TESTS, shard, 2, durations) for shard in [1, 2]]
+
+        expected = [[test_a, TestClass], [test_b, test_c, test_d]]
+        self.assertEqual(expected, actual, f"expected shards {expected}, got {actual}")
+
+    def test_shards_have_same_number_of_tests_without_durations(self):
+        actual = [shard_tests(TESTS, shard, 3) for shard in [1, 2, 3]]
+
+        expected = [[test_a, test_d], [test_b, TestClass], [test_c]]
+        self.assertEqual(expected, actual, f"expected shards {expected}, got {actual}")
+
+
+class TestMergeResults(unittest.TestCase):
+    longMessage = False
+
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.temp_dir = temp_dir.name
+
+    def test_results_are_merged_in_order_of_all_tests(self):
+        positions = {f"{__name__}::{test.__name__}": i for i, test in enumerate(TESTS)}
+        self.write_results_file(
+            "shard1.json", positions, [(test_c, FailResult("test_c")), (test_a, PassResult("a"))]
+        )
+        self.write_results_file(
+            "shard2.json", positions, [(test_b, PassResult("test_b")), (test_d, PassResult("d"))]
+        )
+
+        actual = merge_results(
+            [os.path.join(self.temp_dir, "shard1.json"), os.path.join(self.temp_dir, "shard2.json")]
+        )
+
+        expected = [PassResult("a"), PassResult("test_b"), FailResult("test_c"), PassResult("d")]
+        self.assertEqual(expected, actual, f"expected merged results {expected}, got {actual}")
+
+    def test_results_of_tests_which_were_run_are_preferred_over_not_run(self):
+        self.write_results_file("shard1.json", None, [(test_a, NotRunResult("test_a"))])
+        self.write_results_file("shard2.json", None, [(test_a, PassResult("test_a"))])
+
+        actual = merge_results(
+            [os.path.join(self.temp_dir, "shard1.json"), os.path.join(self.temp_dir, "shard2.json")]
+        )
+
+        expected = [PassResult("test_a")]
+        self.assertEqual(expected, actual, f"expected merged results {expected}, got {actual}")
+
+    def test_merged_durations_are_averaged_into_durations_file(self):
+        durations_file = os.path.join(self.temp_dir, "durations.json")
+        self.write_results_file(
+            "shard1.json",
+            None,
+            [(test_a, PassResult("test_a", duration=Duration(2_000_000_000, 0)))],
+        )
+        self.write_results_file(
+            "shard2.json",
+            None,
+            [
+                (test_b, PassResult("test_b", duration=Duration(1_000_000_000, 0))),
+                (test_c, NotRunResult("test_c")),
+            ],
+        )
+        with open(durations_file, "w") as f:
+            json.dump({"durations": {f"{__name__}::test_a": 4.0}}, f)
+        with contextlib.redirect_stdout(io.StringIO()):
+            main(
+                [
+                    os.path.join(self.temp_dir, "shard1.json"),
+                    os.path.join(self.temp_dir, "shard2.json"),
+                    "--durations-file",
+                    durations_file,
+                ]
+            )
+
+        actual = read_durations_file(durations_file)
+
+        expected = {f"{__name__}::test_a": 3.0, f"{__name__}::test_b": 1.0}
+        self.assertEqual(expected, actual, f"expected durations {expected}, got {actual}")
+
+    def test_durations_file_which_does_not_exist_has_no_durations(self):
+        actual = read_durations_file(os.path.join(self.temp_dir, "durations.json"))
+
+        self.assertIsNone(actual, f"expected no durations, got {actual}")
+
+    def write_results_file(self, name, positions, tests_and_results):
+        results_file = ResultsFile(os.path.join(self.temp_dir, name), positions)
+        for test, result in tests_and_results:
+            results_file.record(test, result)
+        results_file.save()
@@ -0,0 +1,252 @@
+import ctypes
+import ctypes.util
+import importlib
+import os
+import select
+import sys
+import time
+from typing import Iterable, Optional, Protocol, TextIO
+
+from .discovery import discover_tests, find_test_files
+from .discovery.imports import project_dependencies
+from .printing import FriendlyPrinter
+from .running import ErrorResult, FailResult, PassResult, run_tests
+from .running.results import TestResult
+
+# (mtime, size) of a file, or None if it doesn't exist
+FileStat = Optional[tuple[int, int]]
+
+
+class Watch:
+    """
+    Runs the tests at some paths and then, each time that rerun is called, runs again only the test
+    modules which have changed or which import project modules that have changed, printing only the
+    results which are different from the last time that their test was run.
+    """
+
+    def __init__(self, paths: Iterable[str], out: TextIO, *, timeout: Optional[float] = None):
+        self._paths = list(paths)
+        self._out = out
+        self._timeout = timeout
+        # the results of each test module from the last time that it was run
+        self._results: dict[str, list[TestResult]] = {}
+        # the project files which each test module depends on, including itself
+        self._dependencies: dict[str, set[str]] = {}
+        self._stats: dict[str, FileStat] = {}
+
+    @property
+    def watched_files(self) -> set[str]:
+        """The absolute paths of the files which are checked for changes."""
+        return set(self._stats)
+
+    def run(self):
+        """Run all of the tests and print their results."""
+        test_files = self._find_test_files()
+        results = self._run_test_files(test_files)
+        FriendlyPrinter(results).print(out=self._out)
+
+    def rerun(self) -> bool:
+        """
+        Run the tests affected by the files which have changed since the last run, printing the
+        results which are different. Return whether any files had changed.
+        """
+        changed_files = {path for path, stat in self._stats.items() if _stat(path) != stat}
+        for path in changed_files:
+            self._stats[path] = _stat(path)
+        test_files = self._find_test_files()
+        removed_test_files = self._results.keys() - set(test_files)
+        for test_file in removed_test_files:
+            del self._results[test_file]
+            del self._dependencies[test_file]
+        affected_test_files = [
+            test_file
+            for test_file in test_files
+            if test_file not in self._results or self._dependencies[test_file] & changed_files
+        ]
+        if not changed_files and not affected_test_files and not removed_test_files:
+            return False
+        self._print_changes(changed_files, affected_test_files)
+        # new modules might have been created since the import system last looked for any
+        importlib.invalidate_caches()
+        previous_results = {
+            test_file: {result.test_name: result for result in self._results.get(test_file, [])}
+            for test_file in affected_test_files
+        }
+        self._forget_modules(affected_test_files)
+        self._run_test_files(affected_test_files)
+        changed_results = [
+            result
+            for test_file in affected_test_files
+            for result in self._results[test_file]
+            if previous_results[test_file].get(result.test_name) != result
+        ]
+        if changed_results:
+            FriendlyPrinter(changed_results).print(out=self._out)
+        else:
+            print("no results changed", file=self._out)
+        print(self._suite_summary(), file=self._out)
+        return True
+
+    def _find_test_files(self) -> list[str]:
+        return [os.path.abspath(path) for path in find_test_files(self._paths)]
+
+    def _run_test_files(self, test_files: list[str]) -> list[TestResult]:
+        results = []
+        for test_file in test_files:
+            self._dependencies[test_file] = project_dependencies(test_file)
+            for path in self._dependencies[test_file]:
+                self._stats[path] = _stat(path)
+            try:
+                tests = discover_tests(os.path.relpath(test_file))
+            except Exception as e:
+                # a test module which can't be imported, e.g. because it's been saved part way
+                # through an edit, errors until it's changed again
+                self._results[test_file] = [ErrorResult(os.path.relpath(test_file), error=e)]
+            else:
+                self._results[test_file] = run_tests(tests, timeout=self._timeout)
+            results.extend(self._results[test_file])
+        return results
+
+    def _forget_modules(self, test_files: list[str]):
+        """
+        Remove the modules that the given test modules depend on from sys.modules, so that they're
+        imported again with any changes when the tests are run.
+        """
+        paths = set().union(*(self._dependencies.get(path, {path}) for path in test_files))
+        for name, module in list(sys.modules.items()):
+            module_path = getattr(module, "__file__", None)
+            if module_path and os.path.abspath(module_path) in paths:
+                del sys.modules[name]
+                # otherwise "from package import module" would still find the old module
+                package_name, _, attribute = name.rpartition(".")
+                package = sys.modules.get(package_name)
+                if package is not None and getattr(package, attribute, None) is module:
+                    delattr(package, attribute)
+
+    def _print_changes(self, changed_files: set[str], affected_test_files: list[str]):
+        changed = ", ".join(sorted(os.path.relpath(path) for path in changed_files)) or "nothing"
+        plural = "s" if len(affected_test_files) != 1 else ""
+        print(
+            f"changed: {changed}; running {len(affected_test_files)} test module{plural}",
+            file=self._out,
+        )
+
+    def _suite_summary(self) -> str:
+        results = [result for results in self._results.values() for result in results]
+        counts = [
+            (sum(isinstance(result, result_type) for result in results), description)
+            for result_type, description in [
+                (PassResult, "passing"),
+                (FailResult, "failing"),
+                (ErrorResult, "erroring"),
+            ]
+        ]
+        parts = [f"{count} {description}" for count, description in counts if count]
+        return f"suite: {', '.join(parts) or 'no tests'}"
+
+
+class Watcher(Protocol):
+    def wait(self, files: set[str]):
+        """
+        Wait until some of the given files, or the directories that they're in, might have changed.
+        """
+
+
+class PollingWatcher:
+    """Waits for files to change by checking them every interval seconds."""
+
+    def __init__(self, interval: float = 0.5):
+        self._interval = interval
+
+    def wait(self, files: set[str]):
+        time.sleep(self._interval)
+
+
+class InotifyWatcher:
+    """
+    Waits for files to change by asking Linux's inotify to tell us when anything in their
+    directories is written to, created, moved or deleted.
+    """
+
+    _IN_MODIFY = 0x2
+    _IN_CLOSE_WRITE = 0x8
+    _IN_MOVED_FROM = 0x40
+    _IN_MOVED_TO = 0x80
+    _IN_CREATE = 0x100
+    _IN_DELETE = 0x200
+    _MASK = _IN_MODIFY | _IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE
+    # editors tend to write a file in several steps, so changes are waited on for a short while
+    # after the first one so that they're all picked up by the same run
+    _SETTLE_SECONDS = 0.05
+
+    def __init__(self):
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self._fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno))
+        self._watched_directories: set[str] = set()
+
+    def wait(self, files: set[str]):
+        for directory in {os.path.dirname(path) for path in files}:
+            self._watch(directory)
+        select.select([self._fd], [], [])
+        time.sleep(self._SETTLE_SECONDS)
+        self._drain()
+
+    def _watch(self, directory: str):
+        if directory in self._watched_directories:
+            return
+        if self._libc.inotify_add_watch(self._fd, os.fsencode(directory), self._MASK) >= 0:
+            self._watched_directories.add(directory)
+
+    def _drain(self):
+        # the events themselves aren't needed since the files are checked for changes afterwards
+        while True:
+            try:
+                os.read(self._fd, 1 << 16)
+            except BlockingIOError:
+                return
+
+
+def watch(
+    paths: Iterable[str],
+    out: TextIO,
+    *,
+    timeout: Optional[float] = None,
+    watcher: Optional[Watcher] = None,
+):
+    """
+    Run the tests at the given paths and then run the tests affected by each change to the test
+    modules or the project modules that they import, until interrupted.
+
+    Changes are waited for with inotify where it's available, or by checking the files every half a
+    second otherwise.
+    """
+    watcher = watcher or _default_watcher()
+    w = Watch(paths, out, timeout=timeout)
+    w.run()
+    try:
+        while True:
+            watcher.wait(w.watched_files)
+            w.rerun()
+    except KeyboardInterrupt:
+        pass
+
+
+def _default_watcher() -> Watcher:
+    if sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher()
+        except (OSError, AttributeError):
+            # inotify isn't available, e.g. in some containers, or libc couldn't be found
+            pass
+    return PollingWatcher()
+
+
+def _stat(path: str) -> FileStat:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
@@ -0,0 +1,197 @@
+import io
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+
+from .common_test import dedent, get_project_root
+from .watching import InotifyWatcher, Watch
+
+
+class TestWatch(unittest.TestCase):
+    longMessage = False
+
+    def setUp(self):
+        cwd = os.getcwd()
+        os.chdir(get_project_root())
+        self.addCleanup(os.chdir, cwd)
+        project_dir = tempfile.mkdtemp(dir=get_project_root())
+        self.addCleanup(shutil.rmtree, project_dir)
+        self.package = os.path.basename(project_dir)
+        self.write("helper.py", "VALUE = 1\n")
+        self.write(
+            "uses_helper_test.py",
+            f"""
+            from testipy import TestContext
+            from {self.package} import helper
+
+
+            def test_value_is_one(t: TestContext):
+                t.assert_equal(1, helper.VALUE)
+            """,
+        )
+        self.write(
+            "standalone_test.py",
+            """
+            from testipy import TestContext
+
+
+            def test_passes(t: TestContext):
+                pass
+            """,
+        )
+        self.out = io.StringIO()
+        self.watch = Watch([self.package], self.out)
+        self.watch.run()
+        self.out.truncate(0)
+        self.out.seek(0)
+
+    def test_only_test_modules_which_import_changed_module_are_run_again(self):
+        self.write("helper.py", "VALUE = 22\n")
+
+        changed = self.watch.rerun()
+
+        expected = dedent(
+            f"""
+            changed: {self.package}/helper.py; running 1 test module
+            test_value_is_one FAIL
+                - Expected 1 and 22 to be equal
+            1 test run; 1 failed
+            suite: 1 passing, 1 failing
+            """
+        )
+        actual = self.out.getvalue()
+        self.assertTrue(changed, "expected rerun to report that files changed")
+        self.assertEqual(
+            expected,
+            actual,
+            f"expected rerun to output:\n\n{expected}\ngot:\n\n{actual}",
+        )
+
+    def test_results_which_did_not_change_are_not_printed(self):
+        self.write("helper.py", "VALUE = 1  # changed\n")
+
+        self.watch.rerun()
+
+        expected = dedent(
+            f"""
+            changed: {self.package}/helper.py; running 1 test module
+            no results changed
+            suite: 2 passing
+            """
+        )
+        actual = self.out.getvalue()
+        self.assertEqual(
+            expected,
+            actual,
+            f"expected rerun to output:\n\n{expected}\ngot:\n\n{actual}",
+        )
+
+    def test_nothing_is_run_when_nothing_changed(self):
+        changed = self.watch.rerun()
+
+        self.assertFalse(changed, "expected rerun to report that nothing changed")
+        self.assertEqual("", self.out.getvalue(), "expected rerun to output nothing")
+
+    def test_new_test_modules_are_run(self):
+        self.write(
+            "new_test.py",
+            """
+            from testipy import TestContext
+
+
+            def test_new(t: TestContext):
+                pass
+            """,
+        )
+
+        self.watch.rerun()
+
+        expected = dedent(
+            """
+            changed: nothing; running 1 test module
+            test_new PASS
+            1 test run; 1 passed
+            suite: 3 passing
+            """
+        )
+        actual = self.out.getvalue()
+        self.assertEqual(
+            expected,
+            actual,
+            f"expected rerun to output:\n\n{expected}\ngot:\n\n{actual}",
+        )
+
+    def test_test_modules_which_cannot_be_imported_error_until_fixed(self):
+        self.write("standalone_test.py", "def test_passes(t:\n")
+
+        self.watch.rerun()
+
+        actual = self.out.getvalue()
+        self.assertIn(
+            f"{self.package}/standalone_test.py ERROR",
+            actual,
+            f"expected a test module with a syntax error to error, got:\n\n{actual}",
+        )
+        self.assertIn("SyntaxError", actual, f"expected the syntax error to be shown, got {actual}")
+
+        self.out.truncate(0)
+        self.out.seek(0)
+        self.write(
+            "standalone_test.py",
+            """
+            from testipy import TestContext
+
+
+            def test_passes(t: TestContext):
+                pass
+            """,
+        )
+
+        self.watch.rerun()
+
+        expected = dedent(
+            f"""
+            changed: {self.package}/standalone_test.py; running 1 test module
+            test_passes PASS
+            1 test run; 1 passed
+            suite: 2 passing
+            """
+        )
+        actual = self.out.getvalue()
+        self.assertEqual(
+            expected,
+            actual,
+            f"expected the fixed test module to be run again, got:\n\n{actual}",
+        )
+
+    def write(self, name: str, source: str):
+        with open(os.path.join(self.package, name), "w") as f:
+            f.write(dedent(source))
+
+
+class TestInotifyWatcher(unittest.TestCase):
+    longMessage = False
+
+    def test_wait_returns_when_file_in_watched_directory_is_written(self):
+        try:
+            watcher = InotifyWatcher()
+        except (OSError, AttributeError):
+            self.skipTest("inotify isn't available")
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "watched.py")
+            open(path, "w").close()
+            returned = threading.Event()
+            thread = threading.Thread(
+                target=lambda: (watcher.wait({path}), returned.set()), daemon=True
+            )
+            thread.start()
+            # give the watcher time to start watching before the file's written
+            returned.wait(0.1)
+            with open(path, "w") as f:
+                f.write("changed")
+
+            self.assertTrue(
+                returned.wait(5), "expected wait to return once the watched file was written"
+            )
@@ -0,0 +1,39 @@
+import argparse
+from typing import Sequence
+
+from .running import run_worker
+
+
+def main(args: Sequence[str]):
+    parser = argparse.ArgumentParser(
+        prog="testipy --worker",
+        description=(
+            "Run the tests handed out by a testipy run started with --serve until it has none left."
+        ),
+    )
+    parser.add_argument(
+        "address",
+        type=_address,
+        metavar="HOST:PORT",
+        help="address that the run is serving tests on",
+    )
+    parser.add_argument(
+        "--connect-timeout",
+        type=float,
+        default=10.0,
+        metavar="SECONDS",
+        help="keep trying to connect for this many seconds (default: 10)",
+    )
+    parsed_args = parser.parse_args(args)
+    host, port = parsed_args.address
+    try:
+        run_worker(host, port, connect_timeout=parsed_args.connect_timeout)
+    except ConnectionRefusedError:
+        parser.error(f"nothing is serving tests on {host}:{port}")
+
+
+def _address(s: str) -> tuple[str, int]:
+    host, _, port = s.rpartition(":")
+    if not host or not port.isdigit() or int(port) > 65535:
+        raise argparse.ArgumentTypeError(f"expected HOST:PORT like localhost:8765, got {s}")
+    return host, int(port)